@@ -0,0 +1,21 @@
+"""
+Take a hot snapshot of the SQLite database
+Safe to run while the API server is up: the snapshot is read from a WAL
+snapshot and does not block writers
+Usage: python backup_database.py [target_path]
+"""
+import sys
+import asyncio
+
+from src.config.database import DatabaseManager
+
+async def backup_database(target_path=None):
+    """Write a snapshot of the database to target_path (or the backups folder)"""
+    manager = DatabaseManager(readers=1)
+    try:
+        await manager.backup(target_path)
+    finally:
+        await manager.close()
+
+if __name__ == "__main__":
+    asyncio.run(backup_database(sys.argv[1] if len(sys.argv) > 1 else None))
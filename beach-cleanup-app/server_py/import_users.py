@@ -0,0 +1,163 @@
+"""
+Bulk import user accounts from a CSV or NDJSON file
+Each record needs username, email and password; displayName, bio and
+location are optional. Records that clash with an existing account (or an
+earlier record in the file) are skipped.
+Usage: python import_users.py users.csv [--format csv|ndjson] [--batch-size 1000] [--workers N]
+"""
+import os
+import csv
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+from src.config.database import DatabaseManager
+from src.services.password_hasher import PasswordHasher
+
+USER_COLUMNS = ['id', 'username', 'email', 'password', 'displayName', 'bio', 'location', 'createdAt', 'updatedAt']
+
+def read_records(path: str, file_format: str) -> Iterator[Dict[str, str]]:
+    """Stream records from a CSV (with header row) or NDJSON file"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if file_format == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def batches(records: Iterator[Dict[str, str]], size: int) -> Iterator[List[Dict[str, str]]]:
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+class UserImporter:
+    def __init__(self, db_manager: DatabaseManager, hasher: PasswordHasher):
+        self.db_manager = db_manager
+        self.hasher = hasher
+        self._seen_emails = set()
+        self._seen_usernames = set()
+        self.read = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.invalid = 0
+
+    def _valid(self, record: Dict[str, str]) -> Optional[Dict[str, str]]:
+        username = (record.get('username') or '').strip()
+        email = (record.get('email') or '').strip()
+        password = record.get('password') or ''
+        # Same rule as auth_controller.register
+        if not username or not email or len(password) < 6:
+            return None
+        return {**record, 'username': username, 'email': email, 'password': password}
+
+    async def import_batch(self, records: List[Dict[str, str]]):
+        self.read += len(records)
+
+        candidates = []
+        for record in records:
+            user = self._valid(record)
+            if user is None:
+                self.invalid += 1
+            elif user['email'] in self._seen_emails or user['username'] in self._seen_usernames:
+                self.duplicates += 1
+            else:
+                self._seen_emails.add(user['email'])
+                self._seen_usernames.add(user['username'])
+                candidates.append(user)
+        if not candidates:
+            return
+
+        # One query finds every clash with existing accounts in this batch
+        async with self.db_manager.reader() as db:
+            cursor = await db.execute(
+                """
+                SELECT email, username FROM users
+                WHERE email IN (SELECT value FROM json_each(?))
+                OR username IN (SELECT value FROM json_each(?))
+                """,
+                (json.dumps([u['email'] for u in candidates]), json.dumps([u['username'] for u in candidates]))
+            )
+            existing = await cursor.fetchall()
+        taken_emails = {row['email'] for row in existing}
+        taken_usernames = {row['username'] for row in existing}
+
+        new_users = [u for u in candidates if u['email'] not in taken_emails and u['username'] not in taken_usernames]
+        self.duplicates += len(candidates) - len(new_users)
+        if not new_users:
+            return
+
+        hashes = await self.hasher.hash_many([u['password'] for u in new_users])
+
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                str(uuid.uuid4()), u['username'], u['email'], hashed,
+                u.get('displayName') or None, u.get('bio') or None, u.get('location') or None, now, now
+            )
+            for u, hashed in zip(new_users, hashes)
+        ]
+
+        # INSERT OR IGNORE covers accounts registered through the API since the dedupe query
+        async with self.db_manager.writer() as db:
+            before = db.total_changes
+            await db.executemany(
+                f"INSERT OR IGNORE INTO users ({', '.join(USER_COLUMNS)}) VALUES ({', '.join('?' * len(USER_COLUMNS))})",
+                rows
+            )
+            await db.commit()
+            inserted = db.total_changes - before
+        self.imported += inserted
+        self.duplicates += len(rows) - inserted
+
+async def import_users(path: str, file_format: str, batch_size: int, workers: Optional[int]):
+    """Import users from path, printing progress and the overall import rate"""
+    db_manager = DatabaseManager(readers=1)
+    hasher = PasswordHasher(workers=workers)
+    importer = UserImporter(db_manager, hasher)
+
+    print(f"Importing users from {path} ({file_format}, batches of {batch_size}, {hasher.workers} hashing workers)")
+    started = time.perf_counter()
+    try:
+        for batch in batches(read_records(path, file_format), batch_size):
+            await importer.import_batch(batch)
+            elapsed = time.perf_counter() - started
+            print(f"[INFO] {importer.read} read, {importer.imported} imported ({importer.imported / elapsed:.1f} users/sec)")
+    finally:
+        hasher.close()
+        await db_manager.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"""
+Import complete in {elapsed:.1f}s
+  Imported:   {importer.imported}
+  Duplicates: {importer.duplicates}
+  Invalid:    {importer.invalid}
+  Rate:       {importer.imported / elapsed if elapsed else 0:.1f} users/sec
+    """)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import user accounts")
+    parser.add_argument("path", help="CSV (with a header row) or NDJSON file of users")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="File format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Users per dedupe query and insert transaction")
+    parser.add_argument("--workers", type=int, help="Hashing processes (default: available cores)")
+    args = parser.parse_args()
+
+    file_format = args.format or ('csv' if os.path.splitext(args.path)[1].lower() == '.csv' else 'ndjson')
+    if not os.path.exists(args.path):
+        print(f"[ERROR] File not found: {args.path}")
+        sys.exit(1)
+
+    asyncio.run(import_users(args.path, file_format, args.batch_size, args.workers))
+
+if __name__ == "__main__":
+    main()
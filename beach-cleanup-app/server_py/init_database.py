@@ -14,6 +14,135 @@ load_dotenv()
 # Get database path
 DB_PATH = Path(__file__).parent / (os.getenv("DATABASE_PATH", "database.db"))
 
+# Denormalized counters kept exact by triggers:
+# (table, counter column, child table, child foreign key)
+COUNTERS = [
+    ("posts", "likeCount", "post_likes", "postId"),
+    ("posts", "commentCount", "comments", "postId"),
+    ("events", "attendeeCount", "event_attendees", "eventId"),
+]
+
+def counter_triggers(table: str, column: str, child: str, key: str) -> list:
+    """SQL statements for the triggers that keep one counter column in step with its child table"""
+    name = f"trg_{child}_{column}"
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_insert AFTER INSERT ON {child}
+        BEGIN
+            UPDATE {table} SET {column} = {column} + 1 WHERE id = NEW.{key};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_delete AFTER DELETE ON {child}
+        BEGIN
+            UPDATE {table} SET {column} = {column} - 1 WHERE id = OLD.{key};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}_update AFTER UPDATE OF {key} ON {child}
+        WHEN OLD.{key} IS NOT NEW.{key}
+        BEGIN
+            UPDATE {table} SET {column} = {column} - 1 WHERE id = OLD.{key};
+            UPDATE {table} SET {column} = {column} + 1 WHERE id = NEW.{key};
+        END
+        """,
+    ]
+
+def backfill_sql(table: str, column: str, child: str, key: str) -> str:
+    """SQL that recomputes one counter column from its child table"""
+    return f"UPDATE {table} SET {column} = (SELECT COUNT(*) FROM {child} WHERE {child}.{key} = {table}.id)"
+
+# R*Tree spatial indexes over point tables with lat/lon columns: (table, rtree table)
+SPATIAL_INDEXES = [
+    ("debris_hotspots", "debris_hotspots_rtree"),
+    ("events", "events_rtree"),
+]
+
+def spatial_index_sql(table: str, rtree: str) -> list:
+    """
+    SQL statements for an R*Tree over table's points and the triggers that keep it in sync
+
+    The R*Tree is keyed by the table's spatialId column, not its rowid: the
+    tables have TEXT primary keys, so VACUUM may renumber their rowids. A row
+    inserted without a spatialId gets the next free one. Existing triggers
+    are replaced, so rerunning this installs the current definitions.
+    """
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {rtree} USING rtree(id, minLat, maxLat, minLon, maxLon)",
+        f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_spatial_id ON {table}(spatialId)",
+        f"DROP TRIGGER IF EXISTS trg_{rtree}_insert",
+        f"DROP TRIGGER IF EXISTS trg_{rtree}_update",
+        f"DROP TRIGGER IF EXISTS trg_{rtree}_delete",
+        f"""
+        CREATE TRIGGER trg_{rtree}_insert AFTER INSERT ON {table}
+        BEGIN
+            UPDATE {table} SET spatialId = (SELECT IFNULL(MAX(spatialId), 0) + 1 FROM {table})
+            WHERE rowid = NEW.rowid AND NEW.spatialId IS NULL;
+            INSERT OR REPLACE INTO {rtree} SELECT spatialId, lat, lat, lon, lon FROM {table} WHERE rowid = NEW.rowid;
+        END
+        """,
+        f"""
+        CREATE TRIGGER trg_{rtree}_update AFTER UPDATE OF lat, lon ON {table}
+        BEGIN
+            UPDATE {rtree} SET minLat = NEW.lat, maxLat = NEW.lat, minLon = NEW.lon, maxLon = NEW.lon
+            WHERE id = NEW.spatialId;
+        END
+        """,
+        f"""
+        CREATE TRIGGER trg_{rtree}_delete AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM {rtree} WHERE id = OLD.spatialId;
+        END
+        """,
+    ]
+
+def spatial_rebuild_sql(table: str, rtree: str) -> list:
+    """SQL statements that give every row a spatialId and refill the R*Tree from the table"""
+    return [
+        # Rows inserted while the triggers were dropped: offsetting the (unique) rowids
+        # past the largest key hands out distinct new keys in one pass
+        f"""
+        UPDATE {table} SET spatialId = rowid + (SELECT IFNULL(MAX(spatialId), 0) FROM {table})
+        WHERE spatialId IS NULL
+        """,
+        f"DELETE FROM {rtree}",
+        f"INSERT INTO {rtree} SELECT spatialId, lat, lat, lon, lon FROM {table}",
+    ]
+
+async def create_spatial_indexes(db):
+    """
+    Create the R*Tree indexes and triggers, and rebuild their contents
+
+    Databases created before the spatialId key existed get the column added
+    and filled in the same transaction. The caller commits.
+    """
+    await db.execute("BEGIN IMMEDIATE")
+    for table, rtree in SPATIAL_INDEXES:
+        cursor = await db.execute(f"SELECT COUNT(*) FROM pragma_table_info('{table}') WHERE name = 'spatialId'")
+        if (await cursor.fetchone())[0] == 0:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN spatialId INTEGER")
+            print(f"Added {table}.spatialId")
+        for statement in spatial_index_sql(table, rtree) + spatial_rebuild_sql(table, rtree):
+            await db.execute(statement)
+
+async def create_counters(db):
+    """
+    Add the counter columns and their triggers
+
+    Databases created before the counters existed get the columns added and
+    backfilled in the same transaction as the triggers, so no write is missed.
+    The caller commits.
+    """
+    await db.execute("BEGIN IMMEDIATE")
+    for table, column, child, key in COUNTERS:
+        cursor = await db.execute(f"SELECT COUNT(*) FROM pragma_table_info('{table}') WHERE name = ?", (column,))
+        if (await cursor.fetchone())[0] == 0:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+            await db.execute(backfill_sql(table, column, child, key))
+            print(f"Added and backfilled {table}.{column}")
+        for statement in counter_triggers(table, column, child, key):
+            await db.execute(statement)
+
 async def init_database():
     """Initialize database tables and sample data"""
     print(f"Initializing database at: {DB_PATH}")
@@ -48,8 +177,10 @@ async def init_database():
                 lon REAL NOT NULL,
                 address TEXT,
                 organizerId TEXT NOT NULL,
+                attendeeCount INTEGER NOT NULL DEFAULT 0,
                 createdAt TEXT NOT NULL,
                 updatedAt TEXT NOT NULL,
+                spatialId INTEGER,
                 FOREIGN KEY (organizerId) REFERENCES users (id) ON DELETE CASCADE
             );
 
@@ -70,6 +201,8 @@ async def init_database():
                 imageUrl TEXT,
                 authorId TEXT NOT NULL,
                 eventId TEXT,
+                likeCount INTEGER NOT NULL DEFAULT 0,
+                commentCount INTEGER NOT NULL DEFAULT 0,
                 createdAt TEXT NOT NULL,
                 updatedAt TEXT NOT NULL,
                 FOREIGN KEY (authorId) REFERENCES users (id) ON DELETE CASCADE,
@@ -115,20 +248,92 @@ async def init_database():
                 lat REAL NOT NULL,
                 lon REAL NOT NULL,
                 description TEXT,
+                createdAt TEXT NOT NULL,
+                spatialId INTEGER
+            );
+
+            -- Local mirror of the Google Sheets "Posts" sheet (SHEETS_MIRROR_MODE)
+            CREATE TABLE IF NOT EXISTS sheet_posts (
+                id TEXT PRIMARY KEY,
+                username TEXT,
+                location TEXT,
+                date TEXT,
+                imageUrl TEXT,
+                caption TEXT,
+                trashCollected TEXT,
+                upvotes INTEGER NOT NULL DEFAULT 0,
+                timestamp TEXT
+            );
+
+            -- Local mirror of the Google Sheets "Events" sheet (SHEETS_MIRROR_MODE)
+            CREATE TABLE IF NOT EXISTS sheet_events (
+                id TEXT PRIMARY KEY,
+                title TEXT,
+                location TEXT,
+                lat REAL,
+                lng REAL,
+                date TEXT,
+                time TEXT,
+                participants INTEGER NOT NULL DEFAULT 0,
+                maxParticipants INTEGER NOT NULL DEFAULT 0,
+                description TEXT,
+                organizer TEXT,
+                difficulty TEXT,
+                imageUrl TEXT,
+                timestamp TEXT
+            );
+
+            -- Local writes waiting to be replicated to Google Sheets
+            CREATE TABLE IF NOT EXISTS sheet_outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                op TEXT NOT NULL,
+                recordId TEXT NOT NULL,
+                payload TEXT,
                 createdAt TEXT NOT NULL
             );
 
+            -- Low tide alert subscriptions (users to tide stations)
+            CREATE TABLE IF NOT EXISTS tide_subscriptions (
+                userId TEXT NOT NULL,
+                stationId TEXT NOT NULL,
+                createdAt TEXT NOT NULL,
+                PRIMARY KEY (userId, stationId),
+                FOREIGN KEY (userId) REFERENCES users (id) ON DELETE CASCADE
+            );
+
+            -- Push notification device tokens (FCM registration tokens)
+            CREATE TABLE IF NOT EXISTS device_tokens (
+                token TEXT PRIMARY KEY,
+                userId TEXT NOT NULL,
+                platform TEXT,
+                createdAt TEXT NOT NULL,
+                updatedAt TEXT NOT NULL,
+                FOREIGN KEY (userId) REFERENCES users (id) ON DELETE CASCADE
+            );
+
             -- Create indexes for better query performance
             CREATE INDEX IF NOT EXISTS idx_events_organizer ON events(organizerId);
             CREATE INDEX IF NOT EXISTS idx_events_date ON events(date);
             CREATE INDEX IF NOT EXISTS idx_posts_author ON posts(authorId);
             CREATE INDEX IF NOT EXISTS idx_posts_event ON posts(eventId);
+            CREATE INDEX IF NOT EXISTS idx_posts_author_feed ON posts(authorId, createdAt, id);
+            CREATE INDEX IF NOT EXISTS idx_posts_event_feed ON posts(eventId, createdAt, id);
             CREATE INDEX IF NOT EXISTS idx_comments_post ON comments(postId);
             CREATE INDEX IF NOT EXISTS idx_event_attendees_user ON event_attendees(userId);
             CREATE INDEX IF NOT EXISTS idx_user_follows_follower ON user_follows(followerId);
             CREATE INDEX IF NOT EXISTS idx_user_follows_following ON user_follows(followingId);
+            CREATE INDEX IF NOT EXISTS idx_sheet_events_date ON sheet_events(date);
+            CREATE INDEX IF NOT EXISTS idx_sheet_outbox_record ON sheet_outbox(kind, recordId);
+            CREATE INDEX IF NOT EXISTS idx_tide_subscriptions_station ON tide_subscriptions(stationId);
+            CREATE INDEX IF NOT EXISTS idx_device_tokens_user ON device_tokens(userId);
         """)
 
+        await create_counters(db)
+        await db.commit()
+        await create_spatial_indexes(db)
+        await db.commit()
+
         print("Database tables created successfully!")
 
         # Insert sample debris hotspots
@@ -0,0 +1,366 @@
+"""
+Bulk load debris hotspots from an MDMAP survey export (CSV, JSON or NDJSON)
+Rows are streamed from disk, validated and normalized, then upserted into
+debris_hotspots in sized transactions. Common MDMAP column names are
+recognised (e.g. "Shoreline Name", "Latitude Start", "Total Debris",
+"Survey Date"); rows without an id are keyed by site name and coordinates,
+so loading a newer export updates the hotspots it already holds.
+Usage: python load_hotspots.py surveys.csv [--format csv|json|ndjson] [--batch-size 5000] [--rejects rejects.ndjson]
+"""
+import os
+import re
+import csv
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from init_database import spatial_index_sql, spatial_rebuild_sql
+from src.config.database import DatabaseManager
+
+HOTSPOT_COLUMNS = ['id', 'location', 'debrisScore', 'lat', 'lon', 'description', 'createdAt']
+HOTSPOTS_RTREE = 'debris_hotspots_rtree'
+
+# Accepted source names per column, compared lowercased with punctuation and spaces removed
+FIELD_ALIASES = {
+    'id': ['id', 'surveyid', 'eventid'],
+    'location': ['location', 'shorelinename', 'sitename', 'site', 'shoreline', 'beach'],
+    'debrisScore': ['debrisscore', 'totaldebris', 'totaldebrism', 'totalitems', 'debrisdensity', 'score'],
+    'lat': ['lat', 'latitude', 'latitudestart', 'startlatitude'],
+    'lon': ['lon', 'lng', 'longitude', 'longitudestart', 'startlongitude'],
+    'description': ['description', 'notes', 'comments'],
+    'createdAt': ['createdat', 'surveydate', 'date'],
+}
+
+DATE_FORMATS = ['%m/%d/%Y', '%m/%d/%y', '%Y/%m/%d', '%d-%b-%Y', '%d %b %Y']
+
+UPSERT_SQL = f"""
+    INSERT INTO debris_hotspots ({', '.join(HOTSPOT_COLUMNS)})
+    VALUES ({', '.join('?' * len(HOTSPOT_COLUMNS))})
+    ON CONFLICT(id) DO UPDATE SET
+        location = excluded.location,
+        debrisScore = excluded.debrisScore,
+        lat = excluded.lat,
+        lon = excluded.lon,
+        description = excluded.description,
+        createdAt = excluded.createdAt
+"""
+
+class RejectedRow(Exception):
+    """A source row that cannot be loaded; the message is the reason"""
+
+class MalformedRecord:
+    """Source text that is not valid JSON, passed on so normalize() rejects it like any bad row"""
+
+    def __init__(self, text: str, error: json.JSONDecodeError):
+        self.text = text
+        self.error = error
+
+    def __str__(self) -> str:
+        return self.text
+
+def _key(name: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', str(name).lower())
+
+def _element_end(text: str) -> int:
+    """Index of the ',' or ']' that ends the array element text starts with, or -1 if it isn't all buffered"""
+    depth = 0
+    in_string = escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '[{':
+            depth += 1
+        elif char in ']}':
+            if depth == 0:
+                return i
+            depth -= 1
+        elif char == ',' and depth == 0:
+            return i
+    return -1
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Stream the elements of a top-level JSON array without loading the whole document
+
+    An element that is not valid JSON is yielded as a MalformedRecord and
+    reading resumes at the next element.
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError("JSON input must be an array of objects (use --format ndjson for one object per line)")
+    buffer = buffer[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            end = _element_end(buffer)
+            if end == -1 and not eof:
+                # The element runs past the buffered text: read more and retry
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+            if end == -1:
+                # Unterminated array: whatever is left is one bad element
+                if buffer.strip():
+                    yield MalformedRecord(buffer.strip(), e)
+                return
+            yield MalformedRecord(buffer[:end].strip(), e)
+            buffer = buffer[end:]
+            continue
+        yield item
+        buffer = buffer[end:]
+
+def read_records(path: str, file_format: str) -> Iterator[Any]:
+    """Stream records from a CSV (with header row), JSON array or NDJSON file"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if file_format == 'csv':
+            yield from csv.DictReader(f)
+        elif file_format == 'json':
+            yield from iter_json_array(f)
+        else:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield MalformedRecord(line.strip(), e)
+
+def _parse_float(value: Any, field: str) -> float:
+    try:
+        number = float(str(value).strip().replace(',', ''))
+    except (TypeError, ValueError):
+        raise RejectedRow(f"invalid {field}")
+    if number != number or number in (float('inf'), float('-inf')):
+        raise RejectedRow(f"invalid {field}")
+    return number
+
+def _parse_date(value: Any) -> str:
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00')).isoformat()
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).isoformat()
+        except ValueError:
+            continue
+    raise RejectedRow("invalid date")
+
+def normalize(record: Dict[str, Any], loaded_at: str) -> Tuple:
+    """
+    Map one source record onto a debris_hotspots row
+
+    Raises:
+        RejectedRow: If a required field is missing or out of range
+    """
+    if isinstance(record, MalformedRecord):
+        raise RejectedRow("malformed JSON")
+    if not isinstance(record, dict):
+        raise RejectedRow("not an object")
+    values = {_key(name): value for name, value in record.items() if name is not None}
+
+    def pick(column: str) -> Any:
+        for alias in FIELD_ALIASES[column]:
+            value = values.get(alias)
+            if value is not None and str(value).strip() != '':
+                return value
+        return None
+
+    location = pick('location')
+    if location is None:
+        raise RejectedRow("missing location")
+    location = ' '.join(str(location).split())
+
+    lat, lon = pick('lat'), pick('lon')
+    if lat is None or lon is None:
+        raise RejectedRow("missing coordinates")
+    lat, lon = _parse_float(lat, 'latitude'), _parse_float(lon, 'longitude')
+    if not -90 <= lat <= 90:
+        raise RejectedRow("latitude out of range")
+    if not -180 <= lon <= 360:
+        raise RejectedRow("longitude out of range")
+    if lon > 180:
+        # 0-360 longitudes as used by some survey exports
+        lon -= 360
+
+    score = pick('debrisScore')
+    if score is None:
+        raise RejectedRow("missing debris score")
+    score = _parse_float(score, 'debris score')
+    if score < 0:
+        raise RejectedRow("negative debris score")
+
+    created = pick('createdAt')
+    created = _parse_date(created) if created is not None else loaded_at
+
+    description = pick('description')
+    description = str(description).strip() if description is not None else None
+
+    hotspot_id = pick('id')
+    if hotspot_id is not None:
+        hotspot_id = str(hotspot_id).strip()
+    else:
+        hotspot_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"mdmap:{location.lower()}:{lat:.5f}:{lon:.5f}"))
+
+    return (hotspot_id, location, score, lat, lon, description, created)
+
+class HotspotLoader:
+    def __init__(self, db_manager: DatabaseManager, rejects: Optional[TextIO] = None):
+        self.db_manager = db_manager
+        self.rejects = rejects
+        self.read = 0
+        self.written = 0
+        self.reject_reasons = Counter()
+
+    @property
+    def rejected(self) -> int:
+        return sum(self.reject_reasons.values())
+
+    def _reject(self, record: Any, reason: str):
+        self.reject_reasons[reason] += 1
+        if self.rejects is not None:
+            self.rejects.write(json.dumps({"row": self.read, "reason": reason, "record": record}, default=str) + '\n')
+
+    def rows(self, records: Iterator[Dict[str, Any]]) -> Iterator[Tuple]:
+        """Valid, normalized rows from records; rejects are counted and skipped"""
+        loaded_at = datetime.now().isoformat()
+        for record in records:
+            self.read += 1
+            try:
+                yield normalize(record, loaded_at)
+            except RejectedRow as e:
+                self._reject(record, str(e))
+
+    async def count(self) -> int:
+        async with self.db_manager.reader() as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM debris_hotspots")
+            return (await cursor.fetchone())[0]
+
+    async def defer_spatial_index(self):
+        """Drop the R*Tree triggers so the load doesn't maintain the index row by row"""
+        async with self.db_manager.writer() as db:
+            for action in ('insert', 'update', 'delete'):
+                await db.execute(f"DROP TRIGGER IF EXISTS trg_{HOTSPOTS_RTREE}_{action}")
+            await db.commit()
+
+    async def rebuild_spatial_index(self):
+        """Recreate the R*Tree triggers and rebuild the index from the table in one pass"""
+        async with self.db_manager.writer() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            for statement in spatial_index_sql('debris_hotspots', HOTSPOTS_RTREE):
+                await db.execute(statement)
+            for statement in spatial_rebuild_sql('debris_hotspots', HOTSPOTS_RTREE):
+                await db.execute(statement)
+            await db.commit()
+
+    async def write_batch(self, rows: List[Tuple]):
+        """Upsert rows in one transaction"""
+        # ON CONFLICT DO UPDATE keeps the row and its spatialId (INSERT OR REPLACE
+        # would delete and reinsert), so its R*Tree entry stays keyed correctly
+        async with self.db_manager.writer() as db:
+            await db.executemany(UPSERT_SQL, rows)
+            await db.commit()
+        self.written += len(rows)
+
+async def load_hotspots(path: str, file_format: str, batch_size: int, rejects_path: Optional[str]):
+    """Load hotspots from path, printing progress and the overall load rate"""
+    db_manager = DatabaseManager(readers=1)
+    rejects = open(rejects_path, 'w', encoding='utf-8') if rejects_path else None
+    loader = HotspotLoader(db_manager, rejects)
+
+    async with db_manager.reader() as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'debris_hotspots'")
+        if (await cursor.fetchone())[0] == 0:
+            print("[ERROR] debris_hotspots table not found; run init_database.py first")
+            await db_manager.close()
+            sys.exit(1)
+        cursor = await db.execute("SELECT COUNT(*) FROM pragma_table_info('debris_hotspots') WHERE name = 'spatialId'")
+        if (await cursor.fetchone())[0] == 0:
+            print("[ERROR] debris_hotspots has no spatialId column; run init_database.py to upgrade it")
+            await db_manager.close()
+            sys.exit(1)
+
+    print(f"Loading debris hotspots from {path} ({file_format}, transactions of {batch_size} rows)")
+    before = await loader.count()
+    started = time.perf_counter()
+    rows = loader.rows(read_records(path, file_format))
+    batch = list(islice(rows, batch_size))
+
+    # A load that fits in one transaction keeps the R*Tree triggers; a bigger one
+    # drops them and rebuilds the index once at the end
+    deferred = len(batch) == batch_size
+    index_seconds = 0.0
+    if deferred:
+        await loader.defer_spatial_index()
+    try:
+        while batch:
+            await loader.write_batch(batch)
+            elapsed = time.perf_counter() - started
+            print(f"[INFO] {loader.read} read, {loader.written} written, {loader.rejected} rejected ({loader.read / elapsed:.0f} rows/sec)")
+            batch = list(islice(rows, batch_size))
+        load_seconds = time.perf_counter() - started
+    finally:
+        if deferred:
+            # Rebuild even after a failed load, so the committed batches are searchable
+            index_started = time.perf_counter()
+            await loader.rebuild_spatial_index()
+            index_seconds = time.perf_counter() - index_started
+        after = await loader.count()
+        await db_manager.checkpoint("TRUNCATE")
+        await db_manager.close()
+        if rejects is not None:
+            rejects.close()
+
+    elapsed = time.perf_counter() - started
+    added = after - before
+    print(f"""
+Load complete in {elapsed:.1f}s (rows {load_seconds:.1f}s, spatial index {index_seconds:.1f}s)
+  Read:     {loader.read}
+  Added:    {added}
+  Updated:  {loader.written - added}
+  Rejected: {loader.rejected}
+  Rate:     {loader.read / load_seconds if load_seconds else 0:.0f} rows/sec""")
+    for reason, count in loader.reject_reasons.most_common():
+        print(f"    {reason}: {count}")
+    if rejects_path and loader.rejected:
+        print(f"  Rejected rows written to {rejects_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load debris hotspots from an MDMAP export")
+    parser.add_argument("path", help="CSV (with a header row), JSON array or NDJSON file of survey rows")
+    parser.add_argument("--format", choices=["csv", "json", "ndjson"], help="File format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per insert transaction")
+    parser.add_argument("--rejects", help="Write rejected rows and their reasons to this NDJSON file")
+    args = parser.parse_args()
+
+    extension = os.path.splitext(args.path)[1].lower()
+    file_format = args.format or {'.csv': 'csv', '.json': 'json'}.get(extension, 'ndjson')
+    if not os.path.exists(args.path):
+        print(f"[ERROR] File not found: {args.path}")
+        sys.exit(1)
+
+    asyncio.run(load_hotspots(args.path, file_format, args.batch_size, args.rejects))
+
+if __name__ == "__main__":
+    main()
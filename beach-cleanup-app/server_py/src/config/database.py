@@ -1,9 +1,23 @@
 """
 Database configuration and connection management for Beach Cleanup API
+
+The database runs in WAL mode with one writer connection and a pool of
+reader connections, so reads proceed in parallel with each other and with
+the writer instead of queueing behind a single connection.
+
+Connection settings come from a named storage profile (DATABASE_PROFILE).
+A background task checkpoints the WAL, and backup() takes hot snapshots
+through SQLite's online backup API.
 """
+import time
+import asyncio
+import sqlite3
 import aiosqlite
 import os
+from contextlib import asynccontextmanager
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,27 +25,325 @@ load_dotenv()
 # Get database path from environment or use default
 DB_PATH = Path(__file__).parent.parent.parent / (os.getenv("DATABASE_PATH", "database.db"))
 
-class DatabaseManager:
-    """Manages SQLite database connection"""
+# Named storage profiles. cache_size is negative so it is read as KiB, not pages.
+STORAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Every commit is fsynced; SQLite checkpoints on its own as well as in the background
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -8000,
+        "temp_store": "DEFAULT",
+        "wal_autocheckpoint": 1000,
+    },
+    # Commits are durable at the next checkpoint; reads are memory-mapped and
+    # checkpoints happen only in the background task, off the commit path
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 0,
+    },
+}
+
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+class _LeaseStats:
+    """Wait-time bookkeeping for one kind of connection lease"""
 
     def __init__(self):
+        self.leases = 0
+        self.waiting = 0
+        self.in_use = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float):
+        self.leases += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def as_dict(self, size: int) -> dict:
+        return {
+            "size": size,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "saturation": round(self.in_use / size, 2) if size else 0,
+            "leases": self.leases,
+            "avg_wait_ms": round(self.wait_seconds_total / self.leases * 1000, 2) if self.leases else 0,
+            "max_wait_ms": round(self.wait_seconds_max * 1000, 2),
+        }
+
+class DatabaseManager:
+    """Manages a pool of SQLite connections: one writer plus N readers"""
+
+    def __init__(self, readers: Optional[int] = None, profile: Optional[str] = None):
+        """
+        Args:
+            readers: Number of reader connections. Defaults to DATABASE_READERS
+                from the environment (4 if unset).
+            profile: Storage profile name. Defaults to DATABASE_PROFILE from
+                the environment ("durable" if unset).
+        """
         self.db_path = str(DB_PATH)
+        self.reader_count = readers or int(os.getenv("DATABASE_READERS", "4"))
+        self.profile_name = profile or os.getenv("DATABASE_PROFILE", "durable")
+        if self.profile_name not in STORAGE_PROFILES:
+            raise Exception(
+                f"Unknown DATABASE_PROFILE '{self.profile_name}' (expected one of: {', '.join(STORAGE_PROFILES)})"
+            )
+        self.profile = STORAGE_PROFILES[self.profile_name]
+        self.checkpoint_interval = float(os.getenv("DATABASE_CHECKPOINT_INTERVAL", "60"))
+        self.wal_truncate_pages = int(os.getenv("DATABASE_WAL_TRUNCATE_PAGES", "10000"))
         self._conn = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._writer_lock: Optional[asyncio.Lock] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+        self._writer_stats = _LeaseStats()
+        self._reader_stats = _LeaseStats()
+
+        # Checkpoint and backup bookkeeping
+        self._checkpointer: Optional[aiosqlite.Connection] = None
+        self._checkpoint_task: Optional[asyncio.Task] = None
+        self._checkpoints = 0
+        self._truncations = 0
+        self._checkpoints_busy = 0
+        self._last_checkpoint: Optional[Dict[str, Any]] = None
+        self._backups = 0
+        self._last_backup: Optional[Dict[str, Any]] = None
+
+    async def _open(self, readonly: bool = False) -> aiosqlite.Connection:
+        profile = self.profile
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row  # Return rows as dictionaries
+        # Enable foreign keys
+        await conn.execute("PRAGMA foreign_keys = ON")
+        await conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+        await conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+        await conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+        await conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+        if readonly:
+            await conn.execute("PRAGMA query_only = ON")
+        else:
+            await conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+            await conn.execute(f"PRAGMA wal_autocheckpoint = {int(profile['wal_autocheckpoint'])}")
+        await conn.commit()
+        return conn
+
+    async def _ensure_pool(self):
+        if self._conn is not None:
+            return
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+
+        async with self._open_lock:
+            if self._conn is not None:
+                return
+            # Open the writer first so WAL mode is in place before readers attach
+            writer = await self._open()
+            self._readers = [await self._open(readonly=True) for _ in range(self.reader_count)]
+            self._idle_readers = asyncio.Queue()
+            for reader in self._readers:
+                self._idle_readers.put_nowait(reader)
+            self._writer_lock = asyncio.Lock()
+            self._conn = writer
+            print(
+                f"Database connected: {self.db_path} "
+                f"(1 writer, {self.reader_count} readers, profile: {self.profile_name})"
+            )
 
     async def get_connection(self):
-        """Get database connection"""
-        if self._conn is None:
-            self._conn = await aiosqlite.connect(self.db_path)
-            self._conn.row_factory = aiosqlite.Row  # Return rows as dictionaries
-            # Enable foreign keys
-            await self._conn.execute("PRAGMA foreign_keys = ON")
-            await self._conn.commit()
-            print(f"Database connected: {self.db_path}")
+        """Get the writer connection without a lease (startup checks and legacy callers)"""
+        await self._ensure_pool()
         return self._conn
 
+    @asynccontextmanager
+    async def writer(self):
+        """Lease the writer connection; writes are serialized through this lease"""
+        await self._ensure_pool()
+        stats = self._writer_stats
+        started = time.perf_counter()
+        stats.waiting += 1
+        try:
+            await self._writer_lock.acquire()
+        finally:
+            stats.waiting -= 1
+        stats.record_wait(time.perf_counter() - started)
+        stats.in_use += 1
+        try:
+            yield self._conn
+        finally:
+            # Don't let a failed request's uncommitted writes ride along with the next lease's commit
+            if self._conn.in_transaction:
+                await self._conn.rollback()
+            stats.in_use -= 1
+            self._writer_lock.release()
+
+    @asynccontextmanager
+    async def reader(self):
+        """Lease a read-only connection from the pool"""
+        await self._ensure_pool()
+        stats = self._reader_stats
+        started = time.perf_counter()
+        stats.waiting += 1
+        try:
+            conn = await self._idle_readers.get()
+        finally:
+            stats.waiting -= 1
+        stats.record_wait(time.perf_counter() - started)
+        stats.in_use += 1
+        try:
+            yield conn
+        finally:
+            stats.in_use -= 1
+            self._idle_readers.put_nowait(conn)
+
+    # ------------------------------------------------------------------------
+    # WAL checkpoints
+    # ------------------------------------------------------------------------
+
+    def start_checkpointer(self):
+        """Start the background WAL checkpoint task (call from the running event loop)"""
+        if self._checkpoint_task is None and self.checkpoint_interval > 0:
+            self._checkpoint_task = asyncio.get_running_loop().create_task(self._checkpoint_loop())
+
+    async def checkpoint(self, mode: str = "PASSIVE") -> Dict[str, Any]:
+        """
+        Run a WAL checkpoint on a dedicated connection
+
+        PASSIVE copies what it can without waiting on readers or writers.
+        RESTART and TRUNCATE wait (briefly) for a quiet moment so the WAL
+        file can be reused or shrunk.
+
+        Args:
+            mode: One of PASSIVE, FULL, RESTART or TRUNCATE
+
+        Returns:
+            Dictionary with busy, wal_pages and checkpointed_pages
+        """
+        mode = mode.upper()
+        if mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+
+        await self._ensure_pool()
+        if self._checkpointer is None:
+            # A short busy timeout: a blocked checkpoint is retried on the next tick
+            self._checkpointer = await aiosqlite.connect(self.db_path, timeout=1.0)
+
+        started = time.perf_counter()
+        cursor = await self._checkpointer.execute(f"PRAGMA wal_checkpoint({mode})")
+        busy, wal_pages, checkpointed = await cursor.fetchone()
+        result = {
+            "mode": mode,
+            "busy": bool(busy),
+            "wal_pages": wal_pages,
+            "checkpointed_pages": checkpointed,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "at": datetime.now().isoformat(),
+        }
+
+        self._checkpoints += 1
+        if busy:
+            self._checkpoints_busy += 1
+        if mode == "TRUNCATE" and not busy:
+            self._truncations += 1
+        self._last_checkpoint = result
+        return result
+
+    async def _checkpoint_loop(self):
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            try:
+                result = await self.checkpoint("PASSIVE")
+                # Once the WAL has grown large and is fully copied back, shrink it
+                if (
+                    not result["busy"]
+                    and result["wal_pages"] >= self.wal_truncate_pages
+                    and result["checkpointed_pages"] == result["wal_pages"]
+                ):
+                    await self.checkpoint("TRUNCATE")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[WARNING] WAL checkpoint failed, will retry: {e}")
+
+    # ------------------------------------------------------------------------
+    # Online backup
+    # ------------------------------------------------------------------------
+
+    async def backup(self, target_path: Optional[str] = None) -> str:
+        """
+        Write a consistent snapshot of the live database
+
+        The copy is read from a reader's WAL snapshot in a single backup step,
+        so writers keep committing while it runs.
+
+        Args:
+            target_path: Destination file. Defaults to backups/<name>-<timestamp>.db
+                next to the database.
+
+        Returns:
+            Path of the snapshot
+        """
+        if target_path is None:
+            db_file = Path(self.db_path)
+            backup_dir = db_file.parent / "backups"
+            backup_dir.mkdir(exist_ok=True)
+            target_path = str(backup_dir / f"{db_file.stem}-{datetime.now():%Y%m%d-%H%M%S}.db")
+
+        started = time.perf_counter()
+        # The backup runs on the source connection's thread, so the target must allow that
+        target = sqlite3.connect(target_path, check_same_thread=False)
+        try:
+            async with self.reader() as source:
+                await source.backup(target)
+        finally:
+            target.close()
+
+        self._backups += 1
+        self._last_backup = {
+            "path": target_path,
+            "bytes": os.path.getsize(target_path),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "at": datetime.now().isoformat(),
+        }
+        print(f"[SUCCESS] Database snapshot written to {target_path}")
+        return target_path
+
+    def metrics(self) -> dict:
+        """Pool saturation, lease wait times, checkpoints and backups"""
+        return {
+            "profile": self.profile_name,
+            "writer": self._writer_stats.as_dict(1),
+            "readers": self._reader_stats.as_dict(self.reader_count),
+            "checkpoints": {
+                "count": self._checkpoints,
+                "busy": self._checkpoints_busy,
+                "truncations": self._truncations,
+                "last": self._last_checkpoint,
+            },
+            "backups": {
+                "count": self._backups,
+                "last": self._last_backup,
+            },
+        }
+
     async def close(self):
-        """Close database connection"""
+        """Close all database connections"""
+        if self._checkpoint_task:
+            self._checkpoint_task.cancel()
+            await asyncio.gather(self._checkpoint_task, return_exceptions=True)
+            self._checkpoint_task = None
+        if self._checkpointer:
+            await self._checkpointer.close()
+            self._checkpointer = None
         if self._conn:
+            for reader in self._readers:
+                await reader.close()
+            self._readers = []
             await self._conn.close()
             self._conn = None
             print("Database connection closed")
@@ -40,5 +352,11 @@ class DatabaseManager:
 db_manager = DatabaseManager()
 
 async def get_db():
-    """Dependency for getting database connection in routes"""
-    return await db_manager.get_connection()
+    """Dependency that leases the writer connection for the duration of a request"""
+    async with db_manager.writer() as conn:
+        yield conn
+
+async def get_read_db():
+    """Dependency that leases a read-only connection for the duration of a request"""
+    async with db_manager.reader() as conn:
+        yield conn
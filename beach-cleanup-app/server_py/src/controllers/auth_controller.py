@@ -2,30 +2,43 @@
 Authentication controller for user registration and login
 """
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 from jose import jwt
 from datetime import datetime, timedelta
 import uuid
 import os
+import aiosqlite
 from dotenv import load_dotenv
 
-load_dotenv()
+from src.config.database import db_manager
+from src.services.password_hasher import password_hasher, PasswordHasherBusy
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+load_dotenv()
 
 # JWT configuration
 JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRES_IN_DAYS = 7
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    return pwd_context.hash(password)
+def _password_pool_busy(error: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Server busy, please retry: {error}",
+        headers={"Retry-After": "1"}
+    )
+
+async def hash_password(password: str) -> str:
+    """Hash a password using bcrypt in the password process pool"""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy as e:
+        raise _password_pool_busy(e)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash in the password process pool"""
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy as e:
+        raise _password_pool_busy(e)
 
 def generate_token(user: dict) -> str:
     """Generate JWT token for a user"""
@@ -39,7 +52,12 @@ def generate_token(user: dict) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 async def register(db, username: str, email: str, password: str):
-    """Register a new user"""
+    """
+    Register a new user
+
+    db is a read connection used for the duplicate check; the writer is only
+    leased for the INSERT, after the password has been hashed.
+    """
     # Validation
     if len(password) < 6:
         raise HTTPException(
@@ -60,29 +78,40 @@ async def register(db, username: str, email: str, password: str):
             detail="User with this email or username already exists"
         )
 
-    # Hash password
-    hashed_password = hash_password(password)
+    # Hash password before taking the writer, so bcrypt never holds it
+    hashed_password = await hash_password(password)
 
     # Create user
     user_id = str(uuid.uuid4())
     now = datetime.now().isoformat()
 
-    await db.execute(
-        """
-        INSERT INTO users (id, username, email, password, bio, profilePictureUrl, createdAt, updatedAt)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (user_id, username, email, hashed_password, None, None, now, now)
-    )
-    await db.commit()
-
-    # Get created user (without password)
-    cursor = await db.execute(
-        "SELECT id, username, email, bio, profilePictureUrl, createdAt FROM users WHERE id = ?",
-        (user_id,)
-    )
-    row = await cursor.fetchone()
-    user = dict(row)
+    async with db_manager.writer() as writer:
+        try:
+            await writer.execute(
+                """
+                INSERT INTO users (id, username, email, password, bio, profilePictureUrl, createdAt, updatedAt)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (user_id, username, email, hashed_password, None, None, now, now)
+            )
+            await writer.commit()
+        except aiosqlite.IntegrityError:
+            # Registered by a concurrent request since the check above
+            await writer.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="User with this email or username already exists"
+            )
+
+    # Created user (without password)
+    user = {
+        "id": user_id,
+        "username": username,
+        "email": email,
+        "bio": None,
+        "profilePictureUrl": None,
+        "createdAt": now
+    }
 
     # Generate token
     token = generate_token(user)
@@ -110,7 +139,7 @@ async def login(db, email: str, password: str):
     user = dict(row)
 
     # Verify password
-    if not verify_password(password, user["password"]):
+    if not await verify_password(password, user["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -0,0 +1,124 @@
+"""
+Feed controller
+A user's feed is their own posts, posts by people they follow, and posts on
+events they attend or organize, newest first.
+"""
+from fastapi import HTTPException, status
+from typing import Optional
+
+from src.services.pagination import encode_keyset_cursor, decode_keyset_cursor
+
+# Each branch reads (createdAt, id)-ordered index ranges past the cursor and
+# stops at the page size, so a page costs the same however deep the cursor is.
+# Branches that fan out over followees or events take at most a page from each
+# source's range in a correlated subquery, so the sort that merges them covers
+# (sources x page size) rows rather than every post those sources ever made.
+FEED_SOURCES = [
+    # Own posts
+    """
+    SELECT p.id, p.createdAt FROM posts p
+    WHERE p.authorId = :user_id AND (p.createdAt, p.id) < (:after_created, :after_id)
+    ORDER BY p.createdAt DESC, p.id DESC LIMIT :fetch
+    """,
+    # Posts by followed users
+    """
+    SELECT p.id, p.createdAt FROM user_follows uf
+    JOIN posts p ON p.id IN (
+        SELECT f.id FROM posts f
+        WHERE f.authorId = uf.followingId AND (f.createdAt, f.id) < (:after_created, :after_id)
+        ORDER BY f.createdAt DESC, f.id DESC LIMIT :fetch
+    )
+    WHERE uf.followerId = :user_id
+    ORDER BY p.createdAt DESC, p.id DESC LIMIT :fetch
+    """,
+    # Posts on events the user attends
+    """
+    SELECT p.id, p.createdAt FROM event_attendees ea
+    JOIN posts p ON p.id IN (
+        SELECT f.id FROM posts f
+        WHERE f.eventId = ea.eventId AND (f.createdAt, f.id) < (:after_created, :after_id)
+        ORDER BY f.createdAt DESC, f.id DESC LIMIT :fetch
+    )
+    WHERE ea.userId = :user_id
+    ORDER BY p.createdAt DESC, p.id DESC LIMIT :fetch
+    """,
+    # Posts on events the user organizes
+    """
+    SELECT p.id, p.createdAt FROM events e
+    JOIN posts p ON p.id IN (
+        SELECT f.id FROM posts f
+        WHERE f.eventId = e.id AND (f.createdAt, f.id) < (:after_created, :after_id)
+        ORDER BY f.createdAt DESC, f.id DESC LIMIT :fetch
+    )
+    WHERE e.organizerId = :user_id
+    ORDER BY p.createdAt DESC, p.id DESC LIMIT :fetch
+    """,
+]
+
+FEED_PAGE_QUERY = f"""
+    WITH page AS (
+        SELECT id, createdAt FROM (
+            {" UNION ".join(f"SELECT * FROM ({source})" for source in FEED_SOURCES)}
+        )
+        ORDER BY createdAt DESC, id DESC
+        LIMIT :fetch
+    )
+    SELECT p.id, p.text, p.imageUrl, p.eventId, p.createdAt, p.authorId,
+           u.username AS authorName, u.profilePictureUrl AS authorProfilePic,
+           p.likeCount AS likes, p.commentCount AS comments
+    FROM page
+    JOIN posts p ON p.id = page.id
+    JOIN users u ON u.id = p.authorId
+    ORDER BY p.createdAt DESC, p.id DESC
+"""
+
+# Sorts after every real (createdAt, id) key, so the first page has no lower bound
+_FEED_START = ("\uffff", "")
+
+async def get_feed(db, user_id: str, limit: int, cursor: Optional[str] = None):
+    """Get one page of a user's feed, with author info and like/comment counts"""
+    if cursor:
+        try:
+            after_created, after_id = decode_keyset_cursor(cursor, 2)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    else:
+        after_created, after_id = _FEED_START
+
+    # One extra row tells us whether there is another page
+    result = await db.execute(
+        FEED_PAGE_QUERY,
+        {"user_id": user_id, "after_created": after_created, "after_id": after_id, "fetch": limit + 1}
+    )
+    rows = await result.fetchall()
+
+    posts = [
+        {
+            "postId": row["id"],
+            "author": {
+                "userId": row["authorId"],
+                "username": row["authorName"],
+                "profilePictureUrl": row["authorProfilePic"]
+            },
+            "text": row["text"],
+            "imageUrl": row["imageUrl"],
+            "eventId": row["eventId"],
+            "likes": row["likes"],
+            "comments": row["comments"],
+            "createdAt": row["createdAt"]
+        }
+        for row in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = posts[-1]
+        next_cursor = encode_keyset_cursor(last["createdAt"], last["postId"])
+
+    return {
+        "posts": posts,
+        "nextCursor": next_cursor
+    }
@@ -8,6 +8,7 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from datetime import datetime
 import os
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -17,8 +18,20 @@ env_path = Path(__file__).parent.parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
 # Import routes
-from src.routes import auth_routes, posts_routes, events_routes
+from src.routes import auth_routes, posts_routes, events_routes, feed_routes, data_routes, map_routes, tide_routes, notification_routes
 from src.config.database import db_manager
+from src.services.sheets_mirror import sheets_store
+from src.services.password_hasher import password_hasher
+from src.middleware.auth import token_cache
+from src.services.map_clusters import map_clusters
+from src.services.tide_scheduler import tide_scheduler
+from src.services.push_notifications import push_fanout
+from src.services.tide_predictions import tide_predictions
+from src.services.single_flight import read_flights
+
+# How long the startup event took to bring every service up; import time is
+# measured separately with `python -X importtime`
+startup_ms = None
 
 # Create FastAPI app
 app = FastAPI(
@@ -69,8 +82,14 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database connection on startup"""
+    """Initialize database connection, password pool, Google Sheets clients and tide alerts on startup"""
+    started = time.perf_counter()
     await db_manager.get_connection()
+    db_manager.start_checkpointer()
+    await password_hasher.start()
+    await sheets_store.start()
+    tide_scheduler.set_notifier(push_fanout.send_alert)
+    await tide_scheduler.start()
 
     # Debug: Check if env vars are loaded
     spreadsheet_id = os.getenv("VITE_GOOGLE_SHEETS_SPREADSHEET_ID")
@@ -78,6 +97,9 @@ async def startup_event():
     print(f"[DEBUG] .env file path: {env_path}")
     print(f"[DEBUG] .env file exists: {env_path.exists()}")
 
+    global startup_ms
+    startup_ms = round((time.perf_counter() - started) * 1000, 2)
+
     print("""
 ==============================================================
   Beach Cleanup API Server (Python/FastAPI)
@@ -85,12 +107,18 @@ async def startup_event():
   Environment: """ + os.getenv("ENV", "development") + """
   API Docs: http://localhost:8000/docs
   Health Check: http://localhost:8000/health
+  Ready in: """ + str(startup_ms) + """ ms
 ==============================================================
     """)
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database connection on shutdown"""
+    """Stop tide alerts and close database connection, password pool and Google Sheets workers on shutdown"""
+    await tide_scheduler.close()
+    await push_fanout.close()
+    await tide_predictions.close()
+    await sheets_store.close()
+    password_hasher.close()
     await db_manager.close()
     print("\nShutting down gracefully...")
 
@@ -106,6 +134,23 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for startup, the database and password pools and the Google Sheets data path"""
+    return {
+        "startup": {"ready_ms": startup_ms},
+        "database": db_manager.metrics(),
+        "password_hasher": password_hasher.metrics(),
+        "token_cache": token_cache.metrics(),
+        "sheets": sheets_store.metrics(),
+        "map_clusters": map_clusters.metrics(),
+        "tide_alerts": tide_scheduler.metrics(),
+        "push": push_fanout.metrics(),
+        "tide_predictions": tide_predictions.metrics(),
+        "single_flight": read_flights.metrics(),
+        "timestamp": datetime.now().isoformat()
+    }
+
 # ============================================================================
 # API Routes
 # ============================================================================
@@ -114,6 +159,11 @@ async def health_check():
 app.include_router(auth_routes.router)
 app.include_router(posts_routes.router)
 app.include_router(events_routes.router)
+app.include_router(feed_routes.router)
+app.include_router(data_routes.router)
+app.include_router(map_routes.router)
+app.include_router(tide_routes.router)
+app.include_router(notification_routes.router)
 
 # 404 handler for undefined routes
 @app.get("/{full_path:path}")
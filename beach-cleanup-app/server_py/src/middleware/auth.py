@@ -4,7 +4,10 @@ Authentication middleware using JWT tokens
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from typing import Optional
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import hashlib
+import time
 import os
 from dotenv import load_dotenv
 
@@ -24,6 +27,138 @@ class TokenData:
         self.email = email
         self.username = username
 
+class TokenCache:
+    """
+    Bounded LRU of verified tokens, keyed by the token's SHA-256 digest
+
+    Each entry holds the decoded TokenData until the token's exp claim, so a
+    token is only signature-checked on its first use. Invalidated tokens are
+    remembered until they expire so they are rejected without a decode.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[TokenData, float]]" = OrderedDict()
+        self._revoked: Dict[bytes, float] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[TokenData]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        token_data, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return token_data
+
+    def put(self, token: str, token_data: TokenData, expires_at: float):
+        if self.max_size <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (token_data, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def is_revoked(self, token: str) -> bool:
+        return self._key(token) in self._revoked
+
+    def invalidate(self, token: str):
+        """
+        Revoke a token: drop it from the cache and reject it until it expires
+
+        Args:
+            token: The raw JWT
+        """
+        key = self._key(token)
+        self._entries.pop(key, None)
+        try:
+            expires_at = float(jwt.get_unverified_claims(token).get("exp", 0))
+        except JWTError:
+            return
+
+        now = time.time()
+        if expires_at > now:
+            self._revoked[key] = expires_at
+        # Expired revocations no longer matter: jwt.decode rejects those tokens anyway
+        for revoked_key in [k for k, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[revoked_key]
+
+    def clear(self):
+        """Drop every cached token (revocations are kept)"""
+        self._entries.clear()
+
+    def metrics(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0,
+            "evictions": self._evictions,
+            "revoked": len(self._revoked),
+        }
+
+# Global verified-token cache
+token_cache = TokenCache(max_size=int(os.getenv("TOKEN_CACHE_SIZE", "10000")))
+
+def verify_token(token: str) -> TokenData:
+    """
+    Verify a JWT and return its data, using the verified-token cache
+
+    Raises:
+        HTTPException: 403 if the token is invalid, expired or revoked
+    """
+    if token_cache.is_revoked(token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired token"
+        )
+
+    token_data = token_cache.get(token)
+    if token_data:
+        return token_data
+
+    try:
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired token"
+        )
+
+    user_id: str = payload.get("userId")
+    email: str = payload.get("email")
+    username: str = payload.get("username")
+
+    if user_id is None or email is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid token"
+        )
+
+    token_data = TokenData(user_id=user_id, email=email, username=username)
+    # Tokens without an exp claim are never cached
+    if payload.get("exp") is not None:
+        token_cache.put(token, token_data, float(payload["exp"]))
+    return token_data
+
 async def authenticate_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> TokenData:
@@ -39,25 +174,7 @@ async def authenticate_token(
             detail="Access token required"
         )
 
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id: str = payload.get("userId")
-        email: str = payload.get("email")
-        username: str = payload.get("username")
-
-        if user_id is None or email is None:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Invalid token"
-            )
-
-        return TokenData(user_id=user_id, email=email, username=username)
-
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid or expired token"
-        )
+    return verify_token(token)
 
 async def optional_auth(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
@@ -69,17 +186,7 @@ async def optional_auth(
     if not credentials:
         return None
 
-    token = credentials.credentials
-
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id: str = payload.get("userId")
-        email: str = payload.get("email")
-        username: str = payload.get("username")
-
-        if user_id and email:
-            return TokenData(user_id=user_id, email=email, username=username)
-    except JWTError:
-        pass
-
-    return None
+        return verify_token(credentials.credentials)
+    except HTTPException:
+        return None
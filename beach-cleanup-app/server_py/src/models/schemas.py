@@ -77,6 +77,17 @@ class PostCreate(BaseModel):
 class PostUpdate(BaseModel):
     content: Optional[str] = None
 
+# ============================================================================
+# Tide Alert Schemas
+# ============================================================================
+
+class TideSubscriptionCreate(BaseModel):
+    stationId: str = Field(..., min_length=1, max_length=20)
+
+class DeviceRegister(BaseModel):
+    token: str = Field(..., min_length=1, max_length=4096)
+    platform: Optional[str] = Field(None, max_length=20)
+
 # ============================================================================
 # Response Models
 # ============================================================================
@@ -0,0 +1,126 @@
+"""
+Environmental data routes (tides, debris hotspots and spatial event lookups)
+"""
+import os
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from src.config.database import get_read_db
+from src.services.spatial_index import hotspot_index, event_index
+from src.services.tide_predictions import tide_predictions, TideUpstreamError
+
+router = APIRouter(prefix="/api/v1/data", tags=["Data"])
+
+MAX_RESULTS = 1000
+
+# Sample station (Providence, RI) used when none is given, as in the Node server
+DEFAULT_TIDE_STATION = os.getenv("TIDES_DEFAULT_STATION", "8454000")
+
+def _check_bbox(min_lat: float, max_lat: float):
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="min_lat must not be greater than max_lat")
+
+@router.get("/tides")
+async def get_tides(
+    date: str = Query(..., description="Day as YYYY-MM-DD"),
+    station: str = Query(DEFAULT_TIDE_STATION, pattern=r"^[A-Za-z0-9]{1,20}$")
+):
+    """High and low tide predictions for a station and day"""
+    try:
+        date = datetime.strptime(date, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+
+    try:
+        predictions = await tide_predictions.get(station, date)
+    except TideUpstreamError as e:
+        raise HTTPException(status_code=502, detail=f"Tide predictions unavailable: {str(e)}")
+
+    return {
+        "date": date,
+        "station": station,
+        "predictions": [
+            {
+                "type": p["type"],
+                # "YYYY-MM-DD HH:MM" (NOAA) or ISO; the day is already known
+                "time": p["time"].replace("T", " ").split(" ")[1][:5],
+                "height": f"{p['height']} ft" if p.get("height") is not None else None
+            }
+            for p in predictions
+        ]
+    }
+
+@router.get("/debris-hotspots")
+async def get_debris_hotspots(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(50, gt=0, le=20000),
+    limit: int = Query(500, ge=1, le=MAX_RESULTS),
+    db=Depends(get_read_db)
+):
+    """Debris hotspots within radius_km of a point, highest debris score first (at most limit)"""
+    hotspots = await hotspot_index.within_radius(db, lat, lon, radius_km, limit, order_by="debrisScore")
+    return [
+        {
+            "location": hotspot["location"],
+            "debrisScore": hotspot["debrisScore"],
+            "lat": hotspot["lat"],
+            "lon": hotspot["lon"],
+            "description": hotspot["description"],
+            "distanceKm": round(hotspot["distanceKm"], 1)
+        }
+        for hotspot in hotspots
+    ]
+
+@router.get("/debris-hotspots/bbox")
+async def get_debris_hotspots_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    limit: int = Query(500, ge=1, le=MAX_RESULTS),
+    db=Depends(get_read_db)
+):
+    """
+    Debris hotspots inside a bounding box
+    A box with min_lon greater than max_lon crosses the antimeridian
+    """
+    _check_bbox(min_lat, max_lat)
+    return {"hotspots": await hotspot_index.within_bbox(db, min_lat, min_lon, max_lat, max_lon, limit)}
+
+@router.get("/debris-hotspots/nearest")
+async def get_nearest_debris_hotspots(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=MAX_RESULTS),
+    radius_km: float = Query(50, gt=0, le=20000),
+    db=Depends(get_read_db)
+):
+    """The k debris hotspots nearest to a point within radius_km, nearest first"""
+    return {"hotspots": await hotspot_index.nearest(db, lat, lon, k, radius_km)}
+
+@router.get("/events/bbox")
+async def get_events_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    limit: int = Query(500, ge=1, le=MAX_RESULTS),
+    db=Depends(get_read_db)
+):
+    """
+    Events inside a bounding box
+    A box with min_lon greater than max_lon crosses the antimeridian
+    """
+    _check_bbox(min_lat, max_lat)
+    return {"events": await event_index.within_bbox(db, min_lat, min_lon, max_lat, max_lon, limit)}
+
+@router.get("/events/nearest")
+async def get_nearest_events(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=MAX_RESULTS),
+    radius_km: float = Query(50, gt=0, le=20000),
+    db=Depends(get_read_db)
+):
+    """The k events nearest to a point within radius_km, nearest first"""
+    return {"events": await event_index.nearest(db, lat, lon, k, radius_km)}
@@ -2,11 +2,14 @@
 Events Routes
 Handles all event-related API endpoints
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional, Dict
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, List
 from datetime import datetime
-from src.services.google_sheets_service import sheets_service
+from src.services.sheets_mirror import sheets_store
+from src.services.map_clusters import map_clusters
+from src.services.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.services.single_flight import read_flights
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
@@ -33,6 +36,20 @@ class ParticipantsUpdate(BaseModel):
     eventId: str
     participants: int
 
+class ParticipantsIncrement(BaseModel):
+    eventId: str
+    amount: int = Field(1, ge=1)
+
+class NearbyQuery(BaseModel):
+    points: List[Coordinates] = Field(..., min_length=1, max_length=1000)
+    k: int = Field(10, ge=1, le=MAX_PAGE_SIZE)
+    radiusKm: Optional[float] = Field(None, gt=0)
+
+def _forget_reads():
+    """Later reads must not join one that started before this write"""
+    read_flights.forget(get_all_events)
+    read_flights.forget(get_nearby_events)
+
 @router.post("/add")
 async def add_event(event: EventData):
     """
@@ -47,7 +64,9 @@ async def add_event(event: EventData):
             event_data['coordinates'] = event_data['coordinates'].model_dump()
 
         # Add event to Google Sheets
-        sheets_service.add_event(event_data)
+        await sheets_store.add_event(event_data)
+        map_clusters.add_event(event_data)
+        _forget_reads()
 
         return {
             "success": True,
@@ -68,7 +87,8 @@ async def update_participants(update: ParticipantsUpdate):
     """
     try:
         # Update participants in Google Sheets
-        sheets_service.update_event_participants(update.eventId, update.participants)
+        await sheets_store.update_event_participants(update.eventId, update.participants)
+        _forget_reads()
 
         return {
             "success": True,
@@ -81,19 +101,131 @@ async def update_participants(update: ParticipantsUpdate):
             detail=f"Error updating participants: {str(e)}"
         )
 
-@router.get("/all")
-async def get_all_events():
+@router.post("/participants/increment")
+async def increment_participants(update: ParticipantsIncrement):
+    """
+    Add participants to an event; merged with other pending changes and written on the next flush
+    """
+    try:
+        participants = await sheets_store.increment_participants(update.eventId, update.amount)
+        if participants is None:
+            raise HTTPException(status_code=404, detail="Event not found")
+        _forget_reads()
+
+        return {
+            "success": True,
+            "message": "Participant added",
+            "participants": participants
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error updating participants: {str(e)}"
+        )
+
+@router.post("/participants/decrement")
+async def decrement_participants(update: ParticipantsIncrement):
+    """
+    Remove participants from an event; merged with other pending changes and written on the next flush
+    """
+    try:
+        participants = await sheets_store.increment_participants(update.eventId, -update.amount)
+        if participants is None:
+            raise HTTPException(status_code=404, detail="Event not found")
+        _forget_reads()
+
+        return {
+            "success": True,
+            "message": "Participant removed",
+            "participants": participants
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error updating participants: {str(e)}"
+        )
+
+@router.get("/nearby")
+@read_flights.coalesce()
+async def get_nearby_events(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    radius_km: Optional[float] = Query(None, gt=0)
+):
     """
-    Fetch all events from Google Sheets
+    The k events closest to a point, nearest first, each with distanceKm
+    Events without coordinates are skipped; concurrent identical queries share one ranking
     """
     try:
-        events = sheets_service.get_all_events()
+        events = await sheets_store.nearest_events(lat, lng, k, radius_km)
 
         return {
             "success": True,
             "data": events
         }
 
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error ranking events: {str(e)}"
+        )
+
+@router.post("/nearby")
+async def get_nearby_events_batch(query: NearbyQuery):
+    """
+    Rank events for many points in one request
+    Returns one nearest-first list per point, in the order the points were given
+    """
+    try:
+        rankings = await sheets_store.nearest_events_many(
+            [(point.lat, point.lng) for point in query.points], query.k, query.radiusKm
+        )
+
+        return {
+            "success": True,
+            "data": rankings
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error ranking events: {str(e)}"
+        )
+
+@router.get("/all")
+@read_flights.coalesce()
+async def get_all_events(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Fetch events from Google Sheets, one page at a time
+    Pass the returned nextCursor as cursor to get the following page;
+    concurrent requests for the same page share one fetch
+    """
+    try:
+        events = await sheets_store.get_all_events()
+
+        try:
+            page, next_cursor = paginate(events, limit, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        return {
+            "success": True,
+            "data": page,
+            "nextCursor": next_cursor
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -0,0 +1,23 @@
+"""
+Feed routes
+"""
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from src.config.database import get_read_db
+from src.middleware.auth import authenticate_token, TokenData
+from src.controllers import feed_controller
+
+router = APIRouter(prefix="/api/v1/feed", tags=["Feed"])
+
+@router.get("")
+async def get_feed(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: TokenData = Depends(authenticate_token),
+    db=Depends(get_read_db)
+):
+    """
+    Get the current user's feed, newest first
+    Pass the returned nextCursor as cursor to get the following page
+    """
+    return await feed_controller.get_feed(db, current_user.user_id, limit, cursor)
@@ -0,0 +1,21 @@
+"""
+Map routes (clustered markers served per tile)
+"""
+from fastapi import APIRouter, HTTPException, Path
+from src.services.map_clusters import map_clusters, MAX_TILE_ZOOM
+
+router = APIRouter(prefix="/api/v1/map", tags=["Map"])
+
+@router.get("/tiles/{z}/{x}/{y}")
+async def get_map_tile(
+    z: int = Path(..., ge=0, le=MAX_TILE_ZOOM),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0)
+):
+    """
+    Clustered hotspot and event markers for one XYZ map tile
+    Features are clusters (with counts and a centroid) or single hotspots/events
+    """
+    if x >= 1 << z or y >= 1 << z:
+        raise HTTPException(status_code=400, detail=f"Tile {x}/{y} is outside zoom level {z}")
+    return await map_clusters.tile(z, x, y)
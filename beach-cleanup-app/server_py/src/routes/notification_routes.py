@@ -0,0 +1,34 @@
+"""
+Notification routes (push notification device registration)
+"""
+from fastapi import APIRouter, Depends
+from src.config.database import get_db
+from src.middleware.auth import authenticate_token, TokenData
+from src.models.schemas import DeviceRegister
+from src.services.push_notifications import push_fanout
+
+router = APIRouter(prefix="/api/v1/notifications", tags=["Notifications"])
+
+@router.post("/devices", status_code=201)
+async def register_device(
+    device: DeviceRegister,
+    current_user: TokenData = Depends(authenticate_token),
+    db=Depends(get_db)
+):
+    """Register this device's push token for the current user"""
+    await push_fanout.register_device(db, current_user.user_id, device.token, device.platform)
+    return {"message": "Device registered"}
+
+@router.delete("/devices/{token}")
+async def unregister_device(
+    token: str,
+    current_user: TokenData = Depends(authenticate_token),
+    db=Depends(get_db)
+):
+    """Stop push notifications to a device"""
+    await db.execute(
+        "DELETE FROM device_tokens WHERE token = ? AND userId = ?",
+        (token, current_user.user_id)
+    )
+    await db.commit()
+    return {"message": "Device unregistered"}
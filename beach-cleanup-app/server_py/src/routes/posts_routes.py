@@ -2,11 +2,13 @@
 Posts Routes
 Handles all post-related API endpoints
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from src.services.google_sheets_service import sheets_service
+from src.services.sheets_mirror import sheets_store
+from src.services.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.services.single_flight import read_flights
 
 router = APIRouter(prefix="/api/posts", tags=["posts"])
 
@@ -25,6 +27,14 @@ class UpvoteUpdate(BaseModel):
     postId: str
     upvotes: int
 
+class UpvoteIncrement(BaseModel):
+    postId: str
+    amount: int = Field(1, ge=1)
+
+def _forget_reads():
+    """Later reads must not join one that started before this write"""
+    read_flights.forget(get_all_posts)
+
 @router.post("/add")
 async def add_post(post: PostData):
     """
@@ -35,10 +45,11 @@ async def add_post(post: PostData):
         post_data = post.model_dump()
 
         print(f"[DEBUG] Received post data: {post_data.get('id', 'NO_ID')}")
-        print(f"[DEBUG] sheets_service.spreadsheet_id: {sheets_service.spreadsheet_id}")
+        print(f"[DEBUG] sheets_store.spreadsheet_id: {sheets_store.spreadsheet_id}")
 
         # Add post to Google Sheets
-        sheets_service.add_post(post_data)
+        await sheets_store.add_post(post_data)
+        _forget_reads()
 
         return {
             "success": True,
@@ -62,7 +73,8 @@ async def update_upvotes(update: UpvoteUpdate):
     """
     try:
         # Update upvotes in Google Sheets
-        sheets_service.update_upvotes(update.postId, update.upvotes)
+        await sheets_store.update_upvotes(update.postId, update.upvotes)
+        _forget_reads()
 
         return {
             "success": True,
@@ -74,3 +86,86 @@ async def update_upvotes(update: UpvoteUpdate):
             status_code=500,
             detail=f"Error updating upvotes: {str(e)}"
         )
+
+@router.post("/upvote/increment")
+async def increment_upvotes(update: UpvoteIncrement):
+    """
+    Add upvotes to a post; merged with other pending changes and written on the next flush
+    """
+    try:
+        upvotes = await sheets_store.increment_upvotes(update.postId, update.amount)
+        if upvotes is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        _forget_reads()
+
+        return {
+            "success": True,
+            "message": "Upvote recorded",
+            "upvotes": upvotes
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error updating upvotes: {str(e)}"
+        )
+
+@router.post("/upvote/decrement")
+async def decrement_upvotes(update: UpvoteIncrement):
+    """
+    Remove upvotes from a post; merged with other pending changes and written on the next flush
+    """
+    try:
+        upvotes = await sheets_store.increment_upvotes(update.postId, -update.amount)
+        if upvotes is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        _forget_reads()
+
+        return {
+            "success": True,
+            "message": "Upvote removed",
+            "upvotes": upvotes
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error updating upvotes: {str(e)}"
+        )
+
+@router.get("/all")
+@read_flights.coalesce()
+async def get_all_posts(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Fetch posts from Google Sheets, one page at a time
+    Pass the returned nextCursor as cursor to get the following page;
+    concurrent requests for the same page share one fetch
+    """
+    try:
+        posts = await sheets_store.get_all_posts()
+
+        try:
+            page, next_cursor = paginate(posts, limit, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        return {
+            "success": True,
+            "data": page,
+            "nextCursor": next_cursor
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching posts: {str(e)}"
+        )
@@ -0,0 +1,50 @@
+"""
+Tide alert routes (low tide alert subscriptions)
+"""
+from datetime import datetime
+from fastapi import APIRouter, Depends
+from src.config.database import get_db, get_read_db
+from src.middleware.auth import authenticate_token, TokenData
+from src.models.schemas import TideSubscriptionCreate
+from src.services.tide_scheduler import tide_scheduler
+
+router = APIRouter(prefix="/api/v1/tides", tags=["Tides"])
+
+@router.get("/subscriptions")
+async def get_subscriptions(current_user: TokenData = Depends(authenticate_token), db=Depends(get_read_db)):
+    """Tide stations the current user gets low tide alerts for"""
+    cursor = await db.execute(
+        "SELECT stationId, createdAt FROM tide_subscriptions WHERE userId = ? ORDER BY createdAt",
+        (current_user.user_id,)
+    )
+    return {"subscriptions": [dict(row) for row in await cursor.fetchall()]}
+
+@router.post("/subscriptions", status_code=201)
+async def subscribe(
+    subscription: TideSubscriptionCreate,
+    current_user: TokenData = Depends(authenticate_token),
+    db=Depends(get_db)
+):
+    """Get low tide alerts for a tide station"""
+    await db.execute(
+        "INSERT OR IGNORE INTO tide_subscriptions (userId, stationId, createdAt) VALUES (?, ?, ?)",
+        (current_user.user_id, subscription.stationId, datetime.now().isoformat())
+    )
+    await db.commit()
+    tide_scheduler.subscribe(subscription.stationId, current_user.user_id)
+    return {"message": "Subscribed to low tide alerts", "stationId": subscription.stationId}
+
+@router.delete("/subscriptions/{station_id}")
+async def unsubscribe(
+    station_id: str,
+    current_user: TokenData = Depends(authenticate_token),
+    db=Depends(get_db)
+):
+    """Stop low tide alerts for a tide station"""
+    await db.execute(
+        "DELETE FROM tide_subscriptions WHERE userId = ? AND stationId = ?",
+        (current_user.user_id, station_id)
+    )
+    await db.commit()
+    tide_scheduler.unsubscribe(station_id, current_user.user_id)
+    return {"message": "Unsubscribed from low tide alerts", "stationId": station_id}
@@ -0,0 +1,146 @@
+"""
+Append Batcher
+Coalesces individual row submissions into multi-row writes. Items collect
+until either the batch is full or the batching window closes, then one flush
+call writes them all and every submitter receives that flush's result.
+A flush that fails part way can say how many leading items it wrote (an
+exception with a `written` count); those submitters succeed and only the
+rest see the error, so nothing already written is retried.
+"""
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+class AppendBatcher:
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List[Any]], Awaitable[Any]],
+        max_batch_size: int = 50,
+        max_delay: float = 0.2
+    ):
+        """
+        Args:
+            name: Label used in logs and metrics
+            flush: Coroutine function that writes a list of items in one call.
+                On failure it may raise an exception with a `written` attribute:
+                the number of leading items that were written anyway.
+            max_batch_size: Flush as soon as this many items are waiting
+            max_delay: Seconds the first waiting item may sit before a flush
+        """
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay = max_delay
+        self._flush_fn = flush
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_requested = False
+        self._lock: Optional[asyncio.Lock] = None
+        self._tasks = set()
+
+        # Metrics
+        self._batches = 0
+        self._items = 0
+        self._failed_batches = 0
+        self._largest_batch = 0
+        self._flush_seconds_total = 0.0
+        self._flush_seconds_max = 0.0
+        self._last_flush_seconds = 0.0
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item and wait until the batch containing it is written
+
+        Args:
+            item: The item to write
+
+        Returns:
+            The result of the flush that wrote the item
+
+        Raises:
+            Whatever the flush raised, if the batch failed
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        self._schedule()
+        return await future
+
+    def _schedule(self):
+        """Start a flush when the batch is full, otherwise arm the window timer"""
+        if len(self._pending) >= self.max_batch_size:
+            if not self._flush_requested:
+                self._start_flush()
+        elif self._pending and self._timer is None and not self._flush_requested:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._start_flush)
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._flush_requested = True
+        task = asyncio.get_running_loop().create_task(self._flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self):
+        # One flush at a time; anything submitted meanwhile joins the next batch
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            self._flush_requested = False
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:len(batch)]
+
+            if batch:
+                started = time.perf_counter()
+                try:
+                    result = await self._flush_fn([item for item, _ in batch])
+                except Exception as e:
+                    self._failed_batches += 1
+                    written = getattr(e, 'written', 0)
+                    print(f"[ERROR] {self.name} batch of {len(batch)} failed: {e}")
+                    for position, (_, future) in enumerate(batch):
+                        if future.done():
+                            continue
+                        if position < written:
+                            future.set_result(True)
+                        else:
+                            future.set_exception(e)
+                else:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(result)
+                finally:
+                    self._record(len(batch), time.perf_counter() - started)
+
+        self._schedule()
+
+    def _record(self, size: int, seconds: float):
+        self._batches += 1
+        self._items += size
+        self._largest_batch = max(self._largest_batch, size)
+        self._flush_seconds_total += seconds
+        self._flush_seconds_max = max(self._flush_seconds_max, seconds)
+        self._last_flush_seconds = seconds
+
+    async def close(self):
+        """Flush everything still waiting and wait for in-flight batches"""
+        while self._pending or self._tasks:
+            if self._pending and not self._flush_requested:
+                self._start_flush()
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def metrics(self) -> dict:
+        """Batch size and flush latency statistics"""
+        return {
+            "batches": self._batches,
+            "items": self._items,
+            "failed_batches": self._failed_batches,
+            "pending": len(self._pending),
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0,
+            "max_batch_size": self._largest_batch,
+            "avg_flush_ms": round(self._flush_seconds_total / self._batches * 1000, 2) if self._batches else 0,
+            "max_flush_ms": round(self._flush_seconds_max * 1000, 2),
+            "last_flush_ms": round(self._last_flush_seconds * 1000, 2),
+        }
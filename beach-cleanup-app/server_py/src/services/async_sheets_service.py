@@ -0,0 +1,258 @@
+"""
+Async Google Sheets Service
+Awaitable wrapper around GoogleSheetsService that runs the blocking
+googleapiclient calls on a bounded thread pool, so the event loop keeps
+serving other requests while Sheets round trips are in flight.
+Post and event appends are coalesced into multi-row writes, and upvote and
+participant increments are merged in memory and flushed periodically.
+Concurrent identical reads share one in-flight fetch.
+"""
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable
+
+from src.services.google_sheets_service import GoogleSheetsService, sheets_service
+from src.services.append_batcher import AppendBatcher
+from src.services.counter_buffer import CounterBuffer
+from src.services.geo_index import GeoIndex, event_points
+from src.services.single_flight import read_flights
+
+SERVER_ROOT = Path(__file__).parent.parent.parent
+
+class AsyncGoogleSheetsService:
+    def __init__(self, service: GoogleSheetsService, max_workers: Optional[int] = None):
+        """Wrap a synchronous GoogleSheetsService
+
+        Args:
+            service: The synchronous service that performs the actual API calls
+            max_workers: Maximum number of concurrent Sheets calls. Defaults to
+                SHEETS_MAX_WORKERS from the environment (8 if unset).
+        """
+        self.service = service
+        self.max_workers = max_workers or int(os.getenv("SHEETS_MAX_WORKERS", "8"))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._warm_up_task: Optional[asyncio.Task] = None
+
+        # Appends collect for SHEETS_APPEND_BATCH_WINDOW_MS or until
+        # SHEETS_APPEND_BATCH_SIZE rows are waiting, then go out as one append
+        batch_size = int(os.getenv("SHEETS_APPEND_BATCH_SIZE", "50"))
+        batch_window = float(os.getenv("SHEETS_APPEND_BATCH_WINDOW_MS", "100")) / 1000
+        self._post_batcher = AppendBatcher(
+            "posts",
+            lambda posts: self.run(self.service.add_posts, posts),
+            max_batch_size=batch_size,
+            max_delay=batch_window
+        )
+        self._event_batcher = AppendBatcher(
+            "events",
+            lambda events: self.run(self.service.add_events, events),
+            max_batch_size=batch_size,
+            max_delay=batch_window
+        )
+
+        # Increments merge per id and are written every SHEETS_COUNTER_FLUSH_INTERVAL seconds;
+        # deltas a failed final flush leaves behind are saved under SHEETS_COUNTER_STATE_DIR
+        flush_interval = float(os.getenv("SHEETS_COUNTER_FLUSH_INTERVAL", "2"))
+        state_dir = SERVER_ROOT / os.getenv("SHEETS_COUNTER_STATE_DIR", "cache/counters")
+        self._upvote_counters = CounterBuffer(
+            "upvote",
+            lambda deltas: self.run(self.service.apply_upvote_deltas, deltas),
+            interval=flush_interval,
+            state_path=state_dir / "upvotes.json"
+        )
+        self._participant_counters = CounterBuffer(
+            "participant",
+            lambda deltas: self.run(self.service.apply_participant_deltas, deltas),
+            interval=flush_interval,
+            state_path=state_dir / "participants.json"
+        )
+
+        # Distance ranking over event coordinates; rebuilt when the read cache hands out a new list
+        self.event_geo = GeoIndex()
+        self._geo_events: Optional[List[Dict[str, Any]]] = None
+        self._geo_by_id: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def spreadsheet_id(self) -> Optional[str]:
+        return self.service.spreadsheet_id
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the worker pool on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="sheets"
+            )
+        return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """
+        Run a blocking callable on the Sheets worker pool
+
+        Args:
+            func: The blocking callable
+            *args, **kwargs: Arguments passed through to func
+
+        Returns:
+            Whatever func returns
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            functools.partial(func, *args, **kwargs)
+        )
+
+    async def add_post(self, post_data: Dict[str, Any]) -> bool:
+        result = await self._post_batcher.submit(post_data)
+        read_flights.forget(self.get_all_posts)
+        return result
+
+    async def update_upvotes(self, post_id: str, upvotes: int) -> bool:
+        result = await self.run(self.service.update_upvotes, post_id, upvotes)
+        self._upvote_counters.set_known(post_id, upvotes)
+        read_flights.forget(self.get_all_posts)
+        return result
+
+    async def increment_upvotes(self, post_id: str, delta: int = 1) -> Optional[int]:
+        """
+        Queue an upvote change for the next counter flush
+
+        Returns:
+            The projected upvote count, or None if the post does not exist
+        """
+        if not self._upvote_counters.is_known(post_id):
+            upvotes = await self._current_upvotes(post_id)
+            if upvotes is None:
+                return None
+            if not self._upvote_counters.is_known(post_id):
+                self._upvote_counters.set_known(post_id, upvotes)
+        return self._upvote_counters.add(post_id, delta)
+
+    @read_flights.coalesce()
+    async def _current_upvotes(self, post_id: str) -> Optional[int]:
+        return (await self.run(self.service.read_upvotes, [post_id])).get(post_id)
+
+    @read_flights.coalesce()
+    async def get_all_posts(self) -> List[Dict[str, Any]]:
+        return await self.run(self.service.get_all_posts)
+
+    async def read_all_posts(self) -> List[Dict[str, Any]]:
+        return await self.run(self.service.read_all_posts)
+
+    async def add_event(self, event_data: Dict[str, Any]) -> bool:
+        result = await self._event_batcher.submit(event_data)
+        self.event_geo.add(event_points([event_data]))
+        if event_data.get('id'):
+            self._geo_by_id[event_data['id']] = event_data
+        read_flights.forget(self.get_all_events)
+        return result
+
+    @read_flights.coalesce()
+    async def get_all_events(self) -> List[Dict[str, Any]]:
+        return await self.run(self.service.get_all_events)
+
+    async def read_all_events(self) -> List[Dict[str, Any]]:
+        return await self.run(self.service.read_all_events)
+
+    async def nearest_events(
+        self, lat: float, lng: float, k: int, radius_km: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """The k events closest to (lat, lng), nearest first, with distanceKm set"""
+        return (await self.nearest_events_many([(lat, lng)], k, radius_km))[0]
+
+    async def nearest_events_many(
+        self, points: List[tuple], k: int, radius_km: Optional[float] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Rank events for many (lat, lng) query points in one batched pass"""
+        await self._sync_event_geo()
+        return [
+            [{**self._geo_by_id[event_id], 'distanceKm': round(distance, 3)} for event_id, distance in ranked]
+            for ranked in self.event_geo.nearest_many(points, k, radius_km)
+        ]
+
+    async def _sync_event_geo(self):
+        events = await self.get_all_events()
+        # The read cache returns the same list object until it reloads, so this rebuilds once per reload
+        if events is not self._geo_events:
+            self.event_geo.rebuild(event_points(events))
+            self._geo_by_id = {event['id']: event for event in events if event.get('id')}
+            self._geo_events = events
+
+    async def update_event_participants(self, event_id: str, participants: int) -> bool:
+        result = await self.run(self.service.update_event_participants, event_id, participants)
+        self._participant_counters.set_known(event_id, participants)
+        read_flights.forget(self.get_all_events)
+        return result
+
+    async def increment_participants(self, event_id: str, delta: int = 1) -> Optional[int]:
+        """
+        Queue a participant change for the next counter flush
+
+        Returns:
+            The projected participant count, or None if the event does not exist
+        """
+        if not self._participant_counters.is_known(event_id):
+            participants = await self._current_participants(event_id)
+            if participants is None:
+                return None
+            if not self._participant_counters.is_known(event_id):
+                self._participant_counters.set_known(event_id, participants)
+        return self._participant_counters.add(event_id, delta)
+
+    @read_flights.coalesce()
+    async def _current_participants(self, event_id: str) -> Optional[int]:
+        return (await self.run(self.service.read_participants, [event_id])).get(event_id)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Backend health, append batching, counter flush and read cache statistics"""
+        return {
+            "backend": self.service.backend_status(),
+            "read_cache": self.service.cache_metrics(),
+            "append_batches": {
+                "posts": self._post_batcher.metrics(),
+                "events": self._event_batcher.metrics(),
+            },
+            "counters": {
+                "upvotes": self._upvote_counters.metrics(),
+                "participants": self._participant_counters.metrics(),
+            },
+            "event_geo_points": len(self.event_geo),
+        }
+
+    async def start(self):
+        """
+        Open the shared Apps Script client and build the API client in the background
+
+        The warm-up is not awaited, so the server starts answering (including
+        /health) while credentials and the discovery document load.
+        """
+        await self.service.open_http_client()
+        self._warm_up_task = asyncio.get_running_loop().create_task(self.run(self.service.warm_up))
+        await self._upvote_counters.start()
+        await self._participant_counters.start()
+
+    async def close(self):
+        """Flush queued appends and counters, then stop the worker pool letting in-flight calls finish"""
+        await self._post_batcher.close()
+        await self._event_batcher.close()
+        for counters in (self._upvote_counters, self._participant_counters):
+            try:
+                await counters.close()
+            except Exception as e:
+                print(f"[ERROR] {e}")
+
+        if self._executor is not None:
+            executor = self._executor
+            self._executor = None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+            print("Google Sheets worker pool closed")
+
+        await self.service.close_http_client()
+        self.service.stop()
+
+
+# Create a singleton instance
+async_sheets_service = AsyncGoogleSheetsService(sheets_service)
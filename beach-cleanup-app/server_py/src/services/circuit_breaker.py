@@ -0,0 +1,104 @@
+"""
+Circuit Breaker
+Remembers that a backend is unhealthy so callers can go straight to the
+fallback instead of paying a failed round trip on every request. While the
+circuit is open a background thread probes the backend and closes the
+circuit once it answers again.
+"""
+import time
+import threading
+from typing import Callable, Optional
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], None],
+        failure_threshold: int = 3,
+        probe_interval: float = 30.0,
+        max_probe_interval: float = 300.0
+    ):
+        """
+        Args:
+            name: Backend name used in logs and metrics
+            probe: Blocking callable that raises if the backend is still unhealthy
+            failure_threshold: Consecutive failures that open the circuit
+            probe_interval: Seconds before the first recovery probe
+            max_probe_interval: Upper bound for the doubling probe interval
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self._probe = probe
+        self._state = self.CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._opened_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def allow(self) -> bool:
+        """Whether requests should be sent to this backend"""
+        return self._state == self.CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self, error: Exception):
+        """Count a failure that may be transient; opens the circuit at the threshold"""
+        with self._lock:
+            self._failures += 1
+            failures = self._failures
+        if failures >= self.failure_threshold:
+            self.trip(error)
+
+    def trip(self, error: Exception):
+        """Open the circuit immediately and start probing for recovery"""
+        with self._lock:
+            self._last_error = str(error)
+            if self._state == self.OPEN:
+                return
+            self._state = self.OPEN
+            self._trips += 1
+            self._opened_at = time.monotonic()
+
+        print(f"[WARNING] {self.name} circuit opened, routing to fallback: {error}")
+        threading.Thread(target=self._probe_loop, name=f"{self.name}-probe", daemon=True).start()
+
+    def _probe_loop(self):
+        interval = self.probe_interval
+        while not self._stopped.wait(interval):
+            try:
+                self._probe()
+            except Exception as e:
+                with self._lock:
+                    self._last_error = str(e)
+                interval = min(interval * 2, self.max_probe_interval)
+                continue
+
+            with self._lock:
+                self._state = self.CLOSED
+                self._failures = 0
+                self._opened_at = None
+            print(f"[INFO] {self.name} recovered, circuit closed")
+            return
+
+    def stop(self):
+        """Stop any background probing"""
+        self._stopped.set()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "open_seconds": round(time.monotonic() - self._opened_at, 1) if self._opened_at else 0,
+                "last_error": self._last_error,
+            }
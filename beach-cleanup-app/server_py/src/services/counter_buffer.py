@@ -0,0 +1,171 @@
+"""
+Counter Buffer
+Accumulates increments and decrements in memory and writes them out
+periodically. Deltas to the same key merge, so a key touched a thousand
+times between flushes still costs a single cell write.
+
+Deltas a failed flush could not write are retried on the next one. If the
+final flush at shutdown fails, they are saved to a JSON file and loaded
+back by start(), so they survive a restart.
+"""
+import os
+import json
+import time
+import asyncio
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+class CounterBuffer:
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[Dict[str, int]], Awaitable[Dict[str, int]]],
+        interval: float = 2.0,
+        state_path: Optional[Path] = None
+    ):
+        """
+        Args:
+            name: Label used in logs and metrics
+            flush: Coroutine function that applies {key: delta} and returns the
+                resulting absolute {key: value} for every key it found
+            interval: Seconds between flushes
+            state_path: JSON file holding deltas left unwritten at shutdown
+        """
+        self.name = name
+        self.interval = interval
+        self.state_path = state_path
+        self._flush_fn = flush
+        self._pending: Dict[str, int] = {}
+        self._known: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._closing = asyncio.Event()
+
+        # Metrics
+        self._increments = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._keys_written = 0
+        self._last_flush_seconds = 0.0
+
+    def add(self, key: str, delta: int) -> Optional[int]:
+        """
+        Record a change to a counter
+
+        Args:
+            key: Counter id (post or event id)
+            delta: Amount to add; negative to decrement
+
+        Returns:
+            The projected value if the counter's last flushed value is known, else None
+        """
+        self._pending[key] = self._pending.get(key, 0) + delta
+        self._increments += 1
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self.projected(key)
+
+    def is_known(self, key: str) -> bool:
+        """Whether the counter's current value is known"""
+        return key in self._known
+
+    def projected(self, key: str) -> Optional[int]:
+        """Last flushed value plus any pending delta, if the flushed value is known"""
+        if key not in self._known:
+            return None
+        return max(0, self._known[key] + self._pending.get(key, 0))
+
+    def set_known(self, key: str, value: int):
+        """Record an absolute value written outside the buffer"""
+        self._known[key] = value
+
+    async def start(self):
+        """Load deltas saved by a previous shutdown and flush them with the next batch"""
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            saved = await asyncio.to_thread(self._read_state)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not load saved {self.name} deltas from {self.state_path}: {e}")
+            return
+        for key, delta in saved.items():
+            self._pending[key] = self._pending.get(key, 0) + int(delta)
+        os.remove(self.state_path)
+        if self._pending and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        print(f"[INFO] Loaded {len(saved)} unwritten {self.name} delta(s) from {self.state_path}")
+
+    def _read_state(self) -> Dict[str, int]:
+        with open(self.state_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.state_path.with_suffix(".tmp")
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self._pending, f)
+        os.replace(temp, self.state_path)
+
+    async def _run(self):
+        while not self._closing.is_set():
+            try:
+                await asyncio.wait_for(self._closing.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def flush(self):
+        """Write every dirty counter in one flush call"""
+        deltas = {key: delta for key, delta in self._pending.items() if delta}
+        self._pending = {}
+        if not deltas:
+            return
+
+        started = time.perf_counter()
+        try:
+            totals = await self._flush_fn(deltas)
+        except Exception as e:
+            self._failed_flushes += 1
+            print(f"[ERROR] Flushing {len(deltas)} {self.name} counter(s) failed, will retry: {e}")
+            # Merge the deltas back so the next flush retries them
+            for key, delta in deltas.items():
+                self._pending[key] = self._pending.get(key, 0) + delta
+            return
+
+        missing = set(deltas) - set(totals)
+        if missing:
+            print(f"[WARNING] Dropping {self.name} deltas for unknown id(s): {', '.join(sorted(missing))}")
+
+        self._known.update(totals)
+        self._flushes += 1
+        self._keys_written += len(totals)
+        self._last_flush_seconds = time.perf_counter() - started
+
+    async def close(self):
+        """
+        Stop the flush loop after a final flush
+
+        Raises:
+            Exception: If the final flush failed and the deltas could not be saved
+        """
+        self._closing.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+        if not self._pending:
+            return
+
+        if self.state_path is None:
+            raise Exception(f"{len(self._pending)} {self.name} delta(s) could not be written and were lost")
+        await asyncio.to_thread(self._write_state)
+        print(f"[ERROR] {len(self._pending)} {self.name} delta(s) could not be written; saved to {self.state_path}")
+
+    def metrics(self) -> dict:
+        return {
+            "increments": self._increments,
+            "flushes": self._flushes,
+            "failed_flushes": self._failed_flushes,
+            "keys_written": self._keys_written,
+            "pending_keys": len(self._pending),
+            "last_flush_ms": round(self._last_flush_seconds * 1000, 2),
+        }
@@ -0,0 +1,154 @@
+"""
+Geo Index
+In-memory point index for ranking records by distance. Coordinates live in
+contiguous float64 arrays: radians for exact haversine distances, and unit
+vectors on the sphere for ranking. Great-circle distance falls as the dot
+product of two unit vectors rises, so ranking many query points against
+every indexed point is one matrix multiply; exact distances are then
+computed only for the points that made the cut.
+
+The index holds ids and coordinates only; callers resolve ids to records.
+"""
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Upper bound on query-by-point matrix cells per batch (~32 MB of float64)
+MAX_BATCH_CELLS = 4_000_000
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """(n, 3) unit vectors for latitudes/longitudes in radians"""
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+def _haversine_km(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Elementwise (broadcasting) great-circle distance for coordinates in radians"""
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def event_points(events: Iterable[dict]) -> Iterable[Tuple[str, float, float]]:
+    """(id, lat, lng) for each Sheets event that has coordinates"""
+    for event in events:
+        coordinates = event.get('coordinates')
+        if event.get('id') and coordinates and coordinates.get('lat') is not None and coordinates.get('lng') is not None:
+            yield event['id'], float(coordinates['lat']), float(coordinates['lng'])
+
+class GeoIndex:
+    def __init__(self, initial_capacity: int = 1024):
+        """
+        Args:
+            initial_capacity: Points allocated up front; the arrays double when full
+        """
+        self._ids: List[str] = []
+        self._lat = np.empty(initial_capacity, dtype=np.float64)
+        self._lon = np.empty(initial_capacity, dtype=np.float64)
+        self._xyz = np.empty((initial_capacity, 3), dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def rebuild(self, points: Iterable[Tuple[str, float, float]]):
+        """Replace the contents with (id, lat, lon) points"""
+        self._ids = []
+        self._size = 0
+        self.add(points)
+
+    def add(self, points: Iterable[Tuple[str, float, float]]):
+        """Append (id, lat, lon) points"""
+        points = list(points)
+        if not points:
+            return
+
+        ids, lats, lons = zip(*points)
+        lat = np.radians(np.asarray(lats, dtype=np.float64))
+        lon = np.radians(np.asarray(lons, dtype=np.float64))
+
+        end = self._size + len(points)
+        if end > len(self._lat):
+            capacity = max(end, 2 * len(self._lat))
+            for name in ('_lat', '_lon', '_xyz'):
+                current = getattr(self, name)
+                grown = np.empty((capacity,) + current.shape[1:], dtype=np.float64)
+                grown[:self._size] = current[:self._size]
+                setattr(self, name, grown)
+
+        self._lat[self._size:end] = lat
+        self._lon[self._size:end] = lon
+        self._xyz[self._size:end] = _unit_vectors(lat, lon)
+        self._ids.extend(ids)
+        self._size = end
+
+    def distances_km(self, lat: float, lon: float) -> np.ndarray:
+        """Distance from one point to every indexed point"""
+        return self.distance_matrix_km([lat], [lon])[0]
+
+    def distance_matrix_km(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        """Distances from each query point (rows) to every indexed point (columns)"""
+        q_lat = np.radians(np.asarray(lats, dtype=np.float64))[:, None]
+        q_lon = np.radians(np.asarray(lons, dtype=np.float64))[:, None]
+        return _haversine_km(q_lat, q_lon, self._lat[:self._size], self._lon[:self._size])
+
+    def nearest(
+        self, lat: float, lon: float, k: int, radius_km: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """The k closest (id, distance_km) pairs, nearest first, optionally within radius_km"""
+        return self.nearest_many([(lat, lon)], k, radius_km)[0]
+
+    def nearest_many(
+        self, points: Sequence[Tuple[float, float]], k: int, radius_km: Optional[float] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k ranking for many query points at once
+
+        Args:
+            points: (lat, lon) query points
+            k: Results per query point
+            radius_km: Optional maximum distance
+
+        Returns:
+            One list of (id, distance_km) pairs per query point, nearest first
+        """
+        if self._size == 0 or k <= 0:
+            return [[] for _ in points]
+
+        k = min(k, self._size)
+        results = []
+        batch = max(1, MAX_BATCH_CELLS // self._size)
+        for start in range(0, len(points), batch):
+            chunk = points[start:start + batch]
+            q_lat = np.radians(np.asarray([p[0] for p in chunk], dtype=np.float64))
+            q_lon = np.radians(np.asarray([p[1] for p in chunk], dtype=np.float64))
+
+            # Closeness score per (query, point): higher dot product = shorter distance
+            closeness = _unit_vectors(q_lat, q_lon) @ self._xyz[:self._size].T
+
+            # argpartition finds each row's k best without a full sort
+            if k < self._size:
+                top = np.argpartition(-closeness, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(self._size), (len(chunk), self._size))
+
+            # Exact distances for the k winners only
+            distances = _haversine_km(q_lat[:, None], q_lon[:, None], self._lat[top], self._lon[top])
+            order = np.argsort(distances, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            distances = np.take_along_axis(distances, order, axis=1)
+
+            for row_ids, row_distances in zip(top, distances):
+                results.append([
+                    (self._ids[i], float(d)) for i, d in zip(row_ids, row_distances)
+                    if radius_km is None or d <= radius_km
+                ])
+        return results
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[Tuple[str, float]]:
+        """Every (id, distance_km) within radius_km, nearest first"""
+        if self._size == 0:
+            return []
+        distances = self.distances_km(lat, lon)
+        inside = np.flatnonzero(distances <= radius_km)
+        inside = inside[np.argsort(distances[inside])]
+        return [(self._ids[i], float(distances[i])) for i in inside]
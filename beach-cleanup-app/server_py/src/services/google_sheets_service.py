@@ -2,14 +2,32 @@
 Google Sheets Service
 Handles direct interaction with Google Sheets API using service account credentials
 Falls back to Google Apps Script if API is not available
+
+The API client is built on first use (or by a background warm-up at server
+startup) rather than at import, so the server can start serving immediately.
 """
 import os
 import json
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+import importlib.util
 import httpx
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Callable
+from src.services.sheet_row_index import SheetRowIndex, parse_row_span
+from src.services.read_cache import ReadCache
+from src.services.circuit_breaker import CircuitBreaker
+
+class PartialAppendError(Exception):
+    """A multi-row append that failed part way; the first `written` rows are in the sheet"""
+
+    def __init__(self, written: int, total: int, error: Exception):
+        super().__init__(f"{error} ({written} of {total} row(s) appended before the failure)")
+        self.written = written
+        self.total = total
+        self.error = error
 
 class GoogleSheetsService:
     def __init__(self, project_id: Optional[str] = None):
@@ -23,11 +41,77 @@ class GoogleSheetsService:
         self.events_sheet_name = os.getenv("VITE_GOOGLE_SHEETS_EVENTS_SHEET_NAME", "Events")
         self.apps_script_url = os.getenv("VITE_GOOGLE_APPS_SCRIPT_URL")
         self.project_id = project_id or os.getenv("GOOGLE_PROJECT_ID")
-        self.service = None
-        self._initialize_service()
+        self._apps_script_client: Optional[httpx.AsyncClient] = None
+        self._apps_script_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._apps_script_target: Optional[str] = None
+        self._service = None
+        self._service_initialized = False
+        self._service_lock = threading.RLock()
+        self.client_build_ms: Optional[float] = None
+        self._credentials = None
+        self._local = threading.local()
+
+        # id -> row number indexes, rebuilt from the id column after SHEETS_INDEX_TTL seconds,
+        # or on a lookup miss at most every SHEETS_INDEX_MISS_INTERVAL seconds
+        index_ttl = float(os.getenv("SHEETS_INDEX_TTL", "300"))
+        miss_interval = float(os.getenv("SHEETS_INDEX_MISS_INTERVAL", "10"))
+        self._post_index = SheetRowIndex(index_ttl, miss_interval)
+        self._event_index = SheetRowIndex(index_ttl, miss_interval)
+        self._sheet_ids: Dict[str, int] = {}
+
+        # Last upvote/participant count seen or written per id, used to restore
+        # a cell overwritten through a stale row index
+        self._post_counters: Dict[str, int] = {}
+        self._event_counters: Dict[str, int] = {}
+        # Bumped when a counter write starts and ends, so a full read that
+        # overlapped one doesn't replace the newer values
+        self._counter_writes = 0
+        self._counter_writes_lock = threading.Lock()
+
+        # Once the API fails, writes go straight to Apps Script until a background probe succeeds
+        self._api_breaker = CircuitBreaker(
+            "Google Sheets API",
+            self._probe_api,
+            failure_threshold=int(os.getenv("SHEETS_CIRCUIT_FAILURE_THRESHOLD", "3")),
+            probe_interval=float(os.getenv("SHEETS_CIRCUIT_PROBE_INTERVAL", "30"))
+        )
+
+        # Full-sheet reads walk the sheet this many rows per request
+        self.read_chunk_rows = int(os.getenv("SHEETS_READ_CHUNK_ROWS", "1000"))
+
+        # Parsed get_all_posts/get_all_events results, fresh for SHEETS_CACHE_TTL seconds
+        self._read_cache = ReadCache(float(os.getenv("SHEETS_CACHE_TTL", "30")))
+
+
+    @property
+    def service(self):
+        """The Google Sheets API client, built on first access"""
+        if not self._service_initialized:
+            self.warm_up()
+        return self._service
+
+    @service.setter
+    def service(self, value):
+        self._service = value
+        self._service_initialized = True
+
+    def warm_up(self):
+        """Build the API client now if it has not been built yet; safe to call from any thread"""
+        with self._service_lock:
+            if self._service_initialized:
+                return
+            started = time.perf_counter()
+            self._initialize_service()
+            self._service_initialized = True
+            self.client_build_ms = round((time.perf_counter() - started) * 1000, 2)
+            print(f"[INFO] Google Sheets client ready in {self.client_build_ms} ms")
 
     def _initialize_service(self):
         """Initialize the Google Sheets API service"""
+        # Imported here so loading this module stays cheap
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
+
         try:
             # Option 1: Try to load from JSON file first
             service_account_file = os.getenv("GOOGLE_SERVICE_ACCOUNT_FILE")
@@ -72,7 +156,8 @@ class GoogleSheetsService:
                     )
                     print(f"[INFO] Using legacy single service account")
 
-                self.service = build('sheets', 'v4', credentials=credentials)
+                self._credentials = credentials
+                self.service = self._build_client(build, credentials)
                 print("[SUCCESS] Google Sheets service initialized successfully (from JSON file)")
                 return
 
@@ -100,13 +185,421 @@ class GoogleSheetsService:
             )
 
             # Build the service
-            self.service = build('sheets', 'v4', credentials=credentials)
+            self._credentials = credentials
+            self.service = self._build_client(build, credentials)
             print("[SUCCESS] Google Sheets service initialized successfully (from env vars)")
 
         except Exception as e:
             print(f"[ERROR] Error initializing Google Sheets service: {e}")
             self.service = None
 
+    @staticmethod
+    def _build_client(build, credentials):
+        """
+        Build the Sheets v4 client from the discovery document bundled with
+        google-api-python-client, never fetching it over the network
+        """
+        return build(
+            'sheets',
+            'v4',
+            credentials=credentials,
+            static_discovery=True,
+            cache_discovery=False
+        )
+
+    def _execute(self, request):
+        """
+        Execute a Google API request on an HTTP connection owned by the calling thread
+
+        httplib2 connections are not thread-safe, so each worker thread of the
+        async service gets its own authorized connection instead of sharing the
+        one built into the discovery client. Network and transport failures
+        count toward opening the API circuit, like server-side errors do.
+
+        Args:
+            request: An unexecuted googleapiclient HttpRequest
+
+        Returns:
+            The decoded API response
+        """
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+
+        http = getattr(self._local, 'http', None)
+        if http is None and self._credentials is not None:
+            http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._local.http = http
+        try:
+            return request.execute(http=http)
+        except Exception as e:
+            if self._is_transport_error(e):
+                self._api_breaker.record_failure(e)
+            raise
+
+    def _use_api(self) -> bool:
+        """Whether writes should go to the Sheets API rather than Apps Script"""
+        return self.service is not None and self._api_breaker.allow()
+
+    @staticmethod
+    def _is_service_disabled(error: HttpError) -> bool:
+        """Whether an API error means the Sheets API is not enabled for the project"""
+        error_str = str(error)
+        return "SERVICE_DISABLED" in error_str or "API has not been used" in error_str
+
+    @staticmethod
+    def _is_transport_error(error: Exception) -> bool:
+        """Whether an error means the API could not be reached (timeout, DNS, reset, auth transport)"""
+        import httplib2
+        from google.auth.exceptions import TransportError
+
+        return isinstance(error, (OSError, httplib2.HttpLib2Error, TransportError))
+
+    def _record_api_error(self, error: HttpError):
+        """Count server-side and quota errors toward opening the API circuit"""
+        status = getattr(getattr(error, 'resp', None), 'status', 0)
+        if status == 429 or status >= 500:
+            self._api_breaker.record_failure(error)
+
+    def _probe_api(self):
+        """Cheapest call that exercises the API; raises while it is still unavailable"""
+        self._execute(self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id,
+            fields='spreadsheetId'
+        ))
+
+    def backend_status(self) -> Dict[str, Any]:
+        """Which backend writes are using, with circuit breaker details"""
+        if not self._service_initialized:
+            active = "initializing"
+        else:
+            active = "sheets_api" if self._use_api() else "apps_script"
+        return {
+            "active": active,
+            "client_build_ms": self.client_build_ms,
+            "sheets_api": self._api_breaker.metrics(),
+        }
+
+    def stop(self):
+        """Stop background recovery probing"""
+        self._api_breaker.stop()
+
+    async def open_http_client(self):
+        """
+        Open the shared, keep-alive Apps Script client on the running event loop
+
+        Pool limits come from APPS_SCRIPT_MAX_CONNECTIONS, APPS_SCRIPT_MAX_KEEPALIVE
+        and APPS_SCRIPT_KEEPALIVE_EXPIRY. HTTP/2 is used when the h2 package is installed.
+        """
+        if self._apps_script_client is not None:
+            return
+
+        limits = httpx.Limits(
+            max_connections=int(os.getenv("APPS_SCRIPT_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("APPS_SCRIPT_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("APPS_SCRIPT_KEEPALIVE_EXPIRY", "60"))
+        )
+        http2 = importlib.util.find_spec("h2") is not None
+        self._apps_script_client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=limits,
+            http2=http2,
+            timeout=30.0
+        )
+        self._apps_script_loop = asyncio.get_running_loop()
+        print(f"[INFO] Apps Script client opened (HTTP/2: {'on' if http2 else 'off'})")
+
+    async def close_http_client(self):
+        """Close the shared Apps Script client"""
+        if self._apps_script_client is not None:
+            client = self._apps_script_client
+            self._apps_script_client = None
+            self._apps_script_loop = None
+            await client.aclose()
+            print("Apps Script client closed")
+
+    async def _post_apps_script_async(self, payload: Dict[str, Any]) -> httpx.Response:
+        """POST a payload to the Apps Script web app over the shared client"""
+        response = await self._apps_script_client.post(
+            self._apps_script_target or self.apps_script_url,
+            json=payload
+        )
+
+        # Remember permanent redirects so later calls skip the extra hop.
+        # Apps Script's own 302 to script.googleusercontent.com is per-execution and is always followed.
+        if response.history and response.history[0].status_code in (301, 308):
+            following = response.history[1:] + [response]
+            self._apps_script_target = str(following[0].request.url)
+
+        return response
+
+    def _post_apps_script(self, payload: Dict[str, Any]) -> httpx.Response:
+        """
+        POST a payload to the Apps Script web app from a worker thread
+
+        Uses the shared client when it is open, otherwise a one-off client
+        (e.g. when the service is used outside the server).
+
+        Args:
+            payload: JSON body with the Apps Script action
+
+        Returns:
+            The final httpx response after redirects
+        """
+        loop = self._apps_script_loop
+        if self._apps_script_client is not None and loop is not None and not self._on_loop_thread(loop):
+            future = asyncio.run_coroutine_threadsafe(self._post_apps_script_async(payload), loop)
+            return future.result()
+
+        with httpx.Client(follow_redirects=True) as client:
+            return client.post(self.apps_script_url, json=payload, timeout=30.0)
+
+    @staticmethod
+    def _on_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+        """Whether the caller is running on the given event loop's thread"""
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+    def cache_metrics(self) -> Dict[str, Any]:
+        """Read cache hit/miss statistics"""
+        return self._read_cache.metrics()
+
+    def _find_rows(self, sheet_name: str, index: SheetRowIndex, record_ids: List[str]) -> Dict[str, int]:
+        """
+        Look up the sheet rows for several record ids, rebuilding the index at most once
+
+        Ids missing from a fresh index only trigger a rebuild once per miss
+        interval; in between they are reported as not found.
+
+        Args:
+            sheet_name: Name of the sheet the records live in
+            index: The row index for that sheet
+            record_ids: The ids stored in column A
+
+        Returns:
+            Dict mapping each id found in the sheet to its 1-based row number
+        """
+        if index.is_fresh():
+            rows = {record_id: index.get(record_id) for record_id in record_ids}
+            found = {record_id: row for record_id, row in rows.items() if row is not None}
+            if len(found) == len(rows) or not index.claim_miss_rebuild():
+                return found
+
+        result = self._execute(self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{sheet_name}!A:A",
+            majorDimension='COLUMNS'
+        ))
+        columns = result.get('values', [])
+        ids = columns[0] if columns else []
+
+        # Skip the header row
+        index.load(ids[1:], first_row=2)
+        rows = {record_id: index.get(record_id) for record_id in record_ids}
+        return {record_id: row for record_id, row in rows.items() if row is not None}
+
+    @contextmanager
+    def _counter_write(self):
+        """Mark a counter write as in progress for the duration of the block"""
+        with self._counter_writes_lock:
+            self._counter_writes += 1
+        try:
+            yield
+        finally:
+            with self._counter_writes_lock:
+                self._counter_writes += 1
+
+    def _sheet_id(self, sheet_name: str) -> int:
+        """Numeric id of a sheet (tab), looked up once"""
+        if sheet_name not in self._sheet_ids:
+            result = self._execute(self.service.spreadsheets().get(
+                spreadsheetId=self.spreadsheet_id,
+                fields='sheets.properties(sheetId,title)'
+            ))
+            self._sheet_ids = {
+                sheet['properties']['title']: sheet['properties']['sheetId']
+                for sheet in result.get('sheets', [])
+            }
+            if sheet_name not in self._sheet_ids:
+                raise Exception(f"Sheet {sheet_name} not found in spreadsheet")
+        return self._sheet_ids[sheet_name]
+
+    def _write_cells(self, sheet_name: str, column: str, cells: List[Tuple[int, Optional[int]]]) -> Dict[int, str]:
+        """
+        Write numeric cells in one batchUpdate that also reads back column A of their rows
+
+        Args:
+            sheet_name: Name of the sheet to write
+            column: Column letter of the cells
+            cells: (row, value) pairs; a value of None clears the cell
+
+        Returns:
+            Dict mapping each written row to the id in its column A after the write
+        """
+        sheet_id = self._sheet_id(sheet_name)
+        column_index = ord(column) - ord('A')
+        result = self._execute(self.service.spreadsheets().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            fields='updatedSpreadsheet.sheets.data(startRow,rowData.values.formattedValue)',
+            body={
+                'requests': [
+                    {
+                        'updateCells': {
+                            'start': {'sheetId': sheet_id, 'rowIndex': row - 1, 'columnIndex': column_index},
+                            'rows': [{'values': [{'userEnteredValue': {'numberValue': value}} if value is not None else {}]}],
+                            'fields': 'userEnteredValue',
+                        }
+                    }
+                    for row, value in cells
+                ],
+                'includeSpreadsheetInResponse': True,
+                'responseRanges': [f"{sheet_name}!A{row}" for row, _ in cells],
+                'responseIncludeGridData': True,
+            }
+        ))
+
+        ids = {}
+        for sheet in result.get('updatedSpreadsheet', {}).get('sheets', []):
+            for grid in sheet.get('data', []):
+                row_data = grid.get('rowData') or [{}]
+                values = row_data[0].get('values') or [{}]
+                ids[grid.get('startRow', 0) + 1] = str(values[0].get('formattedValue', ''))
+        return ids
+
+    def _write_counters(
+        self,
+        sheet_name: str,
+        index: SheetRowIndex,
+        column: str,
+        values: Dict[str, int],
+        counters: Dict[str, int]
+    ) -> Dict[str, int]:
+        """
+        Write counter values to the rows of their record ids, checking the ids in the same call
+
+        A row whose column A no longer holds the expected id means rows were
+        inserted or deleted by hand since the index was built. The index is
+        then rebuilt, the counter rewritten at its new row, and the cell that
+        was overwritten by mistake restored from its last known value.
+
+        Args:
+            sheet_name: Name of the sheet holding the counters
+            index: The row index for that sheet
+            column: Column letter of the counter
+            values: Dict mapping record id to the value to write
+            counters: Last known counter values for the sheet, updated with the write
+
+        Returns:
+            Dict of the values written, for the record ids found in the sheet
+        """
+        rows = self._find_rows(sheet_name, index, list(values))
+        if not rows:
+            return {}
+
+        with self._counter_write():
+            found = self._write_cells(sheet_name, column, [(row, values[record_id]) for record_id, row in rows.items()])
+        moved = [record_id for record_id, row in rows.items() if found.get(row) != record_id]
+        if moved:
+            print(f"[WARNING] {sheet_name} rows moved since the row index was built; rebuilding it")
+            index.invalidate()
+            relocated = self._find_rows(sheet_name, index, moved)
+
+            repairs = [(relocated[record_id], values[record_id]) for record_id in moved if record_id in relocated]
+            for record_id in moved:
+                row, other_id = rows[record_id], found.get(rows[record_id], '')
+                if other_id in values:
+                    continue  # Its own write lands on its current row
+                if not other_id:
+                    repairs.append((row, None))
+                elif other_id in counters:
+                    repairs.append((row, counters[other_id]))
+                else:
+                    print(f"[ERROR] {sheet_name}!{column}{row} ({other_id}) was overwritten and its previous value is unknown")
+            if repairs:
+                with self._counter_write():
+                    self._write_cells(sheet_name, column, repairs)
+
+            for record_id in moved:
+                if record_id in relocated:
+                    rows[record_id] = relocated[record_id]
+                else:
+                    del rows[record_id]
+
+        written = {record_id: values[record_id] for record_id in rows}
+        counters.update(written)
+        return written
+
+    def _read_rows(self, sheet_name: str, last_column: str) -> Iterator[List[Any]]:
+        """
+        Yield every row below the header, reading the sheet in fixed-size chunks
+
+        The loop is bounded by the sheet's row count rather than by the first
+        short chunk: the API trims trailing empty rows from a range, so a blank
+        row inside the data would otherwise look like the end of the sheet.
+        Blank rows are yielded as empty lists.
+
+        Args:
+            sheet_name: Name of the sheet to read
+            last_column: Letter of the last column to include
+
+        Yields:
+            Row value lists, top to bottom
+        """
+        row_count = self._row_count(sheet_name)
+        start = 2  # Skip header row
+        while start <= row_count:
+            end = min(start + self.read_chunk_rows - 1, row_count)
+            result = self._execute(self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{sheet_name}!A{start}:{last_column}{end}"
+            ))
+            values = result.get('values', [])
+            yield from values
+            start = end + 1
+
+    def _row_count(self, sheet_name: str) -> int:
+        """Number of rows in a sheet's grid, including blank ones; read fresh since appends grow it"""
+        result = self._execute(self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[sheet_name],
+            fields='sheets.properties.gridProperties.rowCount'
+        ))
+        sheets = result.get('sheets', [])
+        if not sheets:
+            raise Exception(f"Sheet {sheet_name} not found in spreadsheet")
+        return sheets[0]['properties']['gridProperties']['rowCount']
+
+    def _index_appended(self, index: SheetRowIndex, record_ids: List[str], result: Dict[str, Any]):
+        """Add freshly appended records to a row index using the append response"""
+        span = parse_row_span(result.get('updates', {}).get('updatedRange', ''))
+        if span is None:
+            index.invalidate()
+            return
+        for offset, record_id in enumerate(record_ids):
+            index.add(record_id, span[0] + offset)
+
+    def _append_via_apps_script(self, items: List[Dict[str, Any]], add_one: Callable[[Dict[str, Any]], bool]) -> bool:
+        """
+        Append rows through Apps Script one call at a time, in order, stopping at the first failure
+
+        Args:
+            items: Rows to append
+            add_one: Apps Script call appending a single row
+
+        Returns:
+            bool: True once every row is appended
+
+        Raises:
+            PartialAppendError: If a call failed, with how many rows were appended before it
+        """
+        for written, item in enumerate(items):
+            try:
+                add_one(item)
+            except Exception as e:
+                raise PartialAppendError(written, len(items), e)
+        return True
+
     def add_post(self, post_data: Dict[str, Any]) -> bool:
         """
         Add a new post to Google Sheets
@@ -118,60 +611,87 @@ class GoogleSheetsService:
         Returns:
             bool: True if successful, False otherwise
         """
+        return self.add_posts([post_data])
+
+    def add_posts(self, posts: List[Dict[str, Any]]) -> bool:
+        """
+        Add several posts to Google Sheets with a single append
+        Falls back to Google Apps Script (one call per post) if direct API fails
+
+        Args:
+            posts: List of dictionaries containing post information
+
+        Returns:
+            bool: True if successful, False otherwise
+
+        Raises:
+            PartialAppendError: If an Apps Script call failed after earlier posts were appended
+        """
         # Validate spreadsheet_id is set
         if not self.spreadsheet_id:
             raise Exception('Missing required parameter "spreadsheetId" - check VITE_GOOGLE_SHEETS_SPREADSHEET_ID in .env file')
 
         # Try Google Sheets API first if available
-        if self.service:
+        if self._use_api():
             try:
                 # Prepare the row data in the correct order
                 # Columns: id, username, location, date, imageUrl, caption, trashCollected, upvotes, timestamp
-                row = [
-                    post_data.get('id', ''),
-                    post_data.get('username', ''),
-                    post_data.get('location', ''),
-                    post_data.get('date', ''),
-                    post_data.get('imageUrl', ''),
-                    post_data.get('caption', ''),
-                    post_data.get('trashCollected', ''),
-                    post_data.get('upvotes', 0),
-                    post_data.get('timestamp', ''),
+                rows = [
+                    [
+                        post_data.get('id', ''),
+                        post_data.get('username', ''),
+                        post_data.get('location', ''),
+                        post_data.get('date', ''),
+                        post_data.get('imageUrl', ''),
+                        post_data.get('caption', ''),
+                        post_data.get('trashCollected', ''),
+                        post_data.get('upvotes', 0),
+                        post_data.get('timestamp', ''),
+                    ]
+                    for post_data in posts
                 ]
 
                 # Append to the sheet
                 range_name = f"{self.sheet_name}!A:I"
                 body = {
-                    'values': [row]
+                    'values': rows
                 }
 
-                result = self.service.spreadsheets().values().append(
+                result = self._execute(self.service.spreadsheets().values().append(
                     spreadsheetId=self.spreadsheet_id,
                     range=range_name,
                     valueInputOption='RAW',
                     insertDataOption='INSERT_ROWS',
                     body=body
-                ).execute()
+                ))
 
+                self._index_appended(self._post_index, [row[0] for row in rows], result)
+                self._read_cache.invalidate('posts')
+
+                self._api_breaker.record_success()
                 print(f"[SUCCESS] Added post to Google Sheets via API: {result.get('updates', {}).get('updatedRows', 0)} row(s) added")
                 return True
 
             except HttpError as error:
-                error_str = str(error)
                 # Check if it's a SERVICE_DISABLED error (API not enabled)
-                if "SERVICE_DISABLED" in error_str or "API has not been used" in error_str:
+                if self._is_service_disabled(error):
+                    self._api_breaker.trip(error)
                     print(f"[WARNING] Google Sheets API is disabled, falling back to Apps Script...")
-                    return self._add_post_via_apps_script(post_data)
+                    return self._append_via_apps_script(posts, self._add_post_via_apps_script)
                 else:
+                    self._record_api_error(error)
                     print(f"[ERROR] Google Sheets API error: {error}")
                     raise Exception(f"Failed to add post to Google Sheets: {error}")
             except Exception as e:
+                if self._is_transport_error(e):
+                    print(f"[WARNING] Google Sheets API unreachable ({e}), falling back to Apps Script...")
+                    return self._append_via_apps_script(posts, self._add_post_via_apps_script)
                 print(f"[ERROR] Error adding post via API: {e}")
                 raise
         else:
-            # No service available, try Apps Script
-            print("[INFO] Google Sheets API service not initialized, using Apps Script...")
-            return self._add_post_via_apps_script(post_data)
+            # API not initialized or its circuit is open, try Apps Script
+            print("[INFO] Google Sheets API unavailable, using Apps Script...")
+            return self._append_via_apps_script(posts, self._add_post_via_apps_script)
 
     def _add_post_via_apps_script(self, post_data: Dict[str, Any]) -> bool:
         """
@@ -187,26 +707,22 @@ class GoogleSheetsService:
             raise Exception("Google Apps Script URL not configured")
 
         try:
-            # Use httpx to make the request (follow redirects for Google Apps Script)
-            with httpx.Client(follow_redirects=True) as client:
-                response = client.post(
-                    self.apps_script_url,
-                    json={
-                        "action": "addPost",
-                        "data": post_data
-                    },
-                    timeout=30.0
-                )
-
-                if response.status_code != 200:
-                    raise Exception(f"Apps Script returned status {response.status_code}: {response.text}")
-
-                result = response.json()
-                if result.get("success"):
-                    print(f"[SUCCESS] Added post to Google Sheets via Apps Script")
-                    return True
-                else:
-                    raise Exception(f"Apps Script error: {result.get('error', 'Unknown error')}")
+            # Send through the shared Apps Script client (follows Google's redirect)
+            response = self._post_apps_script({
+                "action": "addPost",
+                "data": post_data
+            })
+
+            if response.status_code != 200:
+                raise Exception(f"Apps Script returned status {response.status_code}: {response.text}")
+
+            result = response.json()
+            if result.get("success"):
+                self._read_cache.invalidate('posts')
+                print(f"[SUCCESS] Added post to Google Sheets via Apps Script")
+                return True
+            else:
+                raise Exception(f"Apps Script error: {result.get('error', 'Unknown error')}")
 
         except Exception as e:
             print(f"[ERROR] Error adding post via Apps Script: {e}")
@@ -225,60 +741,38 @@ class GoogleSheetsService:
             bool: True if successful, False otherwise
         """
         # Try Google Sheets API first if available
-        if self.service:
+        if self._use_api():
             try:
-                # First, find the row with this post_id
-                range_name = f"{self.sheet_name}!A:I"
-                result = self.service.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=range_name
-                ).execute()
-
-                values = result.get('values', [])
+                # Write the upvotes column (column H) of the row found via the id -> row index
+                written = self._write_counters(self.sheet_name, self._post_index, 'H', {post_id: upvotes}, self._post_counters)
 
-                # Find the row index (skip header row)
-                row_index = None
-                for i, row in enumerate(values):
-                    if i == 0:  # Skip header
-                        continue
-                    if len(row) > 0 and row[0] == post_id:
-                        row_index = i + 1  # +1 because sheets are 1-indexed
-                        break
-
-                if row_index is None:
+                if not written:
                     raise Exception(f"Post with ID {post_id} not found")
 
-                # Update the upvotes column (column H, index 7)
-                update_range = f"{self.sheet_name}!H{row_index}"
-                body = {
-                    'values': [[upvotes]]
-                }
-
-                self.service.spreadsheets().values().update(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=update_range,
-                    valueInputOption='RAW',
-                    body=body
-                ).execute()
-
+                self._read_cache.invalidate('posts')
+                self._api_breaker.record_success()
                 print(f"[SUCCESS] Updated upvotes for post {post_id} to {upvotes}")
                 return True
 
             except HttpError as error:
-                error_str = str(error)
                 # Check if it's a SERVICE_DISABLED error (API not enabled)
-                if "SERVICE_DISABLED" in error_str or "API has not been used" in error_str:
+                if self._is_service_disabled(error):
+                    self._api_breaker.trip(error)
                     print(f"[WARNING] Google Sheets API is disabled, falling back to Apps Script...")
                     return self._update_upvotes_via_apps_script(post_id, upvotes)
                 else:
+                    self._record_api_error(error)
                     print(f"[ERROR] Google Sheets API error: {error}")
                     raise Exception(f"Failed to update upvotes: {error}")
             except Exception as e:
+                if self._is_transport_error(e):
+                    print(f"[WARNING] Google Sheets API unreachable ({e}), falling back to Apps Script...")
+                    return self._update_upvotes_via_apps_script(post_id, upvotes)
                 print(f"❌ Error updating upvotes via API: {e}")
                 raise
         else:
-            # No service available, try Apps Script
-            print("[INFO] Google Sheets API service not initialized, using Apps Script...")
+            # API not initialized or its circuit is open, try Apps Script
+            print("[INFO] Google Sheets API unavailable, using Apps Script...")
             return self._update_upvotes_via_apps_script(post_id, upvotes)
 
     def _update_upvotes_via_apps_script(self, post_id: str, upvotes: int) -> bool:
@@ -296,33 +790,332 @@ class GoogleSheetsService:
             raise Exception("Google Apps Script URL not configured")
 
         try:
-            # Use httpx to make the request (follow redirects for Google Apps Script)
-            with httpx.Client(follow_redirects=True) as client:
-                response = client.post(
-                    self.apps_script_url,
-                    json={
-                        "action": "updateUpvotes",
-                        "postId": post_id,
-                        "upvotes": upvotes
-                    },
-                    timeout=30.0
-                )
+            # Send through the shared Apps Script client (follows Google's redirect)
+            with self._counter_write():
+                response = self._post_apps_script({
+                    "action": "updateUpvotes",
+                    "postId": post_id,
+                    "upvotes": upvotes
+                })
+
+            if response.status_code != 200:
+                raise Exception(f"Apps Script returned status {response.status_code}: {response.text}")
+
+            result = response.json()
+            if result.get("success"):
+                self._read_cache.invalidate('posts')
+                self._post_counters[post_id] = upvotes
+                print(f"[SUCCESS] Updated upvotes for post {post_id} to {upvotes} via Apps Script")
+                return True
+            else:
+                raise Exception(f"Apps Script error: {result.get('error', 'Unknown error')}")
+
+        except Exception as e:
+            print(f"[ERROR] Error updating upvotes via Apps Script: {e}")
+            raise Exception(f"Failed to update upvotes via Apps Script: {e}")
+
+    def apply_upvote_deltas(self, deltas: Dict[str, int]) -> Dict[str, int]:
+        """
+        Add pending upvote changes to several posts
+
+        Args:
+            deltas: Dict mapping post id to the change in upvotes
+
+        Returns:
+            Dict mapping each post id found in the sheet to its new upvote count
+        """
+        return self._apply_counter_deltas(self.sheet_name, self._post_index, 'H', deltas, 'posts', self._post_counters)
+
+    def read_upvotes(self, post_ids: List[str]) -> Dict[str, int]:
+        """
+        Current upvote counts for several posts
+
+        Args:
+            post_ids: Post ids
+
+        Returns:
+            Dict mapping each post id found in the sheet to its upvote count
+        """
+        return self._current_counters(self.sheet_name, self._post_index, 'H', post_ids, self._post_counters)
+
+    def set_upvotes(self, values: Dict[str, int]) -> Dict[str, int]:
+        """
+        Write absolute upvote counts for several posts in one batchUpdate
+
+        Args:
+            values: Dict mapping post id to its upvote count
+
+        Returns:
+            Dict of the values written, for the post ids found in the sheet
+        """
+        return self._set_counters(self.sheet_name, self._post_index, 'H', values, 'posts', self._post_counters)
+
+    def _apply_counter_deltas(
+        self,
+        sheet_name: str,
+        index: SheetRowIndex,
+        column: str,
+        deltas: Dict[str, int],
+        cache_key: str,
+        counters: Dict[str, int]
+    ) -> Dict[str, int]:
+        """
+        Apply counter deltas through the Sheets API, falling back to Apps Script
+
+        Through the API each new value is the last known value plus the delta,
+        written in one batchUpdate; current values are only read first for ids
+        not seen since the last full read. Through Apps Script the deltas are
+        added in one applyCounterDeltas call.
+
+        Args:
+            sheet_name: Name of the sheet holding the counters
+            index: The row index for that sheet
+            column: Column letter of the counter
+            deltas: Dict mapping record id to the change in the counter
+            cache_key: Read cache entry to invalidate after the write
+            counters: Last known counter values for the sheet
+
+        Returns:
+            Dict mapping each record id found in the sheet to its new value
+        """
+        if self._use_api():
+            try:
+                unknown = [record_id for record_id in deltas if record_id not in counters]
+                if unknown:
+                    self._read_counters(sheet_name, index, column, unknown, counters)
+
+                totals = {
+                    record_id: max(0, counters[record_id] + delta)
+                    for record_id, delta in deltas.items() if record_id in counters
+                }
+                if totals:
+                    totals = self._write_counters(sheet_name, index, column, totals, counters)
 
-                if response.status_code != 200:
-                    raise Exception(f"Apps Script returned status {response.status_code}: {response.text}")
+                self._read_cache.invalidate(cache_key)
+                self._api_breaker.record_success()
+                print(f"[SUCCESS] Flushed {len(totals)} counter(s) to {sheet_name}")
+                return totals
 
-                result = response.json()
-                if result.get("success"):
-                    print(f"[SUCCESS] Updated upvotes for post {post_id} to {upvotes} via Apps Script")
-                    return True
+            except HttpError as error:
+                if self._is_service_disabled(error):
+                    self._api_breaker.trip(error)
+                    print(f"[WARNING] Google Sheets API is disabled, falling back to Apps Script...")
+                    return self._apply_counter_deltas_via_apps_script(sheet_name, column, deltas, cache_key, counters)
                 else:
-                    raise Exception(f"Apps Script error: {result.get('error', 'Unknown error')}")
+                    self._record_api_error(error)
+                    print(f"[ERROR] Google Sheets API error: {error}")
+                    raise Exception(f"Failed to flush counters: {error}")
+            except Exception as e:
+                if not self._is_transport_error(e):
+                    raise
+                print(f"[WARNING] Google Sheets API unreachable ({e}), falling back to Apps Script...")
+                return self._apply_counter_deltas_via_apps_script(sheet_name, column, deltas, cache_key, counters)
+        else:
+            print("[INFO] Google Sheets API unavailable, using Apps Script...")
+            return self._apply_counter_deltas_via_apps_script(sheet_name, column, deltas, cache_key, counters)
+
+    def _current_counters(
+        self,
+        sheet_name: str,
+        index: SheetRowIndex,
+        column: str,
+        record_ids: List[str],
+        counters: Dict[str, int]
+    ) -> Dict[str, int]:
+        """
+        Current counter values, from the last known values or else the sheet
+
+        Args:
+            sheet_name: Name of the sheet holding the counters
+            index: The row index for that sheet
+            column: Column letter of the counter
+            record_ids: The ids stored in column A
+            counters: Last known counter values for the sheet
+
+        Returns:
+            Dict mapping each record id found in the sheet to its counter value
+        """
+        values = {record_id: counters[record_id] for record_id in record_ids if record_id in counters}
+        unknown = [record_id for record_id in record_ids if record_id not in counters]
+        if not unknown:
+            return values
+
+        if self._use_api():
+            try:
+                values.update(self._read_counters(sheet_name, index, column, unknown, counters))
+                return values
+            except HttpError as error:
+                if not self._is_service_disabled(error):
+                    self._record_api_error(error)
+                    raise Exception(f"Failed to read counters: {error}")
+                self._api_breaker.trip(error)
+            except Exception as e:
+                if not self._is_transport_error(e):
+                    raise
+                print(f"[WARNING] Google Sheets API unreachable ({e}), falling back to Apps Script...")
+
+        # A zero delta reads the value without changing it
+        values.update(self._apply_counter_deltas_via_apps_script(
+            sheet_name, column, {record_id: 0 for record_id in unknown}, None, counters
+        ))
+        return values
+
+    def _read_counters(
+        self,
+        sheet_name: str,
+        index: SheetRowIndex,
+        column: str,
+        record_ids: List[str],
+        counters: Dict[str, int],
+        retry: bool = True
+    ) -> Dict[str, int]:
+        """
+        Read counter values with one batchGet of each row from column A to the counter
+
+        Rows whose id no longer matches invalidate the index and are looked up again once.
+
+        Returns:
+            Dict mapping each record id found in the sheet to its counter value
+        """
+        rows = self._find_rows(sheet_name, index, record_ids)
+        if not rows:
+            return {}
+
+        result = self._execute(self.service.spreadsheets().values().batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[f"{sheet_name}!A{row}:{column}{row}" for row in rows.values()]
+        ))
+
+        values, moved = {}, []
+        counter_index = ord(column) - ord('A')
+        for record_id, value_range in zip(rows, result.get('valueRanges', [])):
+            row_values = (value_range.get('values') or [[]])[0]
+            if not row_values or str(row_values[0]) != record_id:
+                moved.append(record_id)
+                continue
+            try:
+                cell = row_values[counter_index] if len(row_values) > counter_index else ''
+                values[record_id] = int(cell) if cell != '' else 0
+            except (ValueError, TypeError):
+                values[record_id] = 0
+
+        if moved and retry:
+            index.invalidate()
+            values.update(self._read_counters(sheet_name, index, column, moved, counters, retry=False))
+        counters.update(values)
+        return values
+
+    def _apply_counter_deltas_via_apps_script(
+        self,
+        sheet_name: str,
+        column: str,
+        deltas: Dict[str, int],
+        cache_key: Optional[str],
+        counters: Dict[str, int]
+    ) -> Dict[str, int]:
+        """
+        Add counter deltas using the Apps Script applyCounterDeltas action, in one call
+
+        Args:
+            sheet_name: Name of the sheet holding the counters
+            column: Column letter of the counter
+            deltas: Dict mapping record id to the change in the counter
+            cache_key: Read cache entry to invalidate after the write, if any
+            counters: Last known counter values for the sheet, updated with the result
+
+        Returns:
+            Dict mapping each record id found in the sheet to its new value
+        """
+        if not self.apps_script_url:
+            raise Exception("Google Apps Script URL not configured")
+
+        try:
+            with self._counter_write():
+                response = self._post_apps_script({
+                    "action": "applyCounterDeltas",
+                    "sheet": sheet_name,
+                    "column": ord(column) - ord('A') + 1,
+                    "deltas": deltas
+                })
+
+            if response.status_code != 200:
+                raise Exception(f"Apps Script returned status {response.status_code}: {response.text}")
+
+            result = response.json()
+            if not result.get("success"):
+                raise Exception(f"Apps Script error: {result.get('error', 'Unknown error')} (is Code.gs up to date?)")
+
+            totals = {record_id: int(value) for record_id, value in result.get("values", {}).items()}
+            counters.update(totals)
+            if cache_key is not None:
+                self._read_cache.invalidate(cache_key)
+                print(f"[SUCCESS] Flushed {len(totals)} counter(s) to {sheet_name} via Apps Script")
+            return totals
 
         except Exception as e:
-            print(f"[ERROR] Error updating upvotes via Apps Script: {e}")
-            raise Exception(f"Failed to update upvotes via Apps Script: {e}")
+            print(f"[ERROR] Error applying counter deltas via Apps Script: {e}")
+            raise Exception(f"Failed to apply counter deltas via Apps Script: {e}")
+
+    def _set_counters(
+        self,
+        sheet_name: str,
+        index: SheetRowIndex,
+        column: str,
+        values: Dict[str, int],
+        cache_key: str,
+        counters: Dict[str, int]
+    ) -> Dict[str, int]:
+        """
+        Write absolute counter values with one batchUpdate
+
+        Args:
+            sheet_name: Name of the sheet holding the counters
+            index: The row index for that sheet
+            column: Column letter of the counter
+            values: Dict mapping record id to the value to write
+            cache_key: Read cache entry to invalidate after the write
+            counters: Last known counter values for the sheet
+
+        Returns:
+            Dict of the values written, for the record ids found in the sheet
+        """
+        if not self.service:
+            raise Exception("Google Sheets service not initialized")
+
+        try:
+            written = self._write_counters(sheet_name, index, column, values, counters)
+
+            self._read_cache.invalidate(cache_key)
+            print(f"[SUCCESS] Wrote {len(written)} counter(s) to {sheet_name}")
+            return written
+
+        except HttpError as error:
+            self._record_api_error(error)
+            print(f"[ERROR] Google Sheets API error: {error}")
+            raise Exception(f"Failed to write counters: {error}")
 
     def get_all_posts(self) -> List[Dict[str, Any]]:
+        """
+        Fetch all posts, served from the read cache when possible
+
+        Returns:
+            List of post dictionaries
+        """
+        return self._read_cache.get('posts', self._fetch_all_posts)
+
+    def read_all_posts(self) -> List[Dict[str, Any]]:
+        """
+        Fetch every post straight from the sheet, bypassing the read cache
+
+        Unlike get_all_posts the result is never stale or partial: the read
+        covers the sheet's whole row count and any failure raises.
+
+        Returns:
+            List of post dictionaries
+        """
+        return self._fetch_all_posts()
+
+    def _fetch_all_posts(self) -> List[Dict[str, Any]]:
         """
         Fetch all posts from Google Sheets
 
@@ -333,16 +1126,9 @@ class GoogleSheetsService:
             raise Exception("Google Sheets service not initialized")
 
         try:
-            range_name = f"{self.sheet_name}!A2:I1000"  # Skip header row
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=range_name
-            ).execute()
-
-            values = result.get('values', [])
-
             posts = []
-            for row in values:
+            counter_writes = self._counter_writes
+            for row in self._read_rows(self.sheet_name, 'I'):
                 if len(row) > 0:  # Skip empty rows
                     post = {
                         'id': row[0] if len(row) > 0 else '',
@@ -357,10 +1143,14 @@ class GoogleSheetsService:
                     }
                     posts.append(post)
 
+            if self._counter_writes == counter_writes:
+                self._post_counters.update((post['id'], post['upvotes']) for post in posts)
+
             print(f"[SUCCESS] Fetched {len(posts)} posts from Google Sheets")
             return posts
 
         except HttpError as error:
+            self._record_api_error(error)
             print(f"❌ Google Sheets API error: {error}")
             raise Exception(f"Failed to fetch posts: {error}")
         except Exception as e:
@@ -377,60 +1167,86 @@ class GoogleSheetsService:
         Returns:
             bool: True if successful, False otherwise
         """
+        return self.add_events([event_data])
+
+    def add_events(self, events: List[Dict[str, Any]]) -> bool:
+        """
+        Add several events to Google Sheets with a single append
+        Falls back to Google Apps Script (one call per event) if direct API fails
+
+        Args:
+            events: List of dictionaries containing event information
+
+        Returns:
+            bool: True if successful, False otherwise
+
+        Raises:
+            PartialAppendError: If an Apps Script call failed after earlier events were appended
+        """
         # Try Google Sheets API first if available
-        if self.service:
+        if self._use_api():
             try:
                 # Prepare the row data in the correct order
                 # Columns: id, title, location, coordinates_lat, coordinates_lng, date, time, participants, maxParticipants, description, organizer, difficulty, imageUrl, timestamp
-                coordinates = event_data.get('coordinates', {})
-                row = [
-                    event_data.get('id', ''),
-                    event_data.get('title', ''),
-                    event_data.get('location', ''),
-                    coordinates.get('lat', '') if coordinates else '',
-                    coordinates.get('lng', '') if coordinates else '',
-                    event_data.get('date', ''),
-                    event_data.get('time', ''),
-                    event_data.get('participants', 0),
-                    event_data.get('maxParticipants', 0),
-                    event_data.get('description', ''),
-                    event_data.get('organizer', ''),
-                    event_data.get('difficulty', 'Easy'),
-                    event_data.get('imageUrl', ''),
-                    event_data.get('timestamp', ''),
-                ]
+                rows = []
+                for event_data in events:
+                    coordinates = event_data.get('coordinates', {})
+                    rows.append([
+                        event_data.get('id', ''),
+                        event_data.get('title', ''),
+                        event_data.get('location', ''),
+                        coordinates.get('lat', '') if coordinates else '',
+                        coordinates.get('lng', '') if coordinates else '',
+                        event_data.get('date', ''),
+                        event_data.get('time', ''),
+                        event_data.get('participants', 0),
+                        event_data.get('maxParticipants', 0),
+                        event_data.get('description', ''),
+                        event_data.get('organizer', ''),
+                        event_data.get('difficulty', 'Easy'),
+                        event_data.get('imageUrl', ''),
+                        event_data.get('timestamp', ''),
+                    ])
 
                 # Append to the sheet
                 range_name = f"{self.events_sheet_name}!A:N"
                 body = {
-                    'values': [row]
+                    'values': rows
                 }
 
-                result = self.service.spreadsheets().values().append(
+                result = self._execute(self.service.spreadsheets().values().append(
                     spreadsheetId=self.spreadsheet_id,
                     range=range_name,
                     valueInputOption='RAW',
                     insertDataOption='INSERT_ROWS',
                     body=body
-                ).execute()
+                ))
+
+                self._index_appended(self._event_index, [row[0] for row in rows], result)
+                self._read_cache.invalidate('events')
 
+                self._api_breaker.record_success()
                 print(f"[SUCCESS] Added event to Google Sheets via API: {result.get('updates', {}).get('updatedRows', 0)} row(s) added")
                 return True
 
             except HttpError as error:
-                error_str = str(error)
-                if "SERVICE_DISABLED" in error_str or "API has not been used" in error_str:
+                if self._is_service_disabled(error):
+                    self._api_breaker.trip(error)
                     print(f"[WARNING] Google Sheets API is disabled, falling back to Apps Script...")
-                    return self._add_event_via_apps_script(event_data)
+                    return self._append_via_apps_script(events, self._add_event_via_apps_script)
                 else:
+                    self._record_api_error(error)
                     print(f"[ERROR] Google Sheets API error: {error}")
                     raise Exception(f"Failed to add event to Google Sheets: {error}")
             except Exception as e:
+                if self._is_transport_error(e):
+                    print(f"[WARNING] Google Sheets API unreachable ({e}), falling back to Apps Script...")
+                    return self._append_via_apps_script(events, self._add_event_via_apps_script)
                 print(f"[ERROR] Error adding event via API: {e}")
                 raise
         else:
-            print("[INFO] Google Sheets API service not initialized, using Apps Script...")
-            return self._add_event_via_apps_script(event_data)
+            print("[INFO] Google Sheets API unavailable, using Apps Script...")
+            return self._append_via_apps_script(events, self._add_event_via_apps_script)
 
     def _add_event_via_apps_script(self, event_data: Dict[str, Any]) -> bool:
         """
@@ -446,31 +1262,48 @@ class GoogleSheetsService:
             raise Exception("Google Apps Script URL not configured")
 
         try:
-            with httpx.Client(follow_redirects=True) as client:
-                response = client.post(
-                    self.apps_script_url,
-                    json={
-                        "action": "addEvent",
-                        "data": event_data
-                    },
-                    timeout=30.0
-                )
-
-                if response.status_code != 200:
-                    raise Exception(f"Apps Script returned status {response.status_code}: {response.text}")
-
-                result = response.json()
-                if result.get("success"):
-                    print(f"[SUCCESS] Added event to Google Sheets via Apps Script")
-                    return True
-                else:
-                    raise Exception(f"Apps Script error: {result.get('error', 'Unknown error')}")
+            response = self._post_apps_script({
+                "action": "addEvent",
+                "data": event_data
+            })
+
+            if response.status_code != 200:
+                raise Exception(f"Apps Script returned status {response.status_code}: {response.text}")
+
+            result = response.json()
+            if result.get("success"):
+                self._read_cache.invalidate('events')
+                print(f"[SUCCESS] Added event to Google Sheets via Apps Script")
+                return True
+            else:
+                raise Exception(f"Apps Script error: {result.get('error', 'Unknown error')}")
 
         except Exception as e:
             print(f"[ERROR] Error adding event via Apps Script: {e}")
             raise Exception(f"Failed to add event via Apps Script: {e}")
 
     def get_all_events(self) -> List[Dict[str, Any]]:
+        """
+        Fetch all events, served from the read cache when possible
+
+        Returns:
+            List of event dictionaries
+        """
+        return self._read_cache.get('events', self._fetch_all_events)
+
+    def read_all_events(self) -> List[Dict[str, Any]]:
+        """
+        Fetch every event straight from the sheet, bypassing the read cache
+
+        Unlike get_all_events the result is never stale or partial: the read
+        covers the sheet's whole row count and any failure raises.
+
+        Returns:
+            List of event dictionaries
+        """
+        return self._fetch_all_events()
+
+    def _fetch_all_events(self) -> List[Dict[str, Any]]:
         """
         Fetch all events from Google Sheets
 
@@ -481,16 +1314,9 @@ class GoogleSheetsService:
             raise Exception("Google Sheets service not initialized")
 
         try:
-            range_name = f"{self.events_sheet_name}!A2:N1000"  # Skip header row
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=range_name
-            ).execute()
-
-            values = result.get('values', [])
-
             events = []
-            for row in values:
+            counter_writes = self._counter_writes
+            for row in self._read_rows(self.events_sheet_name, 'N'):
                 if len(row) > 0:  # Skip empty rows
                     # Parse coordinates
                     coordinates = None
@@ -520,10 +1346,14 @@ class GoogleSheetsService:
                     }
                     events.append(event)
 
+            if self._counter_writes == counter_writes:
+                self._event_counters.update((event['id'], event['participants']) for event in events)
+
             print(f"[SUCCESS] Fetched {len(events)} events from Google Sheets")
             return events
 
         except HttpError as error:
+            self._record_api_error(error)
             print(f"❌ Google Sheets API error: {error}")
             raise Exception(f"Failed to fetch events: {error}")
         except Exception as e:
@@ -541,60 +1371,76 @@ class GoogleSheetsService:
         Returns:
             bool: True if successful, False otherwise
         """
-        if self.service:
+        if self._use_api():
             try:
-                # First, find the row with this event_id
-                range_name = f"{self.events_sheet_name}!A:N"
-                result = self.service.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=range_name
-                ).execute()
-
-                values = result.get('values', [])
-
-                # Find the row index (skip header row)
-                row_index = None
-                for i, row in enumerate(values):
-                    if i == 0:  # Skip header
-                        continue
-                    if len(row) > 0 and row[0] == event_id:
-                        row_index = i + 1  # +1 because sheets are 1-indexed
-                        break
+                # Write the participants column (column H) of the row found via the id -> row index
+                written = self._write_counters(
+                    self.events_sheet_name, self._event_index, 'H', {event_id: participants}, self._event_counters
+                )
 
-                if row_index is None:
+                if not written:
                     raise Exception(f"Event with ID {event_id} not found")
 
-                # Update the participants column (column H, index 7)
-                update_range = f"{self.events_sheet_name}!H{row_index}"
-                body = {
-                    'values': [[participants]]
-                }
-
-                self.service.spreadsheets().values().update(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=update_range,
-                    valueInputOption='RAW',
-                    body=body
-                ).execute()
-
+                self._read_cache.invalidate('events')
+                self._api_breaker.record_success()
                 print(f"[SUCCESS] Updated participants for event {event_id} to {participants}")
                 return True
 
             except HttpError as error:
-                error_str = str(error)
-                if "SERVICE_DISABLED" in error_str or "API has not been used" in error_str:
+                if self._is_service_disabled(error):
+                    self._api_breaker.trip(error)
                     print(f"[WARNING] Google Sheets API is disabled, falling back to Apps Script...")
                     return self._update_event_participants_via_apps_script(event_id, participants)
                 else:
+                    self._record_api_error(error)
                     print(f"[ERROR] Google Sheets API error: {error}")
                     raise Exception(f"Failed to update participants: {error}")
             except Exception as e:
+                if self._is_transport_error(e):
+                    print(f"[WARNING] Google Sheets API unreachable ({e}), falling back to Apps Script...")
+                    return self._update_event_participants_via_apps_script(event_id, participants)
                 print(f"[ERROR] Error updating participants via API: {e}")
                 raise
         else:
-            print("[INFO] Google Sheets API service not initialized, using Apps Script...")
+            print("[INFO] Google Sheets API unavailable, using Apps Script...")
             return self._update_event_participants_via_apps_script(event_id, participants)
 
+    def apply_participant_deltas(self, deltas: Dict[str, int]) -> Dict[str, int]:
+        """
+        Add pending participant changes to several events
+
+        Args:
+            deltas: Dict mapping event id to the change in participants
+
+        Returns:
+            Dict mapping each event id found in the sheet to its new participant count
+        """
+        return self._apply_counter_deltas(self.events_sheet_name, self._event_index, 'H', deltas, 'events', self._event_counters)
+
+    def read_participants(self, event_ids: List[str]) -> Dict[str, int]:
+        """
+        Current participant counts for several events
+
+        Args:
+            event_ids: Event ids
+
+        Returns:
+            Dict mapping each event id found in the sheet to its participant count
+        """
+        return self._current_counters(self.events_sheet_name, self._event_index, 'H', event_ids, self._event_counters)
+
+    def set_participants(self, values: Dict[str, int]) -> Dict[str, int]:
+        """
+        Write absolute participant counts for several events in one batchUpdate
+
+        Args:
+            values: Dict mapping event id to its participant count
+
+        Returns:
+            Dict of the values written, for the event ids found in the sheet
+        """
+        return self._set_counters(self.events_sheet_name, self._event_index, 'H', values, 'events', self._event_counters)
+
     def _update_event_participants_via_apps_script(self, event_id: str, participants: int) -> bool:
         """
         Update participants using Google Apps Script Web App
@@ -610,26 +1456,24 @@ class GoogleSheetsService:
             raise Exception("Google Apps Script URL not configured")
 
         try:
-            with httpx.Client(follow_redirects=True) as client:
-                response = client.post(
-                    self.apps_script_url,
-                    json={
-                        "action": "updateEventParticipants",
-                        "eventId": event_id,
-                        "participants": participants
-                    },
-                    timeout=30.0
-                )
-
-                if response.status_code != 200:
-                    raise Exception(f"Apps Script returned status {response.status_code}: {response.text}")
-
-                result = response.json()
-                if result.get("success"):
-                    print(f"[SUCCESS] Updated participants for event {event_id} to {participants} via Apps Script")
-                    return True
-                else:
-                    raise Exception(f"Apps Script error: {result.get('error', 'Unknown error')}")
+            with self._counter_write():
+                response = self._post_apps_script({
+                    "action": "updateEventParticipants",
+                    "eventId": event_id,
+                    "participants": participants
+                })
+
+            if response.status_code != 200:
+                raise Exception(f"Apps Script returned status {response.status_code}: {response.text}")
+
+            result = response.json()
+            if result.get("success"):
+                self._read_cache.invalidate('events')
+                self._event_counters[event_id] = participants
+                print(f"[SUCCESS] Updated participants for event {event_id} to {participants} via Apps Script")
+                return True
+            else:
+                raise Exception(f"Apps Script error: {result.get('error', 'Unknown error')}")
 
         except Exception as e:
             print(f"[ERROR] Error updating participants via Apps Script: {e}")
@@ -0,0 +1,397 @@
+"""
+Map Clusters
+Server-side marker clustering for the map view, over debris hotspots and
+Sheets events with coordinates.
+
+Points are projected to Web Mercator and grouped on a grid of cells
+(MAP_CLUSTER_CELL_PX screen pixels wide) for every zoom level. The grids
+nest, so each level is built by one vectorized group-by of the finest cell
+coordinates. Each level is stored as sorted cell keys plus per-cell
+aggregates, so a tile's clusters are found with a few binary searches.
+Levels stop at the first zoom where no cell would split any further;
+tiles beyond it list the points themselves.
+
+Points added through the API go into a small per-level overlay and evict
+only the cached tiles that contain them; the whole index is rebuilt in
+the background every MAP_CLUSTER_REFRESH seconds (or once the overlay
+grows large) to pick up changes made elsewhere.
+"""
+import os
+import math
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config.database import db_manager
+from src.services.sheets_mirror import sheets_store
+
+TILE_PX = 256
+MAX_MERCATOR_LAT = 85.05112878
+# Tiles are served to this zoom; above the cluster levels they list points
+MAX_TILE_ZOOM = 22
+
+KIND_HOTSPOT = 'hotspot'
+KIND_EVENT = 'event'
+
+def mercator(lat: float, lon: float) -> Tuple[float, float]:
+    """Normalized Web Mercator (x, y) in [0, 1), y growing southwards"""
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = (lon + 180.0) / 360.0
+    y = 0.5 - math.log(math.tan(math.pi / 4 + math.radians(lat) / 2)) / (2 * math.pi)
+    return min(max(x, 0.0), math.nextafter(1.0, 0.0)), min(max(y, 0.0), math.nextafter(1.0, 0.0))
+
+def inverse_mercator(x: float, y: float) -> Tuple[float, float]:
+    """(lat, lon) for a normalized Web Mercator point"""
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y)))), x * 360.0 - 180.0
+
+class _Level:
+    """Clusters at one zoom level: sorted cell keys and per-cell aggregates"""
+
+    def __init__(self, keys, count, sum_x, sum_y, hotspots, max_score, first):
+        self.keys = keys
+        self.count = count
+        self.sum_x = sum_x
+        self.sum_y = sum_y
+        self.hotspots = hotspots
+        self.max_score = max_score
+        self.first = first
+
+class MapClusters:
+    def __init__(
+        self,
+        max_zoom: Optional[int] = None,
+        cell_px: Optional[int] = None,
+        refresh_seconds: Optional[float] = None,
+        tile_cache_size: Optional[int] = None
+    ):
+        """
+        Args:
+            max_zoom: Deepest zoom level with clusters (MAP_CLUSTER_MAX_ZOOM, default 16)
+            cell_px: Cluster cell size in screen pixels; a power of two up to 256
+                (MAP_CLUSTER_CELL_PX, default 64)
+            refresh_seconds: Age at which the index is rebuilt from its sources
+                (MAP_CLUSTER_REFRESH, default 300)
+            tile_cache_size: Tile summaries kept in memory (MAP_TILE_CACHE_SIZE, default 4096)
+        """
+        self.max_zoom = max_zoom if max_zoom is not None else int(os.getenv("MAP_CLUSTER_MAX_ZOOM", "16"))
+        self.cell_px = cell_px or int(os.getenv("MAP_CLUSTER_CELL_PX", "64"))
+        if self.cell_px > TILE_PX or self.cell_px & (self.cell_px - 1):
+            raise Exception(f"MAP_CLUSTER_CELL_PX must be a power of two no larger than {TILE_PX}, got {self.cell_px}")
+        self.refresh_seconds = refresh_seconds or float(os.getenv("MAP_CLUSTER_REFRESH", "300"))
+        self.tile_cache_size = tile_cache_size or int(os.getenv("MAP_TILE_CACHE_SIZE", "4096"))
+        # Cells along one side of a tile, and along the world at zoom 0
+        self.cells_per_tile = TILE_PX // self.cell_px
+
+        self._points: List[Dict[str, Any]] = []
+        self._levels: List[_Level] = []
+        # Points sorted by x, for tiles past the last cluster level
+        self._order = np.empty(0, dtype=np.int64)
+        self._sorted_x = np.empty(0, dtype=np.float64)
+        self._y = np.empty(0, dtype=np.float64)
+
+        # Points added since the last build: per-level cell aggregates and their indexes
+        self._overlay: List[Dict[int, list]] = []
+        self._overlay_points: List[int] = []
+
+        self._tiles: OrderedDict = OrderedDict()
+        self._built_at: Optional[float] = None
+        self._build_lock = asyncio.Lock()
+        self._build_task: Optional[asyncio.Task] = None
+        self._added_during_build: Optional[List[Dict[str, Any]]] = None
+
+        # Metrics
+        self._builds = 0
+        self._last_build_ms = 0.0
+        self._tile_hits = 0
+        self._tile_misses = 0
+        self._tile_evictions = 0
+
+    # ------------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------------
+
+    async def _load_points(self) -> List[Dict[str, Any]]:
+        async with db_manager.reader() as db:
+            cursor = await db.execute("SELECT id, location, debrisScore, lat, lon FROM debris_hotspots")
+            points = [
+                {
+                    'kind': KIND_HOTSPOT, 'id': row['id'], 'name': row['location'],
+                    'debrisScore': row['debrisScore'], 'lat': row['lat'], 'lng': row['lon']
+                }
+                for row in await cursor.fetchall()
+            ]
+
+        try:
+            events = await sheets_store.get_all_events()
+        except Exception as e:
+            print(f"[WARNING] Map clusters built without events: {str(e)}")
+            events = []
+        points.extend(p for p in (self._event_point(event) for event in events) if p is not None)
+        return points
+
+    @staticmethod
+    def _event_point(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        coordinates = event.get('coordinates')
+        if not coordinates or coordinates.get('lat') is None or coordinates.get('lng') is None:
+            return None
+        return {
+            'kind': KIND_EVENT, 'id': event.get('id') or None, 'name': event.get('title'),
+            'date': event.get('date'), 'lat': float(coordinates['lat']), 'lng': float(coordinates['lng'])
+        }
+
+    def _build(self, points: List[Dict[str, Any]]):
+        """Compute every cluster level for points (CPU-bound; runs in a thread)"""
+        n = len(points)
+        xy = np.array([mercator(p['lat'], p['lng']) for p in points], dtype=np.float64).reshape(n, 2)
+        x, y = xy[:, 0], xy[:, 1]
+        is_hotspot = np.array([p['kind'] == KIND_HOTSPOT for p in points], dtype=bool)
+        scores = np.array(
+            [p['debrisScore'] if p['kind'] == KIND_HOTSPOT else -np.inf for p in points], dtype=np.float64
+        )
+
+        finest = self.cells_per_tile << self.max_zoom
+        fx = np.minimum((x * finest).astype(np.int64), finest - 1)
+        fy = np.minimum((y * finest).astype(np.int64), finest - 1)
+        # Points sharing a finest cell (e.g. repeat surveys of one site) never separate
+        distinct = len(np.unique(fx * finest + fy))
+
+        levels = []
+        for zoom in range(self.max_zoom + 1):
+            shift = self.max_zoom - zoom
+            keys = (fx >> shift) * (self.cells_per_tile << zoom) + (fy >> shift)
+            cells, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            max_score = np.full(len(cells), -np.inf)
+            np.maximum.at(max_score, inverse, scores)
+            levels.append(_Level(
+                keys=cells,
+                count=np.bincount(inverse, minlength=len(cells)).astype(np.int32),
+                sum_x=np.bincount(inverse, weights=x, minlength=len(cells)),
+                sum_y=np.bincount(inverse, weights=y, minlength=len(cells)),
+                hotspots=np.bincount(inverse, weights=is_hotspot, minlength=len(cells)).astype(np.int32),
+                max_score=max_score,
+                first=first.astype(np.int32),
+            ))
+            # Finer grids only split cells further: once they can't split any more, later levels are the points
+            if len(cells) == distinct:
+                break
+
+        order = np.argsort(x, kind='stable')
+        return levels, order, x[order], y
+
+    async def refresh(self):
+        """Rebuild the index from the hotspot table and the events store"""
+        async with self._build_lock:
+            self._added_during_build = []
+            try:
+                points = await self._load_points()
+                started = time.perf_counter()
+                levels, order, sorted_x, y = await asyncio.to_thread(self._build, points)
+                self._last_build_ms = (time.perf_counter() - started) * 1000
+
+                self._points = points
+                self._levels = levels
+                self._order, self._sorted_x, self._y = order, sorted_x, y
+                self._overlay = [{} for _ in levels]
+                self._overlay_points = []
+                self._tiles.clear()
+                self._built_at = time.monotonic()
+                self._builds += 1
+
+                # Points added while the build read its sources may be missing from it
+                known = {(p['kind'], p['id'], p['lat'], p['lng']) for p in points}
+                missed = [
+                    p for p in self._added_during_build if (p['kind'], p['id'], p['lat'], p['lng']) not in known
+                ]
+            finally:
+                self._added_during_build = None
+            for point in missed:
+                self._add_point(point)
+
+    async def _ensure_fresh(self):
+        if self._built_at is None:
+            await self.refresh()
+        elif (
+            (time.monotonic() - self._built_at >= self.refresh_seconds or len(self._overlay_points) > 1000)
+            and (self._build_task is None or self._build_task.done())
+        ):
+            # Serve the current index while a new one is built
+            self._build_task = asyncio.create_task(self.refresh())
+
+    # ------------------------------------------------------------------------
+    # Incremental adds
+    # ------------------------------------------------------------------------
+
+    def add_event(self, event: Dict[str, Any]):
+        """Add a newly created event, if it has coordinates"""
+        point = self._event_point(event)
+        if point is not None:
+            self._add_point(point)
+
+    def _add_point(self, point: Dict[str, Any]):
+        if self._added_during_build is not None:
+            self._added_during_build.append(point)
+        if self._built_at is None:
+            # Not built yet: the first build reads it from the source
+            return
+
+        index = len(self._points)
+        self._points.append(point)
+        self._overlay_points.append(index)
+        x, y = mercator(point['lat'], point['lng'])
+        score = point['debrisScore'] if point['kind'] == KIND_HOTSPOT else -math.inf
+
+        for zoom, overlay in enumerate(self._overlay):
+            cells = self.cells_per_tile << zoom
+            cx, cy = min(int(x * cells), cells - 1), min(int(y * cells), cells - 1)
+            cell = overlay.get(cx * cells + cy)
+            if cell is None:
+                overlay[cx * cells + cy] = [1, x, y, int(point['kind'] == KIND_HOTSPOT), score, index]
+            else:
+                cell[0] += 1
+                cell[1] += x
+                cell[2] += y
+                cell[3] += int(point['kind'] == KIND_HOTSPOT)
+                cell[4] = max(cell[4], score)
+
+        # Only the one tile per zoom that contains the point changes
+        for zoom in range(MAX_TILE_ZOOM + 1):
+            tiles = 1 << zoom
+            key = (zoom, min(int(x * tiles), tiles - 1), min(int(y * tiles), tiles - 1))
+            if self._tiles.pop(key, None) is not None:
+                self._tile_evictions += 1
+
+    # ------------------------------------------------------------------------
+    # Tiles
+    # ------------------------------------------------------------------------
+
+    async def tile(self, zoom: int, x: int, y: int) -> Dict[str, Any]:
+        """
+        Cluster summary for one map tile
+
+        Args:
+            zoom: Zoom level (0 to MAX_TILE_ZOOM)
+            x: Tile column (0 at longitude -180)
+            y: Tile row (0 at the top of the map)
+
+        Returns:
+            Dictionary with the tile coordinates and its features: clusters
+            (count, centroid, hotspot/event split and highest debris score)
+            and single hotspots or events
+        """
+        await self._ensure_fresh()
+
+        key = (zoom, x, y)
+        cached = self._tiles.get(key)
+        if cached is not None:
+            self._tiles.move_to_end(key)
+            self._tile_hits += 1
+            return cached
+        self._tile_misses += 1
+
+        if zoom < len(self._levels):
+            features = self._tile_clusters(zoom, x, y)
+        else:
+            features = self._tile_points(zoom, x, y)
+        summary = {"z": zoom, "x": x, "y": y, "features": features}
+
+        self._tiles[key] = summary
+        if len(self._tiles) > self.tile_cache_size:
+            self._tiles.popitem(last=False)
+        return summary
+
+    def _tile_clusters(self, zoom: int, x: int, y: int) -> List[Dict[str, Any]]:
+        level = self._levels[zoom]
+        overlay = self._overlay[zoom]
+        cells = self.cells_per_tile << zoom
+        first_cx, first_cy = x * self.cells_per_tile, y * self.cells_per_tile
+
+        # One contiguous key range per cell column of the tile
+        starts = np.array([cx * cells + first_cy for cx in range(first_cx, first_cx + self.cells_per_tile)])
+        lo = np.searchsorted(level.keys, starts)
+        hi = np.searchsorted(level.keys, starts + self.cells_per_tile)
+
+        merged: Dict[int, list] = {}
+        for a, b in zip(lo, hi):
+            for i in range(a, b):
+                merged[int(level.keys[i])] = [
+                    int(level.count[i]), float(level.sum_x[i]), float(level.sum_y[i]),
+                    int(level.hotspots[i]), float(level.max_score[i]), int(level.first[i])
+                ]
+        if overlay:
+            for start in starts:
+                for cell_key in range(int(start), int(start) + self.cells_per_tile):
+                    extra = overlay.get(cell_key)
+                    if extra is None:
+                        continue
+                    cell = merged.get(cell_key)
+                    if cell is None:
+                        merged[cell_key] = list(extra)
+                    else:
+                        cell[0] += extra[0]
+                        cell[1] += extra[1]
+                        cell[2] += extra[2]
+                        cell[3] += extra[3]
+                        cell[4] = max(cell[4], extra[4])
+
+        features = []
+        for count, sum_x, sum_y, hotspots, max_score, first in merged.values():
+            if count == 1:
+                features.append(self._point_feature(self._points[first]))
+                continue
+            lat, lng = inverse_mercator(sum_x / count, sum_y / count)
+            features.append({
+                "type": "cluster",
+                "lat": round(lat, 6),
+                "lng": round(lng, 6),
+                "count": count,
+                "hotspots": hotspots,
+                "events": count - hotspots,
+                "maxDebrisScore": max_score if hotspots else None,
+            })
+        return features
+
+    def _tile_points(self, zoom: int, x: int, y: int) -> List[Dict[str, Any]]:
+        tiles = 1 << zoom
+        min_x, max_x = x / tiles, (x + 1) / tiles
+        min_y, max_y = y / tiles, (y + 1) / tiles
+
+        lo, hi = np.searchsorted(self._sorted_x, [min_x, max_x])
+        candidates = self._order[lo:hi]
+        inside = candidates[(self._y[candidates] >= min_y) & (self._y[candidates] < max_y)]
+        features = [self._point_feature(self._points[i]) for i in inside]
+
+        for i in self._overlay_points:
+            px, py = mercator(self._points[i]['lat'], self._points[i]['lng'])
+            if min_x <= px < max_x and min_y <= py < max_y:
+                features.append(self._point_feature(self._points[i]))
+        return features
+
+    @staticmethod
+    def _point_feature(point: Dict[str, Any]) -> Dict[str, Any]:
+        feature = {"type": point['kind'], "id": point['id'], "name": point['name'], "lat": point['lat'], "lng": point['lng']}
+        if point['kind'] == KIND_HOTSPOT:
+            feature["debrisScore"] = point['debrisScore']
+        else:
+            feature["date"] = point['date']
+        return feature
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self._tile_hits + self._tile_misses
+        return {
+            "points": len(self._points),
+            "levels": len(self._levels),
+            "pending_adds": len(self._overlay_points),
+            "builds": self._builds,
+            "last_build_ms": round(self._last_build_ms, 1),
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._built_at is not None else None,
+            "tiles_cached": len(self._tiles),
+            "tile_hit_rate": round(self._tile_hits / lookups, 3) if lookups else 0,
+            "tile_evictions": self._tile_evictions,
+        }
+
+
+# Singleton instance
+map_clusters = MapClusters()
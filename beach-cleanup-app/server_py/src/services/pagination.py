@@ -0,0 +1,70 @@
+"""
+Cursor pagination for list endpoints
+Cursors are opaque strings encoding the offset of the next item, or for
+keyset pagination the sort key of the last item returned
+"""
+import json
+import base64
+from typing import Any, List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(str(offset).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return 0
+    padded = cursor + '=' * (-len(cursor) % 4)
+    offset = int(base64.urlsafe_b64decode(padded.encode()).decode())
+    if offset < 0:
+        raise ValueError("Negative cursor offset")
+    return offset
+
+def paginate(items: List[Any], limit: int, cursor: Optional[str]) -> Tuple[List[Any], Optional[str]]:
+    """
+    Slice one page out of a list
+
+    Args:
+        items: The full, stably ordered list
+        limit: Maximum number of items in the page
+        cursor: Cursor returned with the previous page, or None for the first page
+
+    Returns:
+        (page, next_cursor) where next_cursor is None on the last page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    start = decode_cursor(cursor)
+    end = start + limit
+    next_cursor = encode_cursor(end) if end < len(items) else None
+    return items[start:end], next_cursor
+
+def encode_keyset_cursor(*key: Any) -> str:
+    """Encode the sort key of the last item on a page"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip('=')
+
+def decode_keyset_cursor(cursor: str, size: int) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_keyset_cursor
+
+    Args:
+        cursor: The cursor string
+        size: Number of key columns expected
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    padded = cursor + '=' * (-len(cursor) % 4)
+    key = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    if not isinstance(key, list) or len(key) != size:
+        raise ValueError("Malformed keyset cursor")
+    return tuple(key)
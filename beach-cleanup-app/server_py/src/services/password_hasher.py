@@ -0,0 +1,179 @@
+"""
+Password Hasher
+Runs bcrypt hashing and verification in a process pool so password work
+never blocks the event loop and login throughput scales with cores.
+
+Submissions are bounded: at most max_pending jobs are in the pool at once,
+and callers beyond that wait up to queue_timeout seconds for a slot. When
+the wait queue is also full, or the wait times out, PasswordHasherBusy is
+raised so the caller can shed load instead of piling up requests. It is
+also raised when a worker process dies: the broken pool is shut down and
+replaced on the next call, and the caller can retry.
+"""
+import os
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from passlib.context import CryptContext
+
+# Created once per worker process on import
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+def _ready() -> bool:
+    return True
+
+def available_cores() -> int:
+    """CPU cores this process may run on (respects container CPU affinity)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password pool is saturated and the request should be retried later"""
+
+class PasswordHasher:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        queue_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            workers: Worker processes. Defaults to PASSWORD_HASH_WORKERS, or the available cores.
+            max_pending: Jobs allowed in the pool at once; the same number may wait for
+                a slot. Defaults to PASSWORD_HASH_MAX_PENDING, or 4 per worker.
+            queue_timeout: Seconds a caller waits for a slot before PasswordHasherBusy.
+                Defaults to PASSWORD_HASH_QUEUE_TIMEOUT (5).
+        """
+        self.workers = workers or int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or available_cores()
+        self.max_pending = max_pending or int(os.getenv("PASSWORD_HASH_MAX_PENDING", "0")) or self.workers * 4
+        self.queue_timeout = queue_timeout if queue_timeout is not None else float(
+            os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5")
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # Metrics
+        self._in_flight = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._pool_seconds_total = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the server already runs DB and Sheets threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def start(self):
+        """Start the worker processes up front so the first logins don't pay for it"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, _ready) for _ in range(self.workers)))
+        print(f"[INFO] Password hasher ready ({self.workers} worker processes)")
+
+    async def hash(self, password: str) -> str:
+        """Hash a password using bcrypt"""
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash"""
+        return await self._run(_verify, password, hashed_password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash a batch of passwords across all workers
+
+        Meant for offline jobs such as bulk imports: the batch is split into
+        chunks and goes straight to the pool, bypassing the request queue.
+        """
+        if not passwords:
+            return []
+        executor = self._get_executor()
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: list(executor.map(_hash, passwords, chunksize=chunksize))
+        )
+
+    async def _run(self, func: Callable, *args) -> Any:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        if self._slots.locked() and self._waiting >= self.max_pending:
+            self._rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise PasswordHasherBusy(f"No password hashing slot within {self.queue_timeout}s")
+        finally:
+            self._waiting -= 1
+
+        waited = time.perf_counter() - started
+        self._wait_seconds_total += waited
+        self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool as e:
+            # A worker died; shut the broken pool down (other calls may have
+            # replaced it already) so later calls get a fresh one
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+                print(f"[WARNING] Password hasher pool broke, restarting: {str(e)}")
+            raise PasswordHasherBusy("Password worker process died") from e
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            self._pool_seconds_total += time.perf_counter() - started
+            self._slots.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "saturation": round(self._in_flight / self.max_pending, 2),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_wait_ms": round(self._wait_seconds_total / self._completed * 1000, 2) if self._completed else 0,
+            "max_wait_ms": round(self._wait_seconds_max * 1000, 2),
+            "avg_pool_ms": round(self._pool_seconds_total / self._completed * 1000, 2) if self._completed else 0,
+        }
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            print("Password hasher pool closed")
+
+
+# Singleton instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,336 @@
+"""
+Push Notifications
+Fans a notification out to users' registered devices.
+
+Recipients' device tokens are read in one query, split into multicast
+batches of PUSH_BATCH_SIZE tokens, and handed to the transport with at most
+PUSH_MAX_CONCURRENCY batches in flight. Tokens the transport reports as
+unregistered or invalid are deleted from device_tokens in one statement
+per fan-out, so dead devices stop costing sends.
+
+Transports (PUSH_TRANSPORT):
+- "stub": local, no network; simulated latency and failures, for development
+  and for measuring the engine itself (see benchmark_push.py)
+- "fcm": Firebase Cloud Messaging HTTP v1, authenticated with the service
+  account in FIREBASE_SERVICE_ACCOUNT_FILE. The v1 API takes one token per
+  request, so the transport caps its own requests in flight at
+  PUSH_FCM_MAX_CONCURRENCY, across all batches
+"""
+import os
+import json
+import time
+import random
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+from src.config.database import db_manager
+
+# Error codes meaning the token will never work again. FCM reports a malformed
+# token as INVALID_ARGUMENT, which also covers bad payloads, so FCMTransport
+# narrows that case to INVALID_TOKEN first.
+INVALID_TOKEN_ERRORS = {"UNREGISTERED", "SENDER_ID_MISMATCH", "INVALID_TOKEN"}
+
+class SendResult:
+    """Outcome of sending to one token"""
+
+    __slots__ = ("token", "success", "error")
+
+    def __init__(self, token: str, success: bool, error: Optional[str] = None):
+        self.token = token
+        self.success = success
+        self.error = error
+
+class StubTransport:
+    """
+    Local transport for development and benchmarks
+
+    Each batch takes latency_ms (with jitter) to "send". Tokens starting
+    with "invalid" are reported UNREGISTERED, and failure_rate of the rest
+    fail with a transient error.
+    """
+
+    def __init__(self, latency_ms: float = 50.0, jitter_ms: float = 10.0, failure_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+
+    async def send_multicast(self, tokens: List[str], message: Dict[str, Any]) -> List[SendResult]:
+        await asyncio.sleep(max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000)
+        results = []
+        for token in tokens:
+            if token.startswith("invalid"):
+                results.append(SendResult(token, False, "UNREGISTERED"))
+            elif self.failure_rate and random.random() < self.failure_rate:
+                results.append(SendResult(token, False, "UNAVAILABLE"))
+            else:
+                results.append(SendResult(token, True))
+        return results
+
+    async def close(self):
+        pass
+
+class FCMTransport:
+    """
+    Firebase Cloud Messaging (HTTP v1)
+
+    The v1 API takes one message per request, so a batch is sent as
+    concurrent requests over pooled (HTTP/2 when available) connections.
+    At most max_concurrency requests are in flight at once across every
+    batch, and the connection pool is sized to match, so a send waits for
+    a slot here rather than timing out in the pool.
+    """
+
+    SCOPE = "https://www.googleapis.com/auth/firebase.messaging"
+
+    def __init__(self, service_account_file: Optional[str] = None, max_concurrency: Optional[int] = None):
+        """
+        Args:
+            service_account_file: Service account JSON (FIREBASE_SERVICE_ACCOUNT_FILE)
+            max_concurrency: Requests in flight at once (PUSH_FCM_MAX_CONCURRENCY, default 100)
+        """
+        from google.oauth2 import service_account
+
+        service_account_file = service_account_file or os.getenv("FIREBASE_SERVICE_ACCOUNT_FILE")
+        if not service_account_file or not os.path.exists(service_account_file):
+            raise Exception("PUSH_TRANSPORT=fcm needs FIREBASE_SERVICE_ACCOUNT_FILE pointing at a service account JSON file")
+        with open(service_account_file, 'r') as f:
+            info = json.load(f)
+        self._credentials = service_account.Credentials.from_service_account_info(info, scopes=[self.SCOPE])
+        self.url = f"https://fcm.googleapis.com/v1/projects/{info['project_id']}/messages:send"
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        self.max_concurrency = max_concurrency or int(os.getenv("PUSH_FCM_MAX_CONCURRENCY", "100"))
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._token_lock = asyncio.Lock()
+
+    async def _access_token(self) -> str:
+        async with self._token_lock:
+            if not self._credentials.valid:
+                from google.auth.transport.requests import Request
+                await asyncio.to_thread(self._credentials.refresh, Request())
+            return self._credentials.token
+
+    async def _send_one(self, token: str, message: Dict[str, Any], headers: Dict[str, str]) -> SendResult:
+        async with self._semaphore:
+            try:
+                response = await self._client.post(
+                    self.url, headers=headers, json={"message": {**message, "token": token}}
+                )
+            except httpx.HTTPError as e:
+                return SendResult(token, False, f"NETWORK: {type(e).__name__}")
+        if response.status_code == 200:
+            return SendResult(token, True)
+
+        error = {}
+        if response.headers.get("content-type", "").startswith("application/json"):
+            try:
+                body = response.json()
+            except ValueError:
+                # Malformed error body: fall back to the HTTP status
+                body = {}
+            if isinstance(body, dict) and isinstance(body.get("error"), dict):
+                error = body["error"]
+        code = next(
+            (detail["errorCode"] for detail in error.get("details", []) if "errorCode" in detail),
+            error.get("status", f"HTTP_{response.status_code}")
+        )
+        if code == "INVALID_ARGUMENT" and "registration token" in error.get("message", "").lower():
+            code = "INVALID_TOKEN"
+        return SendResult(token, False, code)
+
+    async def send_multicast(self, tokens: List[str], message: Dict[str, Any]) -> List[SendResult]:
+        headers = {"Authorization": f"Bearer {await self._access_token()}"}
+        return list(await asyncio.gather(*(self._send_one(token, message, headers) for token in tokens)))
+
+    async def close(self):
+        await self._client.aclose()
+
+def create_transport(name: Optional[str] = None):
+    name = (name or os.getenv("PUSH_TRANSPORT", "stub")).lower()
+    if name == "stub":
+        return StubTransport(latency_ms=float(os.getenv("PUSH_STUB_LATENCY_MS", "50")))
+    if name == "fcm":
+        return FCMTransport()
+    raise Exception(f"Unknown PUSH_TRANSPORT '{name}' (expected stub or fcm)")
+
+class PushFanout:
+    def __init__(self, transport=None, batch_size: Optional[int] = None, max_concurrency: Optional[int] = None):
+        """
+        Args:
+            transport: Object with async send_multicast(tokens, message) and close().
+                Defaults to PUSH_TRANSPORT, created on first use.
+            batch_size: Tokens per multicast batch (PUSH_BATCH_SIZE, default 500,
+                the FCM multicast limit)
+            max_concurrency: Batches in flight at once (PUSH_MAX_CONCURRENCY, default 8).
+                Transports that send a batch as many requests also cap their own
+                requests in flight (see FCMTransport).
+        """
+        self._transport = transport
+        self.batch_size = batch_size or int(os.getenv("PUSH_BATCH_SIZE", "500"))
+        self.max_concurrency = max_concurrency or int(os.getenv("PUSH_MAX_CONCURRENCY", "8"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Metrics
+        self._fanouts = 0
+        self._sent = 0
+        self._delivered = 0
+        self._failed = 0
+        self._pruned = 0
+        self._batches = 0
+        self._batch_failures = 0
+        self._send_seconds = 0.0
+        self._batch_latencies = deque(maxlen=1000)
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            self._transport = create_transport()
+        return self._transport
+
+    async def register_device(self, db, user_id: str, token: str, platform: Optional[str]):
+        """Store a device token for a user; a token moving to another account moves with it"""
+        now = datetime.now().isoformat()
+        await db.execute(
+            """
+            INSERT INTO device_tokens (token, userId, platform, createdAt, updatedAt)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(token) DO UPDATE SET userId = excluded.userId, platform = excluded.platform, updatedAt = excluded.updatedAt
+            """,
+            (token, user_id, platform, now, now)
+        )
+        await db.commit()
+
+    async def tokens_for_users(self, user_ids: Set[str]) -> List[str]:
+        """Device tokens of every user in user_ids, in one query"""
+        if not user_ids:
+            return []
+        async with db_manager.reader() as db:
+            cursor = await db.execute(
+                "SELECT token FROM device_tokens WHERE userId IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(user_ids)),)
+            )
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def send_to_users(self, user_ids: Set[str], message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send message to every registered device of user_ids"""
+        return await self.send_to_tokens(await self.tokens_for_users(user_ids), message)
+
+    async def send_to_tokens(self, tokens: List[str], message: Dict[str, Any], prune: bool = True) -> Dict[str, Any]:
+        """
+        Send message to tokens in concurrent multicast batches
+
+        Args:
+            tokens: Device tokens
+            message: FCM-style message ({"notification": {...}, "data": {...}})
+            prune: Delete tokens reported invalid from device_tokens
+
+        Returns:
+            Dictionary with tokens, batches, delivered, failed, pruned and seconds
+        """
+        started = time.perf_counter()
+        batches = [tokens[i:i + self.batch_size] for i in range(0, len(tokens), self.batch_size)]
+        results = await asyncio.gather(*(self._send_batch(batch, message) for batch in batches))
+
+        delivered = failed = 0
+        invalid = []
+        for batch_results in results:
+            for result in batch_results:
+                if result.success:
+                    delivered += 1
+                else:
+                    failed += 1
+                    if result.error in INVALID_TOKEN_ERRORS:
+                        invalid.append(result.token)
+
+        pruned = await self._prune(invalid) if prune and invalid else 0
+        elapsed = time.perf_counter() - started
+
+        self._fanouts += 1
+        self._sent += len(tokens)
+        self._delivered += delivered
+        self._failed += failed
+        self._send_seconds += elapsed
+        return {
+            "tokens": len(tokens),
+            "batches": len(batches),
+            "delivered": delivered,
+            "failed": failed,
+            "pruned": pruned,
+            "seconds": round(elapsed, 3),
+        }
+
+    async def _send_batch(self, tokens: List[str], message: Dict[str, Any]) -> List[SendResult]:
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                results = await self.transport.send_multicast(tokens, message)
+            except Exception as e:
+                # A failed request fails the batch, not the fan-out
+                self._batch_failures += 1
+                print(f"[ERROR] Push batch of {len(tokens)} failed: {str(e)}")
+                results = [SendResult(token, False, "BATCH_FAILED") for token in tokens]
+            self._batches += 1
+            self._batch_latencies.append(time.perf_counter() - started)
+            return results
+
+    async def _prune(self, tokens: List[str]) -> int:
+        async with db_manager.writer() as db:
+            cursor = await db.execute(
+                "DELETE FROM device_tokens WHERE token IN (SELECT value FROM json_each(?))",
+                (json.dumps(tokens),)
+            )
+            await db.commit()
+        self._pruned += cursor.rowcount
+        return cursor.rowcount
+
+    async def send_alert(self, alert: Dict[str, Any], user_ids: Set[str]):
+        """Tide scheduler notifier: push a low tide alert to its subscribers' devices"""
+        message = {
+            "notification": {"title": alert["title"], "body": alert["body"]},
+            # FCM data values must be strings
+            "data": {"stationId": alert["stationId"], "tideTime": alert["tideTime"], "type": alert["type"]},
+        }
+        result = await self.send_to_users(user_ids, message)
+        print(
+            f"[INFO] Low tide alert for station {alert['stationId']}: {result['delivered']}/{result['tokens']} "
+            f"device(s) in {result['seconds']}s, {result['pruned']} invalid token(s) pruned"
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._batch_latencies)
+        return {
+            "transport": type(self._transport).__name__ if self._transport is not None else None,
+            "batch_size": self.batch_size,
+            "max_concurrency": self.max_concurrency,
+            "fanouts": self._fanouts,
+            "sent": self._sent,
+            "delivered": self._delivered,
+            "failed": self._failed,
+            "pruned": self._pruned,
+            "batches": self._batches,
+            "batch_failures": self._batch_failures,
+            "tokens_per_second": round(self._sent / self._send_seconds, 1) if self._send_seconds else 0,
+            "batch_p50_ms": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else 0,
+            "batch_p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else 0,
+            "batch_max_ms": round(latencies[-1] * 1000, 2) if latencies else 0,
+        }
+
+    async def close(self):
+        if self._transport is not None:
+            await self._transport.close()
+
+
+# Singleton instance
+push_fanout = PushFanout()
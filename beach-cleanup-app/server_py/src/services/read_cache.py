@@ -0,0 +1,115 @@
+"""
+Read Cache
+TTL read-through cache with stale-while-revalidate. Fresh entries are served
+from memory; expired entries keep being served while a single background
+thread reloads them; invalidated entries are reloaded on the next read.
+"""
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class ReadCache:
+    def __init__(self, ttl_seconds: float):
+        """
+        Args:
+            ttl_seconds: How long a loaded value counts as fresh. 0 disables caching.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._generations: Dict[Hashable, int] = {}
+        self._epoch = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._refresh_failures = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, loading it if needed
+
+        Args:
+            key: Cache key
+            loader: Blocking callable that fetches the value
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        if self.ttl_seconds <= 0:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation(key)
+            if entry is not None:
+                value, loaded_at = entry
+                if time.monotonic() - loaded_at < self.ttl_seconds:
+                    self._hits += 1
+                    return value
+
+                # Expired: serve it and let one background refresh replace it
+                self._stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(
+                        target=self._refresh,
+                        args=(key, loader, generation),
+                        daemon=True
+                    ).start()
+                return value
+
+            self._misses += 1
+
+        value = loader()
+        self._store(key, value, generation)
+        return value
+
+    def _generation(self, key: Hashable) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(key, 0)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], generation: Tuple[int, int]):
+        try:
+            self._store(key, loader(), generation)
+        except Exception as e:
+            self._refresh_failures += 1
+            print(f"[WARNING] Background refresh of {key} failed, serving stale data: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key: Hashable, value: Any, generation: Tuple[int, int]):
+        with self._lock:
+            # A write invalidated the key while this load was in flight; its data may predate the write
+            if self._generation(key) != generation:
+                return
+            self._entries[key] = (value, time.monotonic())
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """
+        Drop a cached value so the next read reloads it
+
+        Args:
+            key: Key to drop, or None to drop everything
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._epoch += 1
+            else:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses
+            return {
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "hit_rate": round((self._hits + self._stale_hits) / lookups, 4) if lookups else 0,
+                "refresh_failures": self._refresh_failures,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,99 @@
+"""
+Sheet Row Index
+In-process mapping from record id (column A) to sheet row number, so single
+cell updates can be addressed directly instead of scanning the whole sheet
+"""
+import re
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Matches the row numbers in an A1 range such as "Posts!A12:I14" or "'My Sheet'!A7"
+_A1_ROWS = re.compile(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?$")
+
+def parse_row_span(a1_range: str) -> Optional[Tuple[int, int]]:
+    """
+    Extract the first and last row numbers from an A1 range
+
+    Args:
+        a1_range: Range string as returned in an append response's updatedRange
+
+    Returns:
+        (first_row, last_row) tuple, or None if the range has no row numbers
+    """
+    match = _A1_ROWS.search(a1_range or '')
+    if not match:
+        return None
+    first = int(match.group(1))
+    last = int(match.group(2)) if match.group(2) else first
+    return first, last
+
+class SheetRowIndex:
+    """Maps record ids to 1-based row numbers for a single sheet"""
+
+    def __init__(self, ttl_seconds: float, miss_interval: float = 10.0):
+        """
+        Args:
+            ttl_seconds: How long a full build is trusted before the next lookup
+                rebuilds it, so rows inserted or deleted by hand in the sheet
+                are picked up
+            miss_interval: Minimum seconds between rebuilds caused by ids that
+                are not in the index, so unknown ids can't force a reread on
+                every lookup
+        """
+        self.ttl_seconds = ttl_seconds
+        self.miss_interval = miss_interval
+        self._rows: Dict[str, int] = {}
+        self._built_at: Optional[float] = None
+        self._miss_rebuild_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        """Whether the index has been built and is still within its TTL"""
+        with self._lock:
+            return self._built_at is not None and time.monotonic() - self._built_at < self.ttl_seconds
+
+    def claim_miss_rebuild(self) -> bool:
+        """Whether a lookup miss may rebuild the index now; at most once per miss_interval"""
+        with self._lock:
+            now = time.monotonic()
+            if self._miss_rebuild_at is not None and now - self._miss_rebuild_at < self.miss_interval:
+                return False
+            self._miss_rebuild_at = now
+            return True
+
+    def get(self, record_id: str) -> Optional[int]:
+        with self._lock:
+            return self._rows.get(record_id)
+
+    def load(self, ids: List[str], first_row: int = 1):
+        """
+        Replace the index with the contents of an id column
+
+        Args:
+            ids: Values of the id column, top to bottom
+            first_row: Sheet row number of ids[0]
+        """
+        rows = {}
+        for offset, record_id in enumerate(ids):
+            if record_id:
+                rows.setdefault(record_id, first_row + offset)
+        with self._lock:
+            self._rows = rows
+            self._built_at = time.monotonic()
+
+    def add(self, record_id: str, row: int):
+        """Record the row of a newly appended record"""
+        if not record_id:
+            return
+        with self._lock:
+            self._rows.setdefault(record_id, row)
+
+    def invalidate(self):
+        """Force the next lookup to rebuild the index"""
+        with self._lock:
+            self._built_at = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
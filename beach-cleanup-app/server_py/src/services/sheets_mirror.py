@@ -0,0 +1,537 @@
+"""
+Sheets Mirror
+Serves posts and events from local SQLite tables that mirror the Google
+Sheets "Posts" and "Events" sheets. Writes commit locally and return at once;
+an outbox replicator pushes them to the sheet in the background, and a pull
+loop brings in edits made directly in the sheet.
+
+Enabled with SHEETS_MIRROR_MODE=true, read when the app starts. Run
+init_database.py first to create the sheet_posts, sheet_events and
+sheet_outbox tables.
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from src.config.database import db_manager
+from src.services.async_sheets_service import AsyncGoogleSheetsService, async_sheets_service
+from src.services.google_sheets_service import PartialAppendError
+from src.services.geo_index import GeoIndex
+from src.services.single_flight import read_flights
+
+POST_COLUMNS = ['id', 'username', 'location', 'date', 'imageUrl', 'caption', 'trashCollected', 'upvotes', 'timestamp']
+EVENT_COLUMNS = [
+    'id', 'title', 'location', 'lat', 'lng', 'date', 'time', 'participants', 'maxParticipants',
+    'description', 'organizer', 'difficulty', 'imageUrl', 'timestamp'
+]
+
+# kind -> (table, columns, counter column)
+TABLES = {
+    'post': ('sheet_posts', POST_COLUMNS, 'upvotes'),
+    'event': ('sheet_events', EVENT_COLUMNS, 'participants'),
+}
+
+def _post_values(post: Dict[str, Any]) -> tuple:
+    return (
+        post.get('id'),
+        post.get('username', ''),
+        post.get('location', ''),
+        post.get('date', ''),
+        post.get('imageUrl', ''),
+        post.get('caption', ''),
+        post.get('trashCollected', ''),
+        int(post.get('upvotes') or 0),
+        post.get('timestamp', ''),
+    )
+
+def _event_values(event: Dict[str, Any]) -> tuple:
+    coordinates = event.get('coordinates') or {}
+    return (
+        event.get('id'),
+        event.get('title', ''),
+        event.get('location', ''),
+        coordinates.get('lat'),
+        coordinates.get('lng'),
+        event.get('date', ''),
+        event.get('time', ''),
+        int(event.get('participants') or 0),
+        int(event.get('maxParticipants') or 0),
+        event.get('description', ''),
+        event.get('organizer', ''),
+        event.get('difficulty', 'Easy'),
+        event.get('imageUrl', ''),
+        event.get('timestamp', ''),
+    )
+
+def _event_from_row(row) -> Dict[str, Any]:
+    event = dict(row)
+    lat = event.pop('lat')
+    lng = event.pop('lng')
+    event['coordinates'] = {'lat': lat, 'lng': lng} if lat is not None and lng is not None else None
+    return event
+
+class SheetsMirror:
+    def __init__(self, sheets: AsyncGoogleSheetsService):
+        """
+        Args:
+            sheets: The async Sheets service used for replication and pulls
+        """
+        self.sheets = sheets
+        self.replicate_interval = float(os.getenv("SHEETS_MIRROR_REPLICATE_INTERVAL", "1"))
+        self.pull_interval = float(os.getenv("SHEETS_MIRROR_PULL_INTERVAL", "60"))
+        self.batch_size = int(os.getenv("SHEETS_MIRROR_BATCH_SIZE", "200"))
+        self._wake = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._sync_lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+
+        # Outbox seq -> monotonic time of its next attempt, for counter writes whose
+        # record was not found in the sheet; retried after each pull interval
+        self._parked: Dict[int, float] = {}
+
+        # Event coordinates for distance ranking; loaded on first use, rebuilt after each pull
+        self.event_geo = GeoIndex()
+        self._geo_loaded = False
+
+        # Metrics
+        self._pending = 0
+        self._replicated = 0
+        self._replication_failures = 0
+        self._unmatched_counters = 0
+        self._last_replication_ms = 0.0
+        self._pulls = 0
+        self._pull_failures = 0
+        self._last_pull_rows = 0
+        self._last_pull_at: Optional[str] = None
+
+    @property
+    def spreadsheet_id(self) -> Optional[str]:
+        return self.sheets.spreadsheet_id
+
+    # ------------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------------
+
+    async def start(self):
+        """Open the Sheets clients and start the replicator and pull loops"""
+        await self.sheets.start()
+
+        async with db_manager.reader() as db:
+            cursor = await db.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('sheet_posts', 'sheet_events', 'sheet_outbox')"
+            )
+            if (await cursor.fetchone())[0] != 3:
+                raise Exception("Sheets mirror tables missing - run python init_database.py")
+
+            cursor = await db.execute("SELECT COUNT(*) FROM sheet_outbox")
+            self._pending = (await cursor.fetchone())[0]
+
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._replicate_loop()),
+            loop.create_task(self._pull_loop()),
+        ]
+        print(f"[INFO] Sheets mirror mode enabled ({self._pending} write(s) pending replication)")
+
+    async def close(self):
+        """Replicate what is left in the outbox, then close the Sheets clients"""
+        self._closing.set()
+        self._wake.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.sheets.close()
+
+    # ------------------------------------------------------------------------
+    # Posts
+    # ------------------------------------------------------------------------
+
+    async def add_post(self, post_data: Dict[str, Any]) -> bool:
+        post_data['id'] = post_data.get('id') or str(uuid.uuid4())
+        async with db_manager.writer() as db:
+            await db.execute(
+                f"INSERT INTO sheet_posts ({', '.join(POST_COLUMNS)}) VALUES ({', '.join('?' * len(POST_COLUMNS))})",
+                _post_values(post_data)
+            )
+            await self._enqueue(db, 'post', 'add', post_data['id'], json.dumps(post_data))
+        return True
+
+    async def update_upvotes(self, post_id: str, upvotes: int) -> bool:
+        async with db_manager.writer() as db:
+            cursor = await db.execute("UPDATE sheet_posts SET upvotes = ? WHERE id = ?", (upvotes, post_id))
+            if cursor.rowcount == 0:
+                raise Exception(f"Post with ID {post_id} not found")
+            await self._enqueue(db, 'post', 'counter', post_id)
+        return True
+
+    async def increment_upvotes(self, post_id: str, delta: int = 1) -> Optional[int]:
+        return await self._increment('post', post_id, delta)
+
+    @read_flights.coalesce()
+    async def get_all_posts(self) -> List[Dict[str, Any]]:
+        async with db_manager.reader() as db:
+            cursor = await db.execute(f"SELECT {', '.join(POST_COLUMNS)} FROM sheet_posts ORDER BY rowid")
+            return [dict(row) for row in await cursor.fetchall()]
+
+    # ------------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------------
+
+    async def add_event(self, event_data: Dict[str, Any]) -> bool:
+        event_data['id'] = event_data.get('id') or str(uuid.uuid4())
+        async with db_manager.writer() as db:
+            await db.execute(
+                f"INSERT INTO sheet_events ({', '.join(EVENT_COLUMNS)}) VALUES ({', '.join('?' * len(EVENT_COLUMNS))})",
+                _event_values(event_data)
+            )
+            await self._enqueue(db, 'event', 'add', event_data['id'], json.dumps(event_data))
+        coordinates = event_data.get('coordinates') or {}
+        if self._geo_loaded and coordinates.get('lat') is not None and coordinates.get('lng') is not None:
+            self.event_geo.add([(event_data['id'], float(coordinates['lat']), float(coordinates['lng']))])
+        return True
+
+    async def update_event_participants(self, event_id: str, participants: int) -> bool:
+        async with db_manager.writer() as db:
+            cursor = await db.execute("UPDATE sheet_events SET participants = ? WHERE id = ?", (participants, event_id))
+            if cursor.rowcount == 0:
+                raise Exception(f"Event with ID {event_id} not found")
+            await self._enqueue(db, 'event', 'counter', event_id)
+        return True
+
+    async def increment_participants(self, event_id: str, delta: int = 1) -> Optional[int]:
+        return await self._increment('event', event_id, delta)
+
+    @read_flights.coalesce()
+    async def get_all_events(self) -> List[Dict[str, Any]]:
+        async with db_manager.reader() as db:
+            cursor = await db.execute(f"SELECT {', '.join(EVENT_COLUMNS)} FROM sheet_events ORDER BY rowid")
+            return [_event_from_row(row) for row in await cursor.fetchall()]
+
+    async def nearest_events(
+        self, lat: float, lng: float, k: int, radius_km: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """The k events closest to (lat, lng), nearest first, with distanceKm set"""
+        return (await self.nearest_events_many([(lat, lng)], k, radius_km))[0]
+
+    async def nearest_events_many(
+        self, points: List[tuple], k: int, radius_km: Optional[float] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Rank events for many (lat, lng) query points in one batched pass"""
+        if not self._geo_loaded:
+            await self._load_event_geo()
+        rankings = self.event_geo.nearest_many(points, k, radius_km)
+
+        # Only the ranked events are read back, so counts are current
+        ids = list({event_id for ranked in rankings for event_id, _ in ranked})
+        async with db_manager.reader() as db:
+            cursor = await db.execute(
+                f"SELECT {', '.join(EVENT_COLUMNS)} FROM sheet_events WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(ids),)
+            )
+            events = {row['id']: _event_from_row(row) for row in await cursor.fetchall()}
+
+        return [
+            [
+                {**events[event_id], 'distanceKm': round(distance, 3)}
+                for event_id, distance in ranked if event_id in events
+            ]
+            for ranked in rankings
+        ]
+
+    async def _load_event_geo(self):
+        async with db_manager.reader() as db:
+            cursor = await db.execute(
+                "SELECT id, lat, lng FROM sheet_events WHERE lat IS NOT NULL AND lng IS NOT NULL ORDER BY rowid"
+            )
+            self.event_geo.rebuild([(row[0], row[1], row[2]) for row in await cursor.fetchall()])
+        self._geo_loaded = True
+
+    # ------------------------------------------------------------------------
+    # Local writes
+    # ------------------------------------------------------------------------
+
+    async def _increment(self, kind: str, record_id: str, delta: int) -> Optional[int]:
+        """Atomically adjust a counter; returns the new value, or None if the record does not exist"""
+        table, _, column = TABLES[kind]
+        async with db_manager.writer() as db:
+            cursor = await db.execute(
+                f"UPDATE {table} SET {column} = MAX(0, {column} + ?) WHERE id = ?",
+                (delta, record_id)
+            )
+            if cursor.rowcount == 0:
+                return None
+            await self._enqueue(db, kind, 'counter', record_id)
+
+            cursor = await db.execute(f"SELECT {column} FROM {table} WHERE id = ?", (record_id,))
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+    async def _enqueue(self, db, kind: str, op: str, record_id: str, payload: Optional[str] = None):
+        """Record a write in the outbox, commit it with the local change, and wake the replicator"""
+        await db.execute(
+            "INSERT INTO sheet_outbox (kind, op, recordId, payload, createdAt) VALUES (?, ?, ?, ?, ?)",
+            (kind, op, record_id, payload, datetime.now().isoformat())
+        )
+        await db.commit()
+        # Later reads must not join a fetch that started before this write
+        read_flights.forget(self.get_all_posts if kind == 'post' else self.get_all_events)
+        self._pending += 1
+        self._wake.set()
+
+    # ------------------------------------------------------------------------
+    # Replication (local -> sheet)
+    # ------------------------------------------------------------------------
+
+    async def _replicate_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.replicate_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                # Drain the outbox batch by batch
+                while await self.replicate_once():
+                    pass
+            except Exception as e:
+                self._replication_failures += 1
+                print(f"[ERROR] Sheets mirror replication failed, will retry: {e}")
+
+            if self._closing.is_set():
+                return
+
+    async def replicate_once(self) -> bool:
+        """
+        Push one batch of outbox entries to the sheet
+
+        Adds are sent as one multi-row append per sheet; counter changes are
+        sent as the current local values in one batchUpdate per sheet.
+        Counter entries whose record is not found in the sheet are kept and
+        parked until the next pull interval instead of being dropped.
+
+        Returns:
+            True if a full batch was replicated and more may be waiting
+        """
+        async with self._sync_lock:
+            started = time.perf_counter()
+            now = time.monotonic()
+            parked = [seq for seq, retry_at in self._parked.items() if retry_at > now]
+            async with db_manager.reader() as db:
+                cursor = await db.execute(
+                    """
+                    SELECT seq, kind, op, recordId, payload FROM sheet_outbox
+                    WHERE seq NOT IN (SELECT value FROM json_each(?))
+                    ORDER BY seq LIMIT ?
+                    """,
+                    (json.dumps(parked), self.batch_size)
+                )
+                entries = await cursor.fetchall()
+            if not entries:
+                if not parked:
+                    self._pending = 0
+                return False
+            replicated = 0
+
+            append_methods = {'post': self.sheets.service.add_posts, 'event': self.sheets.service.add_events}
+            counter_methods = {'post': self.sheets.service.set_upvotes, 'event': self.sheets.service.set_participants}
+
+            # Adds first, so counter writes in the same batch can find their rows
+            for kind, append in append_methods.items():
+                adds = [entry for entry in entries if entry['kind'] == kind and entry['op'] == 'add']
+                if adds:
+                    try:
+                        await self.sheets.run(append, [json.loads(entry['payload']) for entry in adds])
+                    except PartialAppendError as e:
+                        # Rows already in the sheet must not be appended again by the retry
+                        if e.written:
+                            await self._delete_outbox([entry['seq'] for entry in adds[:e.written]])
+                        raise
+                    await self._delete_outbox([entry['seq'] for entry in adds])
+                    replicated += len(adds)
+
+            for kind, write in counter_methods.items():
+                counters = [entry for entry in entries if entry['kind'] == kind and entry['op'] == 'counter']
+                if counters:
+                    table, _, column = TABLES[kind]
+                    ids = list({entry['recordId'] for entry in counters})
+                    async with db_manager.reader() as db:
+                        cursor = await db.execute(
+                            f"SELECT id, {column} FROM {table} WHERE id IN ({', '.join('?' * len(ids))})",
+                            ids
+                        )
+                        values = {row[0]: row[1] for row in await cursor.fetchall()}
+                    written = await self.sheets.run(write, values) if values else {}
+
+                    done = [entry['seq'] for entry in counters if entry['recordId'] in written]
+                    if done:
+                        await self._delete_outbox(done)
+                        replicated += len(done)
+                    unmatched = [entry for entry in counters if entry['recordId'] not in written]
+                    if unmatched:
+                        # Kept for the next attempt; a pull that finds the record gone drops them
+                        self._unmatched_counters += len(unmatched)
+                        for entry in unmatched:
+                            self._parked[entry['seq']] = now + self.pull_interval
+                        missing = sorted({entry['recordId'] for entry in unmatched})
+                        print(f"[WARNING] Keeping {len(unmatched)} {kind} counter write(s) for id(s) not found in the sheet: {', '.join(missing)}")
+
+            self._replicated += replicated
+            self._pending = max(0, self._pending - replicated)
+            self._last_replication_ms = (time.perf_counter() - started) * 1000
+            return len(entries) == self.batch_size
+
+    async def _delete_outbox(self, seqs: List[int]):
+        for seq in seqs:
+            self._parked.pop(seq, None)
+        # Leased per delete so Sheets round trips never hold the writer
+        async with db_manager.writer() as db:
+            await db.execute(
+                f"DELETE FROM sheet_outbox WHERE seq IN ({', '.join('?' * len(seqs))})",
+                seqs
+            )
+            await db.commit()
+
+    # ------------------------------------------------------------------------
+    # Pull (sheet -> local)
+    # ------------------------------------------------------------------------
+
+    async def _pull_loop(self):
+        while not self._closing.is_set():
+            try:
+                await self.pull_once()
+            except Exception as e:
+                self._pull_failures += 1
+                print(f"[ERROR] Sheets mirror pull failed, will retry: {e}")
+
+            try:
+                await asyncio.wait_for(self._closing.wait(), timeout=self.pull_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def pull_once(self):
+        """
+        Bring the local tables in line with the sheets
+
+        Records with writes still waiting in the outbox keep their local
+        version; everything else takes the sheet's version, and rows deleted
+        from the sheet are deleted locally. Deletes rely on the sheet read
+        being complete, so it bypasses the read cache and fails as a whole.
+        Counter writes queued for a record deleted from the sheet are dropped.
+        """
+        # Holding the lock keeps replication from landing between the sheet read and the local upsert
+        async with self._sync_lock:
+            posts = await self.sheets.read_all_posts()
+            events = await self.sheets.read_all_events()
+
+            async with db_manager.writer() as db:
+                rows = 0
+                for kind, records, to_values in (('post', posts, _post_values), ('event', events, _event_values)):
+                    table, columns, _ = TABLES[kind]
+                    values = [to_values(record) for record in records if record.get('id')]
+                    updates = ', '.join(f"{column} = excluded.{column}" for column in columns[1:])
+                    pending_ids = f"SELECT recordId FROM sheet_outbox WHERE kind = '{kind}'"
+                    sheet_ids = json.dumps([value[0] for value in values])
+
+                    await db.executemany(
+                        f"""
+                        INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})
+                        ON CONFLICT(id) DO UPDATE SET {updates}
+                        WHERE {table}.id NOT IN ({pending_ids})
+                        """,
+                        values
+                    )
+                    cursor = await db.execute(
+                        f"""
+                        SELECT seq, recordId FROM sheet_outbox
+                        WHERE kind = '{kind}' AND op = 'counter'
+                        AND recordId NOT IN (SELECT value FROM json_each(?))
+                        AND recordId NOT IN ({pending_ids} AND op = 'add')
+                        """,
+                        (sheet_ids,)
+                    )
+                    dropped = await cursor.fetchall()
+                    if dropped:
+                        seqs = [row[0] for row in dropped]
+                        await db.execute(
+                            f"DELETE FROM sheet_outbox WHERE seq IN ({', '.join('?' * len(seqs))})",
+                            seqs
+                        )
+                        for seq in seqs:
+                            self._parked.pop(seq, None)
+                        self._pending = max(0, self._pending - len(dropped))
+                        missing = sorted({row[1] for row in dropped})
+                        print(f"[WARNING] Dropping {len(dropped)} {kind} counter write(s) for id(s) deleted from the sheet: {', '.join(missing)}")
+                    await db.execute(
+                        f"""
+                        DELETE FROM {table}
+                        WHERE id NOT IN (SELECT value FROM json_each(?))
+                        AND id NOT IN ({pending_ids})
+                        """,
+                        (sheet_ids,)
+                    )
+                    rows += len(values)
+                await db.commit()
+
+            if self._geo_loaded:
+                await self._load_event_geo()
+
+            self._pulls += 1
+            self._last_pull_rows = rows
+            self._last_pull_at = datetime.now().isoformat()
+
+    # ------------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics = self.sheets.metrics()
+        metrics["mirror"] = {
+            "pending_writes": self._pending,
+            "replicated_writes": self._replicated,
+            "replication_failures": self._replication_failures,
+            "unmatched_counter_writes": self._unmatched_counters,
+            "parked_counter_writes": len(self._parked),
+            "last_replication_ms": round(self._last_replication_ms, 2),
+            "pulls": self._pulls,
+            "pull_failures": self._pull_failures,
+            "last_pull_rows": self._last_pull_rows,
+            "last_pull_at": self._last_pull_at,
+        }
+        metrics["event_geo_points"] = len(self.event_geo)
+        return metrics
+
+
+class SheetsStore:
+    """
+    The posts and events store the routes use: the local mirror when
+    SHEETS_MIRROR_MODE is enabled, otherwise Sheets directly. The mode is
+    read in start(), so it follows the settings loaded at startup rather
+    than the environment at import time.
+    """
+
+    def __init__(self, sheets: AsyncGoogleSheetsService):
+        self.sheets = sheets
+        self._backend = None
+
+    async def start(self):
+        mirror_mode = os.getenv("SHEETS_MIRROR_MODE", "false").lower() == "true"
+        self._backend = SheetsMirror(self.sheets) if mirror_mode else self.sheets
+        await self._backend.start()
+
+    async def close(self):
+        if self._backend is not None:
+            await self._backend.close()
+
+    def __getattr__(self, name: str):
+        backend = self.__dict__.get('_backend')
+        if backend is None:
+            raise RuntimeError(f"Sheets store used before start() (accessing {name})")
+        return getattr(backend, name)
+
+
+# Singleton instance
+sheets_store = SheetsStore(async_sheets_service)
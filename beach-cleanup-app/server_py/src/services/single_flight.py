@@ -0,0 +1,127 @@
+"""
+Single Flight
+Coalesces concurrent identical reads. The first caller for a key starts the
+fetch; callers arriving while it is in flight await the same task and get
+its result (or its exception) instead of starting their own. Nothing is kept
+once the fetch finishes, so this never serves stale data: it only collapses
+the burst of identical reads that arrive together, e.g. every client loading
+/api/events/all when the app opens.
+
+Each finished fetch records how many calls it absorbed, per function and in
+a window of recent fetches, for /metrics.
+"""
+import time
+import asyncio
+import functools
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class _Flight:
+    __slots__ = ("task", "label", "absorbed", "started")
+
+    def __init__(self, task: asyncio.Task, label: str):
+        self.task = task
+        self.label = label
+        self.absorbed = 0
+        self.started = time.perf_counter()
+
+class SingleFlight:
+    def __init__(self, recent: int = 50):
+        """
+        Args:
+            recent: Number of finished fetches kept for metrics
+        """
+        self._flights: Dict[Hashable, _Flight] = {}
+
+        # Metrics: label -> [fetches, absorbed calls, most absorbed by one fetch]
+        self._stats: Dict[str, list] = {}
+        self._recent = deque(maxlen=recent)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], label: Optional[str] = None) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Identifies identical calls (function and arguments)
+            fn: Zero-argument coroutine function performing the fetch
+            label: Name the fetch is reported under (default: str(key))
+
+        Returns:
+            The result of the in-flight fetch for key
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(fn()), label or str(key))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+        else:
+            flight.absorbed += 1
+        # Shielded so one caller disconnecting doesn't cancel the fetch the others wait on
+        return await asyncio.shield(flight.task)
+
+    def _finish(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        stats = self._stats.setdefault(flight.label, [0, 0, 0])
+        stats[0] += 1
+        stats[1] += flight.absorbed
+        stats[2] = max(stats[2], flight.absorbed)
+        self._recent.append({
+            "key": flight.label,
+            "absorbed": flight.absorbed,
+            "ms": round((time.perf_counter() - flight.started) * 1000, 2),
+            "failed": not flight.task.cancelled() and flight.task.exception() is not None,
+        })
+
+    def forget(self, fn: Callable):
+        """
+        Detach in-flight fetches of fn, so later callers start a fresh one
+
+        Called after a write, so a client never joins a read that began
+        before its own write. Callers already waiting keep their fetch.
+        """
+        label = fn.__qualname__
+        for key in [key for key, flight in self._flights.items() if flight.label == label]:
+            del self._flights[key]
+
+    def coalesce(self, label: Optional[str] = None):
+        """
+        Decorator for async functions and methods: concurrent calls with equal
+        arguments share one call. Calls with unhashable arguments run normally.
+
+        Args:
+            label: Name reported in metrics (default: the function's qualified name)
+        """
+        def decorator(fn: Callable[..., Awaitable[Any]]):
+            name = label or fn.__qualname__
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                key = (name, args, tuple(sorted(kwargs.items())))
+                try:
+                    hash(key)
+                except TypeError:
+                    return await fn(*args, **kwargs)
+                return await self.do(key, lambda: fn(*args, **kwargs), name)
+            return wrapper
+        return decorator
+
+    def metrics(self) -> Dict[str, Any]:
+        fetches = sum(stats[0] for stats in self._stats.values())
+        absorbed = sum(stats[1] for stats in self._stats.values())
+        return {
+            "in_flight": len(self._flights),
+            "fetches": fetches,
+            "absorbed_calls": absorbed,
+            # Share of calls that were served by another caller's fetch
+            "absorbed_rate": round(absorbed / (fetches + absorbed), 3) if fetches + absorbed else 0,
+            "by_function": {
+                label: {"fetches": stats[0], "absorbed_calls": stats[1], "max_absorbed": stats[2]}
+                for label, stats in sorted(self._stats.items())
+            },
+            "recent": list(self._recent),
+        }
+
+
+# Singleton instance
+read_flights = SingleFlight()
@@ -0,0 +1,265 @@
+"""
+Spatial Index
+Bounding-box and nearest-neighbour queries over point tables backed by the
+SQLite R*Tree indexes created in init_database.py. The R*Tree narrows the
+search to a small box of candidates; exact coordinates and great-circle
+distances are then checked in SQL and Python on that candidate set only.
+"""
+import heapq
+import math
+from contextlib import aclosing
+from typing import Any, Dict, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    d_lat = math.radians(lat2 - lat1)
+    d_lon = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_lat / 2) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(d_lon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+def radius_boxes(lat: float, lon: float, radius_km: float) -> List[Tuple[float, float, float, float]]:
+    """
+    Bounding boxes (min_lat, min_lon, max_lat, max_lon) covering a circle
+
+    Returns two boxes when the circle crosses the antimeridian, and a full
+    band of longitudes when it reaches a pole.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    d_lat = math.degrees(angular)
+    min_lat, max_lat = max(-90.0, lat - d_lat), min(90.0, lat + d_lat)
+
+    # Widest longitude span of the circle (wider than d_lat / cos(lat) away from the equator)
+    cos_lat = math.cos(math.radians(lat))
+    if min_lat <= -90 or max_lat >= 90 or math.sin(angular) >= cos_lat:
+        return [(min_lat, -180.0, max_lat, 180.0)]
+
+    d_lon = math.degrees(math.asin(math.sin(angular) / cos_lat))
+
+    min_lon, max_lon = lon - d_lon, lon + d_lon
+    if min_lon < -180:
+        return [(min_lat, min_lon + 360, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon - 360)]
+    return [(min_lat, min_lon, max_lat, max_lon)]
+
+class SpatialIndex:
+    # Rings narrower than this are read whole, however many rows they hold
+    MIN_RING_KM = 0.001
+
+    def __init__(
+        self, table: str, rtree: str, columns: List[str],
+        initial_radius_km: float = 5.0, max_pass_rows: int = 5000
+    ):
+        """
+        Args:
+            table: Point table with lat and lon columns
+            rtree: R*Tree table indexing table's rows by spatialId
+            columns: Columns returned for each point
+            initial_radius_km: First search radius for nearest(); doubled until enough points are found
+            max_pass_rows: Most rows one nearest() pass reads before it retries a narrower ring
+        """
+        self.table = table
+        self.rtree = rtree
+        self.columns = columns
+        self.initial_radius_km = initial_radius_km
+        self.max_pass_rows = max_pass_rows
+        select = ', '.join(f"t.{column}" for column in columns)
+        self._select = select
+        # The R*Tree stores 32-bit floats rounded outward, so its box is a superset;
+        # the t.lat/t.lon conditions make the match exact
+        self._bbox_query = f"""
+            SELECT {select} FROM {rtree} r
+            JOIN {table} t ON t.spatialId = r.id
+            WHERE r.maxLat >= :min_lat AND r.minLat <= :max_lat
+              AND r.maxLon >= :min_lon AND r.minLon <= :max_lon
+              AND t.lat BETWEEN :min_lat AND :max_lat
+              AND t.lon BETWEEN :min_lon AND :max_lon
+            LIMIT :limit
+        """
+
+    async def within_bbox(
+        self, db, min_lat: float, min_lon: float, max_lat: float, max_lon: float, limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Points inside a bounding box
+
+        A box with min_lon > max_lon is taken to cross the antimeridian.
+        """
+        if min_lon > max_lon:
+            boxes = [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+        else:
+            boxes = [(min_lat, min_lon, max_lat, max_lon)]
+
+        points = []
+        for box in boxes:
+            points.extend(await self._query_box(db, box, limit - len(points)))
+            if len(points) >= limit:
+                break
+        return points
+
+    async def nearest(self, db, lat: float, lon: float, k: int, radius_km: float) -> List[Dict[str, Any]]:
+        """
+        The k points closest to (lat, lon) within radius_km, nearest first
+
+        Searches outward ring by ring: each pass reads only the part of its
+        box outside the boxes already read, and the k nearest points read so
+        far are kept in a bounded heap. The search radius doubles until the
+        heap holds k points no farther than the covered radius (or radius_km
+        is reached). Any unread point is outside the covered radius, so
+        farther than all k, and the result is exact.
+
+        A pass that would read more than max_pass_rows rows is abandoned and
+        retried over a ring half as wide, so dense areas are searched in
+        small steps rather than loaded whole.
+        """
+        best = []  # Max-heap of (-distance, seq, point): the k nearest read so far
+        seq = 0
+        covered_km = 0.0
+        step_km = min(self.initial_radius_km, radius_km)
+        while True:
+            outer_km = min(covered_km + step_km, radius_km)
+            cap = None if step_km <= self.MIN_RING_KM else self.max_pass_rows
+            farthest = -best[0][0] if len(best) == k else radius_km
+            ring = await self._read_ring(db, lat, lon, covered_km, outer_km, farthest, cap)
+            if ring is None:
+                step_km /= 2
+                continue
+
+            for distance, point in ring:
+                seq += 1
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, seq, point))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, seq, point))
+            covered_km = outer_km
+
+            if (len(best) == k and -best[0][0] <= covered_km) or covered_km >= radius_km:
+                nearest = []
+                for neg_distance, _, point in sorted(best, reverse=True):
+                    point["distanceKm"] = round(-neg_distance, 3)
+                    nearest.append(point)
+                return nearest
+            step_km = covered_km
+
+    async def _read_ring(
+        self, db, lat: float, lon: float, inner_km: float, outer_km: float,
+        farthest: float, cap: Optional[int]
+    ) -> Optional[List[Tuple[float, Dict[str, Any]]]]:
+        """
+        (distance, point) for the points in outer_km's boxes but not inner_km's,
+        keeping only those no farther than farthest
+
+        Returns None if more than cap rows had to be read.
+        """
+        exclude = radius_boxes(lat, lon, inner_km) if inner_km > 0 else []
+        ring = []
+        read = 0
+        for box in radius_boxes(lat, lon, outer_km):
+            async with aclosing(self._stream_box(db, box, exclude=exclude)) as candidates:
+                async for point in candidates:
+                    read += 1
+                    if cap is not None and read > cap:
+                        return None
+                    distance = haversine_km(lat, lon, point["lat"], point["lon"])
+                    if distance <= farthest:
+                        ring.append((distance, point))
+        return ring
+
+    async def within_radius(
+        self, db, lat: float, lon: float, radius_km: float,
+        limit: Optional[int] = None, order_by: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Points within radius_km of (lat, lon), with distanceKm set
+
+        Args:
+            limit: Most points returned; all of them if None
+            order_by: Column to rank by, highest first. Each box is then read in
+                that order and scanning stops once it holds limit points.
+        """
+        def within(point: Dict[str, Any]) -> bool:
+            distance = haversine_km(lat, lon, point["lat"], point["lon"])
+            point["distanceKm"] = round(distance, 3)
+            return distance <= radius_km
+
+        points = []
+        for box in radius_boxes(lat, lon, radius_km):
+            if order_by is None:
+                points.extend(point for point in await self._query_box(db, box, None) if within(point))
+                continue
+            found = 0
+            async with aclosing(self._stream_box(db, box, order_by=order_by)) as candidates:
+                async for point in candidates:
+                    if within(point):
+                        points.append(point)
+                        found += 1
+                        if limit is not None and found >= limit:
+                            break
+
+        if order_by is not None:
+            points.sort(key=lambda point: point[order_by], reverse=True)
+        return points if limit is None else points[:limit]
+
+    async def _query_box(self, db, box: Tuple[float, float, float, float], limit) -> List[Dict[str, Any]]:
+        min_lat, min_lon, max_lat, max_lon = box
+        cursor = await db.execute(self._bbox_query, {
+            "min_lat": min_lat, "min_lon": min_lon, "max_lat": max_lat, "max_lon": max_lon,
+            "limit": -1 if limit is None else limit,
+        })
+        return [dict(row) for row in await cursor.fetchall()]
+
+    async def _stream_box(
+        self, db, box: Tuple[float, float, float, float],
+        order_by: Optional[str] = None, exclude: Optional[List[Tuple[float, float, float, float]]] = None
+    ):
+        """
+        Stream the points in a box
+
+        Args:
+            order_by: Column to stream by, highest first; R*Tree order if None
+            exclude: Boxes whose points are skipped
+        """
+        if order_by is not None and order_by not in self.columns:
+            raise ValueError(f"Unknown column {order_by}")
+        min_lat, min_lon, max_lat, max_lon = box
+        params = {"min_lat": min_lat, "min_lon": min_lon, "max_lat": max_lat, "max_lon": max_lon}
+        conditions = []
+        for i, (ex_min_lat, ex_min_lon, ex_max_lat, ex_max_lon) in enumerate(exclude or []):
+            conditions.append(
+                f"AND NOT (t.lat BETWEEN :ex{i}_min_lat AND :ex{i}_max_lat"
+                f" AND t.lon BETWEEN :ex{i}_min_lon AND :ex{i}_max_lon)"
+            )
+            params.update({
+                f"ex{i}_min_lat": ex_min_lat, f"ex{i}_min_lon": ex_min_lon,
+                f"ex{i}_max_lat": ex_max_lat, f"ex{i}_max_lon": ex_max_lon,
+            })
+        cursor = await db.execute(f"""
+            SELECT {self._select} FROM {self.rtree} r
+            JOIN {self.table} t ON t.spatialId = r.id
+            WHERE r.maxLat >= :min_lat AND r.minLat <= :max_lat
+              AND r.maxLon >= :min_lon AND r.minLon <= :max_lon
+              AND t.lat BETWEEN :min_lat AND :max_lat
+              AND t.lon BETWEEN :min_lon AND :max_lon
+              {" ".join(conditions)}
+            {f"ORDER BY t.{order_by} DESC" if order_by else ""}
+        """, params)
+        try:
+            async for row in cursor:
+                yield dict(row)
+        finally:
+            await cursor.close()
+
+
+hotspot_index = SpatialIndex(
+    "debris_hotspots", "debris_hotspots_rtree",
+    ["id", "location", "debrisScore", "lat", "lon", "description", "createdAt"]
+)
+event_index = SpatialIndex(
+    "events", "events_rtree",
+    ["id", "eventName", "description", "date", "lat", "lon", "address", "organizerId", "attendeeCount", "createdAt"]
+)
@@ -0,0 +1,236 @@
+"""
+Tide Predictions
+High/low tide predictions per station and day, cached in memory and on disk.
+
+Predictions for a station-day are astronomical and don't change, so a
+fetched day is kept indefinitely: in an in-memory LRU of
+TIDES_CACHE_MEMORY_ENTRIES days, backed by one JSON file per station-day
+under TIDES_CACHE_DIR that survives restarts. Concurrent misses for the same
+station-day share a single upstream fetch.
+
+An empty result usually means the upstream had nothing for that day yet
+(or the station is wrong), so it is never written to disk and is only
+kept in memory for TIDES_EMPTY_TTL seconds.
+
+The upstream is pluggable (TIDES_UPSTREAM):
+- "noaa": NOAA Tides & Currents datagetter API (NOAA_API_BASE_URL)
+- "fixture": a local file in the format of LowTides/mock_tides.json
+  (TIDES_FIXTURE_PATH), for development and tests
+"""
+import os
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+SERVER_ROOT = Path(__file__).parent.parent.parent
+
+class TideUpstreamError(Exception):
+    """The upstream could not provide predictions"""
+
+class NOAAUpstream:
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or os.getenv(
+            "NOAA_API_BASE_URL", "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def fetch(self, station: str, date: str) -> List[Dict[str, Any]]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0)
+        day = date.replace('-', '')
+        try:
+            response = await self._client.get(self.base_url, params={
+                "product": "predictions",
+                "application": "beach_cleanup_app",
+                "begin_date": day,
+                "end_date": day,
+                "datum": "MLLW",
+                "station": station,
+                "time_zone": "lst_ldt",
+                "units": "english",
+                "interval": "hilo",
+                "format": "json",
+            })
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise TideUpstreamError(f"NOAA request failed: {str(e)}")
+
+        if "predictions" not in data:
+            raise TideUpstreamError(data.get("error", {}).get("message", "No tide data available"))
+        return [
+            {"type": "Low" if p["type"] == "L" else "High", "time": p["t"], "height": float(p["v"])}
+            for p in data["predictions"]
+        ]
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+
+class FixtureUpstream:
+    def __init__(self, path: Optional[str] = None):
+        self.path = SERVER_ROOT / (path or os.getenv("TIDES_FIXTURE_PATH", "../LowTides/mock_tides.json"))
+
+    async def fetch(self, station: str, date: str) -> List[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            raise TideUpstreamError(f"Could not read tide fixture {self.path}: {str(e)}")
+
+        for entry in document if isinstance(document, list) else [document]:
+            if str(entry.get("station_id")) == station:
+                return [
+                    {"type": p["type"], "time": p["time"], "height": p.get("height")}
+                    for p in entry.get("predictions", []) if p.get("time", "")[:10] == date
+                ]
+        raise TideUpstreamError(f"Station {station} not in tide fixture")
+
+    async def close(self):
+        pass
+
+def create_upstream(name: Optional[str] = None):
+    name = (name or os.getenv("TIDES_UPSTREAM", "noaa")).lower()
+    if name == "noaa":
+        return NOAAUpstream()
+    if name == "fixture":
+        return FixtureUpstream()
+    raise Exception(f"Unknown TIDES_UPSTREAM '{name}' (expected noaa or fixture)")
+
+class TidePredictionCache:
+    def __init__(
+        self,
+        upstream=None,
+        cache_dir: Optional[str] = None,
+        memory_entries: Optional[int] = None,
+        empty_ttl: Optional[float] = None
+    ):
+        """
+        Args:
+            upstream: Object with async fetch(station, date) and close().
+                Defaults to TIDES_UPSTREAM, created on first use.
+            cache_dir: On-disk cache directory, relative to server_py
+                (TIDES_CACHE_DIR, default cache/tides)
+            memory_entries: Station-days kept in memory (TIDES_CACHE_MEMORY_ENTRIES, default 2048)
+            empty_ttl: Seconds an empty result is kept before refetching (TIDES_EMPTY_TTL, default 300)
+        """
+        self._upstream = upstream
+        self.cache_dir = SERVER_ROOT / (cache_dir or os.getenv("TIDES_CACHE_DIR", "cache/tides"))
+        self.memory_entries = memory_entries or int(os.getenv("TIDES_CACHE_MEMORY_ENTRIES", "2048"))
+        self.empty_ttl = empty_ttl if empty_ttl is not None else float(os.getenv("TIDES_EMPTY_TTL", "300"))
+        # (station, date) -> (predictions, monotonic expiry or None to keep)
+        self._memory: OrderedDict = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+        # Metrics
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._fetches = 0
+        self._coalesced = 0
+        self._errors = 0
+
+    @property
+    def upstream(self):
+        if self._upstream is None:
+            self._upstream = create_upstream()
+        return self._upstream
+
+    async def get(self, station: str, date: str) -> List[Dict[str, Any]]:
+        """
+        Predictions for one station and day (YYYY-MM-DD)
+
+        Raises:
+            TideUpstreamError: If the day isn't cached and the upstream fails
+        """
+        key = (station, date)
+        entry = self._memory.get(key)
+        if entry is not None:
+            predictions, expires = entry
+            if expires is None or time.monotonic() < expires:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return predictions
+            del self._memory[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self._coalesced += 1
+        # Shielded so one caller disconnecting doesn't cancel the fetch the others wait on
+        return await asyncio.shield(task)
+
+    def _path(self, station: str, date: str) -> Path:
+        return self.cache_dir / station / f"{date}.json"
+
+    async def _load(self, key: Tuple[str, str]) -> List[Dict[str, Any]]:
+        path = self._path(*key)
+        predictions = await asyncio.to_thread(self._read_file, path)
+        # Empty files written before empty results stopped being persisted count as misses
+        if predictions:
+            self._disk_hits += 1
+        else:
+            self._fetches += 1
+            try:
+                predictions = await self.upstream.fetch(*key)
+            except TideUpstreamError:
+                self._errors += 1
+                raise
+            if predictions:
+                await asyncio.to_thread(self._write_file, path, predictions)
+
+        self._memory[key] = (predictions, None if predictions else time.monotonic() + self.empty_ttl)
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+        return predictions
+
+    @staticmethod
+    def _read_file(path: Path) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Ignoring unreadable tide cache file {path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _write_file(path: Path, predictions: List[Dict[str, Any]]):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so a crash never leaves a half-written day behind
+            temp = path.with_suffix(".tmp")
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(predictions, f)
+            os.replace(temp, path)
+        except OSError as e:
+            print(f"[WARNING] Could not write tide cache file {path}: {str(e)}")
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self._memory_hits + self._disk_hits + self._fetches + self._coalesced
+        return {
+            "upstream": type(self._upstream).__name__ if self._upstream is not None else None,
+            "memory_entries": len(self._memory),
+            "memory_hits": self._memory_hits,
+            "disk_hits": self._disk_hits,
+            "upstream_fetches": self._fetches,
+            "coalesced": self._coalesced,
+            "upstream_errors": self._errors,
+            "hit_rate": round((lookups - self._fetches) / lookups, 3) if lookups else 0,
+        }
+
+    async def close(self):
+        if self._upstream is not None:
+            await self._upstream.close()
+
+
+# Singleton instance
+tide_predictions = TidePredictionCache()
@@ -0,0 +1,361 @@
+"""
+Tide Alert Scheduler
+Sends low-tide alerts to the users subscribed to each tide station.
+
+Every upcoming low tide across all stations is kept in one heap ordered by
+the time its alert is due (TIDE_ALERT_LEAD_MINUTES before the tide). The
+scheduler task sleeps until the head of the heap is due, or until new
+predictions arrive, and never scans the prediction lists. Subscribers are
+indexed by station, so a due alert costs one dictionary lookup and stations
+without subscribers cost nothing beyond their heap entries.
+
+Predictions are read from TIDE_PREDICTIONS_PATH: a JSON file or a directory
+of JSON files in the NOAA-style format of LowTides/mock_tides.json, each
+holding one station ({"station_id", "timezone", "predictions": [{"type",
+"time"}]}) or a list of them. They are reread every
+TIDE_PREDICTIONS_RELOAD_MINUTES and whenever a station gets its first
+subscriber, so refreshed files and newly added stations are picked up
+without a restart. A reload replaces each station's pending alerts: every
+station has a generation number, bumped when its predictions are replaced,
+and heap entries from an older generation are skipped when popped, so moved
+or dropped tides are never alerted on. Tides already alerted on are
+remembered until they pass and are not alerted on again.
+
+Alert times are shown in the station's timezone: its optional IANA
+"timezone", else the offset in the prediction time, else
+TIDE_DEFAULT_TIMEZONE.
+"""
+import os
+import json
+import heapq
+import asyncio
+import time
+from datetime import datetime, timezone, tzinfo
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from src.config.database import db_manager
+
+SERVER_ROOT = Path(__file__).parent.parent.parent
+
+# Called with the alert and the ids of the users subscribed to its station
+Notifier = Callable[[Dict[str, Any], Set[str]], Awaitable[None]]
+
+def _parse_time(value: str) -> float:
+    """Epoch seconds for an ISO timestamp (UTC when no offset is given)"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def _zone(name: str) -> Optional[tzinfo]:
+    """The tzinfo for an IANA timezone name, or None if it is unknown"""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        print(f"[WARNING] Unknown timezone {name!r}")
+        return None
+
+def load_prediction_files(path: Path) -> List[Dict[str, Any]]:
+    """Station prediction documents from a JSON file or every JSON file in a directory"""
+    files = sorted(path.glob('*.json')) if path.is_dir() else [path]
+    stations = []
+    for file in files:
+        with open(file, encoding='utf-8') as f:
+            document = json.load(f)
+        for station in document if isinstance(document, list) else [document]:
+            if isinstance(station, dict) and station.get('station_id') and isinstance(station.get('predictions'), list):
+                stations.append(station)
+    return stations
+
+async def log_notifier(alert: Dict[str, Any], user_ids: Set[str]):
+    """Default notifier: log the alert"""
+    print(f"[INFO] Low tide alert for station {alert['stationId']} at {alert['tideTime']}: {len(user_ids)} subscriber(s)")
+
+class TideAlertScheduler:
+    def __init__(
+        self,
+        lead_minutes: Optional[float] = None,
+        predictions_path: Optional[str] = None,
+        reload_minutes: Optional[float] = None
+    ):
+        """
+        Args:
+            lead_minutes: How long before a low tide its alert is sent
+                (TIDE_ALERT_LEAD_MINUTES, default 60)
+            predictions_path: Prediction file or directory, relative to server_py
+                (TIDE_PREDICTIONS_PATH, default ../LowTides/mock_tides.json)
+            reload_minutes: How often the predictions are reread
+                (TIDE_PREDICTIONS_RELOAD_MINUTES, default 60)
+        """
+        self.lead_seconds = (lead_minutes or float(os.getenv("TIDE_ALERT_LEAD_MINUTES", "60"))) * 60
+        self.predictions_path = SERVER_ROOT / (
+            predictions_path or os.getenv("TIDE_PREDICTIONS_PATH", "../LowTides/mock_tides.json")
+        )
+        self.reload_seconds = (reload_minutes or float(os.getenv("TIDE_PREDICTIONS_RELOAD_MINUTES", "60"))) * 60
+        self.default_zone = _zone(os.getenv("TIDE_DEFAULT_TIMEZONE", "UTC")) or timezone.utc
+
+        # (due_at, tide_at, station_id, tide_time, generation) for every low tide still
+        # to alert on, plus stale entries from generations since replaced
+        self._heap: List[Tuple[float, float, str, str, int]] = []
+        # station_id -> current generation, and how many of its heap entries are current
+        self._generations: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._stale = 0
+        # (station_id, tide_at) for every tide alerted on, kept until the tide
+        # has passed so a reload never schedules it again
+        self._alerted: Set[Tuple[str, float]] = set()
+        self._zones: Dict[str, tzinfo] = {}
+        self._subscribers: Dict[str, Set[str]] = {}
+        self._notifier: Notifier = log_notifier
+        self._wakeup = asyncio.Event()
+        self._reload = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._reload_task: Optional[asyncio.Task] = None
+        self._sends: Set[asyncio.Task] = set()
+
+        # Metrics
+        self._stations: Set[str] = set()
+        self._alerts_due = 0
+        self._alerts_sent = 0
+        self._alerts_without_subscribers = 0
+        self._notify_failures = 0
+        self._max_lateness = 0.0
+        self._reloads = 0
+
+    def set_notifier(self, notifier: Notifier):
+        """Replace how alerts are delivered (the default only logs them)"""
+        self._notifier = notifier
+
+    # ------------------------------------------------------------------------
+    # Predictions
+    # ------------------------------------------------------------------------
+
+    def add_predictions(
+        self, station_id: str, predictions: Iterable[Dict[str, Any]], timezone_name: Optional[str] = None
+    ) -> int:
+        """
+        Replace a station's pending alerts with alerts for its upcoming low tides
+
+        Alerts scheduled from earlier predictions are dropped, so a tide that
+        moved or disappeared is only alerted on as the new list says. Tides
+        already alerted on are not scheduled again.
+
+        Args:
+            station_id: Tide station id
+            predictions: Prediction dicts with "type" and "time"
+            timezone_name: IANA timezone the station's alert times are shown in
+
+        Returns:
+            Number of alerts scheduled
+        """
+        if timezone_name:
+            zone = _zone(timezone_name)
+            if zone is not None:
+                self._zones[station_id] = zone
+
+        generation = self._generations.get(station_id, 0) + 1
+        self._generations[station_id] = generation
+        self._stale += self._pending.get(station_id, 0)
+
+        now = time.time()
+        tides = set()
+        for prediction in predictions:
+            if prediction.get('type') != 'Low' or not prediction.get('time'):
+                continue
+            try:
+                tide_at = _parse_time(prediction['time'])
+            except ValueError:
+                print(f"[WARNING] Skipping tide prediction with invalid time for station {station_id}: {prediction['time']}")
+                continue
+            if tide_at <= now or tide_at in tides or (station_id, tide_at) in self._alerted:
+                continue
+            tides.add(tide_at)
+            # A tide already inside the lead window is alerted on straight away
+            heapq.heappush(
+                self._heap,
+                (max(tide_at - self.lead_seconds, now), tide_at, station_id, prediction['time'], generation)
+            )
+
+        self._pending[station_id] = len(tides)
+        self._stations.add(station_id)
+        self._compact()
+        # The head of the heap may have changed even if nothing was added
+        self._wakeup.set()
+        return len(tides)
+
+    def _compact(self):
+        """Drop stale entries from the head of the heap, and from all of it once they outnumber the current ones"""
+        if self._stale > len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if entry[4] == self._generations[entry[2]]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+        while self._heap and self._heap[0][4] != self._generations[self._heap[0][2]]:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    async def _load_predictions(self):
+        if not self.predictions_path.exists():
+            print(f"[WARNING] Tide predictions not found at {self.predictions_path}; no alerts scheduled")
+            return
+        try:
+            stations = await asyncio.to_thread(load_prediction_files, self.predictions_path)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not load tide predictions from {self.predictions_path}: {str(e)}")
+            return
+        # Forget alerted tides that have passed
+        now = time.time()
+        self._alerted = {key for key in self._alerted if key[1] > now}
+        scheduled = sum(
+            self.add_predictions(str(s['station_id']), s['predictions'], s.get('timezone'))
+            for s in stations
+        )
+        # Stations no longer in the predictions keep no pending alerts
+        loaded = {str(s['station_id']) for s in stations}
+        for station_id in [station_id for station_id, pending in self._pending.items() if pending and station_id not in loaded]:
+            self.add_predictions(station_id, [])
+        print(f"[SUCCESS] Scheduled {scheduled} low tide alert(s) across {len(stations)} station(s)")
+
+    async def _reload_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._reload.wait(), timeout=self.reload_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._reload.clear()
+            await self._load_predictions()
+            self._reloads += 1
+
+    # ------------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------------
+
+    async def _load_subscribers(self):
+        try:
+            async with db_manager.reader() as db:
+                cursor = await db.execute("SELECT stationId, userId FROM tide_subscriptions")
+                rows = await cursor.fetchall()
+        except Exception as e:
+            print(f"[WARNING] Could not load tide subscriptions (run init_database.py?): {str(e)}")
+            return
+        for row in rows:
+            self._subscribers.setdefault(row['stationId'], set()).add(row['userId'])
+
+    def subscribe(self, station_id: str, user_id: str):
+        if station_id not in self._subscribers:
+            # A station's first subscriber rereads the predictions, in case it was added since the last load
+            self._reload.set()
+        self._subscribers.setdefault(station_id, set()).add(user_id)
+
+    def unsubscribe(self, station_id: str, user_id: str):
+        subscribers = self._subscribers.get(station_id)
+        if subscribers is not None:
+            subscribers.discard(user_id)
+            if not subscribers:
+                del self._subscribers[station_id]
+
+    # ------------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------------
+
+    async def start(self):
+        """Load subscriptions and predictions and start the scheduler and reload tasks"""
+        await self._load_subscribers()
+        await self._load_predictions()
+        self._task = asyncio.create_task(self._run())
+        self._reload_task = asyncio.create_task(self._reload_loop())
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                # New predictions may move the head of the heap earlier
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                due_at, tide_at, station_id, tide_time, generation = heapq.heappop(self._heap)
+                if generation != self._generations[station_id]:
+                    self._stale -= 1
+                    continue
+                self._pending[station_id] -= 1
+                self._alerted.add((station_id, tide_at))
+                self._alerts_due += 1
+                self._max_lateness = max(self._max_lateness, now - due_at)
+
+                subscribers = self._subscribers.get(station_id)
+                if not subscribers:
+                    self._alerts_without_subscribers += 1
+                    continue
+                send = asyncio.create_task(self._send(self._alert(station_id, tide_time, tide_at), set(subscribers)))
+                self._sends.add(send)
+                send.add_done_callback(self._sends.discard)
+
+    def _station_zone(self, station_id: str, tide_time: str) -> tzinfo:
+        """The station's timezone, else the offset the prediction was given in, else the default"""
+        zone = self._zones.get(station_id)
+        if zone is None:
+            zone = datetime.fromisoformat(tide_time.replace('Z', '+00:00')).tzinfo or self.default_zone
+        return zone
+
+    def _alert(self, station_id: str, tide_time: str, tide_at: float) -> Dict[str, Any]:
+        local_time = datetime.fromtimestamp(tide_at, self._station_zone(station_id, tide_time)).strftime('%I:%M %p %Z')
+        return {
+            "title": "🌊 Low Tide Alert! 🌊",
+            "body": f"Low tide is approaching at {local_time}. Time to clean!",
+            "stationId": station_id,
+            "tideTime": tide_time,
+            "type": "LOW_TIDE_ALERT",
+        }
+
+    async def _send(self, alert: Dict[str, Any], user_ids: Set[str]):
+        try:
+            await self._notifier(alert, user_ids)
+            self._alerts_sent += 1
+        except Exception as e:
+            self._notify_failures += 1
+            print(f"[ERROR] Low tide alert for station {alert['stationId']} failed: {str(e)}")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "stations": len(self._stations),
+            "scheduled_alerts": sum(self._pending.values()),
+            "next_alert_in_seconds": round(max(self._heap[0][0] - time.time(), 0), 1) if self._heap else None,
+            "subscribed_stations": len(self._subscribers),
+            "subscriptions": sum(len(users) for users in self._subscribers.values()),
+            "alerts_due": self._alerts_due,
+            "alerts_sent": self._alerts_sent,
+            "alerts_without_subscribers": self._alerts_without_subscribers,
+            "notify_failures": self._notify_failures,
+            "max_lateness_ms": round(self._max_lateness * 1000, 1),
+            "prediction_reloads": self._reloads,
+        }
+
+    async def close(self):
+        """Stop the scheduler and wait for alerts being sent"""
+        for task in (self._task, self._reload_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._reload_task = None
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
+        print("Tide alert scheduler stopped")
+
+
+# Singleton instance
+tide_scheduler = TideAlertScheduler()
@@ -0,0 +1,64 @@
+"""
+Backfill or verify the denormalized likeCount, commentCount and
+attendeeCount columns against the tables they count
+Usage: python sync_counters.py [--verify]
+  --verify  Report rows whose counter has drifted without changing anything
+            (exits with status 1 if any are found)
+"""
+import sys
+import asyncio
+import argparse
+
+from init_database import COUNTERS, backfill_sql
+from src.config.database import DatabaseManager
+
+async def verify_counters(db) -> int:
+    """Print drifted rows per counter and return how many there are"""
+    drifted = 0
+    for table, column, child, key in COUNTERS:
+        cursor = await db.execute(f"""
+            SELECT id, {column} AS stored, actual FROM (
+                SELECT id, {column}, (SELECT COUNT(*) FROM {child} WHERE {child}.{key} = {table}.id) AS actual
+                FROM {table}
+            )
+            WHERE stored != actual
+        """)
+        rows = await cursor.fetchall()
+        drifted += len(rows)
+        print(f"{table}.{column}: {len(rows)} drifted row(s)")
+        for row in rows[:10]:
+            print(f"  {row['id']}: stored {row['stored']}, actual {row['actual']}")
+    return drifted
+
+async def backfill_counters(db):
+    """Recompute every counter in one transaction"""
+    for table, column, child, key in COUNTERS:
+        cursor = await db.execute(backfill_sql(table, column, child, key))
+        print(f"{table}.{column}: recomputed {cursor.rowcount} row(s)")
+    await db.commit()
+
+async def sync_counters(verify_only: bool) -> int:
+    manager = DatabaseManager(readers=1)
+    try:
+        if verify_only:
+            async with manager.reader() as db:
+                return await verify_counters(db)
+        async with manager.writer() as db:
+            await backfill_counters(db)
+            return await verify_counters(db)
+    finally:
+        await manager.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill or verify the denormalized counter columns")
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="Report rows whose counter has drifted without changing anything (exit status 1 if any are found)"
+    )
+    args = parser.parse_args()
+
+    drifted = asyncio.run(sync_counters(args.verify))
+    sys.exit(1 if drifted else 0)
+
+if __name__ == "__main__":
+    main()
@@ -232,20 +232,27 @@ export const fetchEvents = async () => {
   try {
     console.log('📡 Fetching events from Google Sheets via backend...');
 
-    const response = await fetch('/api/events/all');
-
-    console.log('📥 Response status:', response.status);
-
-    if (!response.ok) {
-      const errorData = await response.json().catch(() => ({ detail: 'Unknown error' }));
-      console.error('❌ Backend API Error:', errorData);
-      throw new Error(errorData.detail || 'Failed to fetch events');
-    }
-
-    const result = await response.json();
-    console.log('📊 Events data:', result);
-
-    const events = result.data || [];
+    // The backend returns events a page at a time; follow nextCursor until exhausted
+    const events = [];
+    let cursor = null;
+    do {
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`/api/events/all${query}`);
+
+      console.log('📥 Response status:', response.status);
+
+      if (!response.ok) {
+        const errorData = await response.json().catch(() => ({ detail: 'Unknown error' }));
+        console.error('❌ Backend API Error:', errorData);
+        throw new Error(errorData.detail || 'Failed to fetch events');
+      }
+
+      const result = await response.json();
+      console.log('📊 Events data:', result);
+
+      events.push(...(result.data || []));
+      cursor = result.nextCursor;
+    } while (cursor);
     console.log(`✅ Successfully fetched ${events.length} events from database`);
 
     // Sort by date (newest first)
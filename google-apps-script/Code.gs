@@ -36,6 +36,9 @@ function doPost(e) {
       case 'updateUpvotes':
         result = updateUpvotes(request.postId, request.upvotes);
         break;
+      case 'applyCounterDeltas':
+        result = applyCounterDeltas(request.sheet, request.column, request.deltas);
+        break;
       default:
         result = { error: 'Invalid action' };
     }
@@ -121,6 +124,52 @@ function updateUpvotes(postId, upvotes) {
   };
 }
 
+/**
+ * Add deltas to a counter column (e.g. upvotes, column 8 of Posts) by record ID
+ * Runs under the script lock so concurrent calls can't lose each other's changes.
+ * A delta of 0 reads the current value without writing.
+ */
+function applyCounterDeltas(sheetName, column, deltas) {
+  const lock = LockService.getScriptLock();
+  lock.waitLock(30000);
+
+  try {
+    const sheet = SpreadsheetApp.openById(SPREADSHEET_ID).getSheetByName(sheetName);
+    if (!sheet) {
+      return { success: false, error: 'Sheet not found: ' + sheetName };
+    }
+
+    const values = {};
+    const lastRow = sheet.getLastRow();
+    if (lastRow < 2) {
+      return { success: true, values: values };
+    }
+
+    const ids = sheet.getRange(2, 1, lastRow - 1, 1).getValues();
+    const counters = sheet.getRange(2, column, lastRow - 1, 1).getValues();
+
+    // Skip header row; the first row holding an ID wins
+    for (let i = 0; i < ids.length; i++) {
+      const id = String(ids[i][0]);
+      if (!Object.prototype.hasOwnProperty.call(deltas, id) || values.hasOwnProperty(id)) {
+        continue;
+      }
+      const next = Math.max(0, (Number(counters[i][0]) || 0) + deltas[id]);
+      if (deltas[id]) {
+        sheet.getRange(i + 2, column).setValue(next);
+      }
+      values[id] = next;
+    }
+
+    return {
+      success: true,
+      values: values
+    };
+  } finally {
+    lock.releaseLock();
+  }
+}
+
 /**
  * Get all posts (for testing)
  */